@@ -1,13 +1,42 @@
 import json
 import time
 import traceback # Added for stacktrace
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseCallNext
+from typing import Dict
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import Response, JSONResponse # Added JSONResponse
 from fastapi import HTTPException # Added to specifically catch and re-raise
 from services.activity_logger_service import ActivityLoggerService
 
+
+# Slotted events avoid a per-request dict. __slots__ is declared by hand since
+# dataclass(slots=True) needs Python 3.10; fields therefore carry no defaults.
+@dataclass
+class LogEvent:
+    __slots__ = (
+        "event_type", "user_email", "request_ip_address", "request_method", "request_path",
+        "request_fingerprint_headers", "response_status_code", "response_time_ms",
+    )
+    event_type: str
+    user_email: str
+    request_ip_address: str
+    request_method: str
+    request_path: str
+    request_fingerprint_headers: Dict[str, str]
+    response_status_code: int
+    response_time_ms: float
+
+
+@dataclass
+class ErrorLogEvent(LogEvent):
+    __slots__ = ("error_type", "error_message", "error_stacktrace")
+    error_type: str
+    error_message: str
+    error_stacktrace: str
+
+
 class ActivityLoggingMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
@@ -15,7 +44,7 @@ class ActivityLoggingMiddleware(BaseHTTPMiddleware):
         # Log file path can be configured here or in ActivityLoggerService itself.
         self.logger_service = ActivityLoggerService()
 
-    async def dispatch(self, request: Request, call_next: RequestResponseCallNext) -> Response:
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         start_time = time.perf_counter()
 
         # Basic request info
@@ -47,16 +76,16 @@ class ActivityLoggingMiddleware(BaseHTTPMiddleware):
             elif hasattr(request.state, "user") and request.state.user and hasattr(request.state.user, "id"):
                 user_email = f"user_id:{request.state.user.id}"
 
-            log_data = {
-                "event_type": "REQUEST_RESPONSE_CYCLE",
-                "user_email": user_email,
-                "request_ip_address": request_ip_address,
-                "request_method": request_method,
-                "request_path": request_path,
-                "request_fingerprint_headers": request_fingerprint_headers, # Added
-                "response_status_code": response_status_code,
-                "response_time_ms": response_time_ms,
-            }
+            log_data = LogEvent(
+                event_type="REQUEST_RESPONSE_CYCLE",
+                user_email=user_email,
+                request_ip_address=request_ip_address,
+                request_method=request_method,
+                request_path=request_path,
+                request_fingerprint_headers=request_fingerprint_headers, # Added
+                response_status_code=response_status_code,
+                response_time_ms=response_time_ms,
+            )
             self.logger_service.log(log_data)
             return response
 
@@ -71,29 +100,32 @@ class ActivityLoggingMiddleware(BaseHTTPMiddleware):
             end_time = time.perf_counter() # Record time even for errors
             response_time_ms = round((end_time - start_time) * 1000, 2)
 
-            # Attempt to get user info if available at point of exception
-            if hasattr(request.state, "user") and request.state.user and hasattr(request.state.user, "email"):
-                user_email = request.state.user.email
-            elif hasattr(request.state, "user") and request.state.user and hasattr(request.state.user, "id"):
-                 user_email = f"user_id:{request.state.user.id}"
+            # Formatting the stacktrace walks every frame; skip building the event
+            # entirely when UNHANDLED_EXCEPTION logging is disabled.
+            if self.logger_service.is_enabled("UNHANDLED_EXCEPTION"):
+                # Attempt to get user info if available at point of exception
+                if hasattr(request.state, "user") and request.state.user and hasattr(request.state.user, "email"):
+                    user_email = request.state.user.email
+                elif hasattr(request.state, "user") and request.state.user and hasattr(request.state.user, "id"):
+                     user_email = f"user_id:{request.state.user.id}"
 
-            error_log_data = {
-                "event_type": "UNHANDLED_EXCEPTION",
-                "user_email": user_email,
-                "request_ip_address": request_ip_address,
-                "request_method": request_method,
-                "request_path": request_path,
-                "request_fingerprint_headers": request_fingerprint_headers, # Added
-                "response_status_code": 500,
-                "response_time_ms": response_time_ms, # Time until error
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "error_stacktrace": traceback.format_exc(),
-            }
-            try:
-                self.logger_service.log(error_log_data)
-            except Exception as log_exc:
-                 print(f"CRITICAL: Failed to log UNHANDLED_EXCEPTION: {log_exc}, Original error: {e}, Log data: {str(error_log_data)}")
+                error_log_data = ErrorLogEvent(
+                    event_type="UNHANDLED_EXCEPTION",
+                    user_email=user_email,
+                    request_ip_address=request_ip_address,
+                    request_method=request_method,
+                    request_path=request_path,
+                    request_fingerprint_headers=request_fingerprint_headers, # Added
+                    response_status_code=500,
+                    response_time_ms=response_time_ms, # Time until error
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                    error_stacktrace=traceback.format_exc(),
+                )
+                try:
+                    self.logger_service.log(error_log_data)
+                except Exception as log_exc:
+                     print(f"CRITICAL: Failed to log UNHANDLED_EXCEPTION: {log_exc}, Original error: {e}, Log data: {str(error_log_data)}")
             
             # Return a generic 500 response
             return JSONResponse(
@@ -1,6 +1,6 @@
 from typing import List, Dict, Any, Optional
 from uuid import UUID # Added UUID for id type consistency
-from sqlalchemy import select # Added
+from sqlalchemy import select, update # Added
 from sqlalchemy.ext.asyncio import AsyncSession # Added
 
 from models.admin_logging_setting import AdminLoggingSetting
@@ -33,6 +33,28 @@ class AdminLoggingSettingRepository(BaseRepository[AdminLoggingSetting]):
             return setting
         return None
 
+    def update_settings_bulk(self, settings: Dict[str, bool]) -> List[AdminLoggingSetting]:
+        """
+        Sets is_enabled for several settings at once.
+        Issues one UPDATE per distinct value instead of a lookup and flush per setting.
+        Unknown names are ignored; returns the settings that matched.
+        Runs on a synchronous Session, like AdminLoggingSettingService which calls it.
+        """
+        for is_enabled in (True, False):
+            names = [name for name, enabled in settings.items() if enabled is is_enabled]
+            if names:
+                query = (
+                    update(AdminLoggingSetting)
+                    .where(AdminLoggingSetting.setting_name.in_(names))
+                    .values(is_enabled=is_enabled)
+                    .execution_options(synchronize_session="fetch")
+                )
+                self.db.execute(query)
+        self.db.flush()
+
+        query = select(AdminLoggingSetting).filter(AdminLoggingSetting.setting_name.in_(list(settings)))
+        return self.db.execute(query).scalars().all()
+
     async def create_or_update_bulk(self, settings_data: List[Dict[str, Any]]) -> List[AdminLoggingSetting]:
         """
         Creates new settings or updates existing ones based on setting_name.
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from core.database import get_db
 from core.auth import require_privileges # Assuming this utility for privilege checking
 from services.admin_logging_setting_service import AdminLoggingSettingService
-from schemas.admin_logging_setting_schema import LoggingSettingUpdate, LoggingSettingResponse
+from schemas.admin_logging_setting_schema import LoggingSettingUpdate, LoggingSettingsBulkUpdate, LoggingSettingResponse
 
 router = APIRouter(
     prefix="/admin/logging-settings",
@@ -37,6 +37,19 @@ async def list_logging_settings(
     return settings_objects
 
 
+@router.put(
+    "/",
+    response_model=List[LoggingSettingResponse],
+    summary="Update several logging settings at once",
+    description="Enable or disable multiple logging settings in a single transaction. Fails with 404 if any name is unknown."
+)
+async def update_logging_settings_bulk(
+    settings_update: LoggingSettingsBulkUpdate,
+    service: AdminLoggingSettingService = Depends(get_admin_logging_setting_service)
+):
+    return service.update_settings_bulk(settings_update.settings)
+
+
 @router.put(
     "/{setting_name}",
     response_model=LoggingSettingResponse,
@@ -1,8 +1,12 @@
+from typing import Dict, Optional
 from pydantic import BaseModel
 
 class LoggingSettingUpdate(BaseModel):
     is_enabled: bool
 
+class LoggingSettingsBulkUpdate(BaseModel):
+    settings: Dict[str, bool] # setting_name -> is_enabled
+
 class LoggingSettingResponse(BaseModel):
     setting_name: str
     is_enabled: bool
@@ -1,14 +1,25 @@
+import atexit
+import dataclasses
 import logging
-import json
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import orjson
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session # Added for type hinting
 
 from services.admin_logging_setting_service import AdminLoggingSettingService # Added
 
+def _dataclass_event_fields(obj):
+    """orjson default hook for dataclass events: unset (None) fields are left out rather than
+    written as null, so the JSON has the same shape as the equivalent dict event."""
+    if dataclasses.is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj) if getattr(obj, f.name) is not None}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 class JsonFormatter(logging.Formatter):
-    def format(self, record):
+    def _build(self, record) -> dict:
+        """Builds the JSON payload for a record as a dict; format() only serializes it."""
         log_record = {
             "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
@@ -17,15 +28,22 @@ class JsonFormatter(logging.Formatter):
             "funcName": record.funcName,
             "lineno": record.lineno,
         }
-        # If record.msg is already a dict, use it as the base for the 'message' field content
-        if isinstance(record.msg, dict):
+        # If record.msg is already a dict, use it as the base for the 'message' field content.
+        # Dataclass events (e.g. the middleware's LogEvent) are kept as-is; orjson serializes them natively.
+        if isinstance(record.msg, dict) or dataclasses.is_dataclass(record.msg):
             log_record["message"] = record.msg # Replace default message string with the dict
-        return json.dumps(log_record)
+        return log_record
+
+    def format(self, record):
+        return orjson.dumps(
+            self._build(record), default=_dataclass_event_fields, option=orjson.OPT_PASSTHROUGH_DATACLASS
+        ).decode()
 
 class ActivityLoggerService:
     _instance = None
     _initialized_logger_config = False # For logger setup (handlers, formatter)
     _initialized_db_config = False # For DB dependent settings
+    _enabled_events = frozenset() # Names of enabled settings, rebuilt whenever config is assigned
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -47,9 +65,16 @@ class ActivityLoggerService:
                 handler = TimedRotatingFileHandler(
                     log_file_path, when='midnight', interval=1, backupCount=7, encoding='utf-8'
                 )
-                formatter = JsonFormatter()
-                handler.setFormatter(formatter)
-                self.logger.addHandler(handler)
+                # Records reach the file handler already serialized by the queue handler below
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                # Callers (middleware, decorators) only pay for JSON encoding and an enqueue;
+                # the file write happens on the listener's background thread.
+                queue_handler = QueueHandler(queue.SimpleQueue())
+                queue_handler.setFormatter(JsonFormatter())
+                self.logger.addHandler(queue_handler)
+                self._listener = QueueListener(queue_handler.queue, handler)
+                self._listener.start()
+                atexit.register(self._listener.stop) # Drain queued records on shutdown
             self._initialized_logger_config = True
 
         # Initialize DB-dependent config only once, and only if db is provided
@@ -62,6 +87,17 @@ class ActivityLoggerService:
              self.config = {}
 
 
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    @config.setter
+    def config(self, value: dict):
+        # Every assignment (init, reload_config, tests) rebuilds the event gate used by log().
+        # Mutating the dict in place does not; replace it instead.
+        self._config = value
+        self._enabled_events = frozenset(name for name, enabled in value.items() if enabled)
+
     def reload_config(self, db: Session):
         """Reloads the logging configuration from the database. Requires a DB session."""
         if not hasattr(self, 'admin_logging_setting_service') or self.admin_logging_setting_service.repository.db != db :
@@ -74,12 +110,15 @@ class ActivityLoggerService:
         # print(f"ActivityLoggerService: Configuration reloaded. Current config: {self.config}")
         self._initialized_db_config = True # Mark DB config as initialized/updated
 
+    def is_enabled(self, event_type) -> bool:
+        """Whether events of this type are logged; lets callers skip building events up front."""
+        return event_type in self._enabled_events
 
-    def log(self, event_details: dict):
+    def log(self, event_details):
         """
         Logs the event details if the corresponding event_type is enabled in settings.
-        The event_details dictionary is passed directly as the message.
-        It must contain an 'event_type' key that corresponds to a setting_name
+        The event_details dictionary (or dataclass event) is passed directly as the message.
+        It must contain an 'event_type' key (or attribute) that corresponds to a setting_name
         in the admin_logging_settings table.
         """
         if not self._initialized_db_config:
@@ -90,7 +129,10 @@ class ActivityLoggerService:
             # self.logger.info(event_details) # Option: log anyway
             return # Option: drop if config not loaded
 
-        event_type_to_log = event_details.get("event_type")
+        if isinstance(event_details, dict):
+            event_type_to_log = event_details.get("event_type")
+        else:
+            event_type_to_log = getattr(event_details, "event_type", None)
         if not event_type_to_log:
             # If event_type is missing, decide on a policy.
             # For now, we'll log it if a "REQUEST_RESPONSE_CYCLE" (the default from middleware) is enabled,
@@ -101,10 +143,10 @@ class ActivityLoggerService:
             return
 
         # Check against loaded configuration. Default to False (don't log) if not explicitly enabled.
-        if self.config.get(event_type_to_log, False):
-            self.logger.info(event_details)
-        # else:
-        #     print(f"ActivityLoggerService: Event type '{event_type_to_log}' is disabled. Not logging event: {event_details.get('details', 'No details')}")
+        # Unknown event types are not in the enabled set, so they are dropped as well.
+        if not self.is_enabled(event_type_to_log):
+            return
+        self.logger.info(event_details)
 
 # Example usage (optional, for direct testing of the service)
 # Note: This example usage needs to be adapted as __init__ now requires a db Session
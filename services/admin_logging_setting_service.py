@@ -1,13 +1,15 @@
 from typing import Dict, List, Optional
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from repositories.admin_logging_setting_repository import AdminLoggingSettingRepository
 from models.admin_logging_setting import AdminLoggingSetting # For type hinting if needed
 
 class AdminLoggingSettingService:
-    def __init__(self, db: Session):  # Changed to accept Session directly
+    def __init__(self, db: Session, repository: Optional[AdminLoggingSettingRepository] = None):  # Changed to accept Session directly
         self.db = db
-        self.repository = AdminLoggingSettingRepository(db)
+        # A repository can be injected (e.g. in tests); by default one is built on the same session
+        self.repository = repository if repository is not None else AdminLoggingSettingRepository(db)
 
     def get_all_settings(self) -> Dict[str, bool]:
         """
@@ -44,6 +46,26 @@ class AdminLoggingSettingService:
             # For now, re-raising the original error to be handled by FastAPI error handlers or middleware
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while updating setting '{name}'.")
 
+    def update_settings_bulk(self, settings: Dict[str, bool]) -> List[AdminLoggingSetting]:
+        """
+        Updates several logging settings in a single transaction.
+        Raises a 404 and commits nothing if any setting name is unknown.
+        Returns the updated ORM objects.
+        """
+        try:
+            updated_settings = self.repository.update_settings_bulk(settings)
+            missing = set(settings) - {setting.setting_name for setting in updated_settings}
+            if missing:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Logging settings not found: {', '.join(sorted(missing))}.")
+            self.db.commit()
+            return updated_settings
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except Exception:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An error occurred while updating logging settings.")
+
     def initialize_default_settings(self):
         """
         Initializes the database with a predefined list of default logging settings
@@ -74,6 +96,7 @@ class AdminLoggingSettingService:
             {"setting_name": "SECURITY_ALERT", "is_enabled": True, "description": "Log potential security-related events (e.g., unauthorized access attempts)."},
             
             {"setting_name": "LOG_DATA_MODIFICATIONS", "is_enabled": False, "description": "Log modifications to log data settings themselves. (Default: False to prevent log flooding)."},
+            {"setting_name": "LOG_STACKTRACES", "is_enabled": True, "description": "Include stacktraces in failure events logged by the log_activity decorator."},
             {"setting_name": "REQUEST_RESPONSE_CYCLE", "is_enabled": True, "description": "General logging for each request-response cycle by ActivityLoggingMiddleware."}
         ]
         
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Put the project root on sys.path once for the whole test session, so test
+# modules can import core, services, utils, etc. without their own path setup.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
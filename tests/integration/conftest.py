@@ -12,7 +12,11 @@ import logging
 # Assuming 'main.py' and 'core.database' are discoverable
 from main import app # Your FastAPI app
 from core.database import Base, get_db, SessionLocal # Assuming get_db and SessionLocal
-from services.activity_logger_service import JsonFormatter # For log capture helper
+from services.activity_logger_service import ActivityLoggerService, JsonFormatter # For log capture helper
+# Imported once here rather than inside every user-header fixture call
+from models.user import User
+from core.security import get_password_hash, create_access_token
+from datetime import timedelta
 
 # --- Database Setup for Tests ---
 SQLALCHEMY_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite:///./test_integration.db")
@@ -102,7 +106,6 @@ def log_capture():
     # Important: Also clear the singleton's config if it was loaded,
     # to avoid state leakage between tests if ActivityLoggerService is a singleton
     # This might require a reset method on the service or careful test structure.
-    from services.activity_logger_service import ActivityLoggerService
     if ActivityLoggerService._instance:
         ActivityLoggerService._instance._initialized_db_config = False
         ActivityLoggerService._instance.config = {} # Reset its config
@@ -142,9 +145,6 @@ def admin_user_headers(client: TestClient, db: SessionLocal) -> dict:
     # For now, we'll rely on tests either mocking auth or being run where auth isn't strictly blocking for this PoC.
     # This part is CRITICAL for real auth testing.
     # If a simple "is_superuser" flag is used and can be set:
-    from models.user import User
-    from core.security import get_password_hash, create_access_token
-    from datetime import timedelta
 
     admin_email = "admin_integration_test@example.com"
     admin_password = "testadminpassword"
@@ -174,9 +174,6 @@ def admin_user_headers(client: TestClient, db: SessionLocal) -> dict:
 @pytest.fixture(scope="function")
 def regular_user_headers(client: TestClient, db: SessionLocal) -> dict:
     # Placeholder: Create a non-admin user and login.
-    from models.user import User
-    from core.security import get_password_hash, create_access_token
-    from datetime import timedelta
 
     user_email = "user_integration_test@example.com"
     user_password = "testuserpassword"
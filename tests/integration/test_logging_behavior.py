@@ -1,11 +1,13 @@
 import pytest
 import json
+from collections import defaultdict
 from fastapi import status
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session # For type hinting db fixture
 
 # Assuming conftest.py provides client, db, admin_user_headers, log_capture
 from models.user import User # For checking DB directly if needed
+from core.security import get_password_hash # For creating the login test user directly
 
 API_V1_STR = "/api/v1"
 AUTH_LOGIN_ENDPOINT = f"{API_V1_STR}/auth/login"
@@ -23,6 +25,14 @@ def parse_log_json(log_stream_value: str):
                 print(f"Warning: Could not decode JSON log line: {line}")
     return logs
 
+# Groups parsed logs by event_type once, so each assertion is a dict lookup instead of a scan
+def index_logs(logs):
+    index = defaultdict(list)
+    for log in logs:
+        message = log.get("message", {})
+        index[message.get("event_type") if isinstance(message, dict) else None].append(log)
+    return index
+
 class TestLoggingBehavior:
 
     def test_auth_login_success_logging_toggle(
@@ -37,7 +47,6 @@ class TestLoggingBehavior:
         
         user = db.query(User).filter(User.email == test_login_email).first()
         if not user:
-            from core.security import get_password_hash # Assuming this is accessible
             user_create_payload = {
                 "email": test_login_email,
                 "password": test_login_password, # This user is created directly, not via API here
@@ -67,8 +76,8 @@ class TestLoggingBehavior:
         response_login1 = client.post(AUTH_LOGIN_ENDPOINT, data=login_payload)
         assert response_login1.status_code == status.HTTP_200_OK
         
-        logs1 = parse_log_json(log_stream.getvalue())
-        login_success_logs1 = [log for log in logs1 if log["message"].get("event_type") == "USER_LOGIN_SUCCESS"]
+        logs1 = index_logs(parse_log_json(log_stream.getvalue()))
+        login_success_logs1 = logs1["USER_LOGIN_SUCCESS"]
         assert len(login_success_logs1) >= 1, "USER_LOGIN_SUCCESS event should be logged when enabled."
         assert login_success_logs1[-1]["message"]["email_attempted"] == test_login_email
         
@@ -83,8 +92,8 @@ class TestLoggingBehavior:
         response_login2 = client.post(AUTH_LOGIN_ENDPOINT, data=login_payload)
         assert response_login2.status_code == status.HTTP_200_OK
         
-        logs2 = parse_log_json(log_stream.getvalue())
-        login_success_logs2 = [log for log in logs2 if log["message"].get("event_type") == "USER_LOGIN_SUCCESS"]
+        logs2 = index_logs(parse_log_json(log_stream.getvalue()))
+        login_success_logs2 = logs2["USER_LOGIN_SUCCESS"]
         assert len(login_success_logs2) == 0, "USER_LOGIN_SUCCESS event should NOT be logged when disabled."
 
         # Cleanup: Re-enable AUTH_LOGIN_SUCCESS (optional, good practice)
@@ -97,15 +106,11 @@ class TestLoggingBehavior:
         log_stream = log_capture
         user_create_api_event_type = "USER_CREATE_VIA_API_SUCCESS" # From user_router decorator
 
-        # Ensure USER_CREATE_VIA_API_SUCCESS is enabled (it should be by default if not explicitly set otherwise)
-        # For robustness, can explicitly enable it:
-        client.put(f"{ADMIN_LOGGING_SETTINGS_ENDPOINT}/{user_create_api_event_type}", json={"is_enabled": True}, headers=admin_user_headers)
-
-
         # --- Scenario 1: LOG_DATA_MODIFICATIONS is disabled ---
+        # Ensure USER_CREATE_VIA_API_SUCCESS is enabled and LOG_DATA_MODIFICATIONS disabled in one bulk call
         put_resp_log_data_mod_disable = client.put(
-            f"{ADMIN_LOGGING_SETTINGS_ENDPOINT}/LOG_DATA_MODIFICATIONS", 
-            json={"is_enabled": False}, 
+            f"{ADMIN_LOGGING_SETTINGS_ENDPOINT}/",
+            json={"settings": {user_create_api_event_type: True, "LOG_DATA_MODIFICATIONS": False}},
             headers=admin_user_headers
         )
         assert put_resp_log_data_mod_disable.status_code == status.HTTP_200_OK
@@ -117,19 +122,20 @@ class TestLoggingBehavior:
         response_create1 = client.post(USERS_ENDPOINT, json=user_payload1, headers=admin_user_headers) # Use admin to create user
         assert response_create1.status_code == status.HTTP_201_CREATED
         
-        logs1 = parse_log_json(log_stream.getvalue())
-        create_user_logs1 = [log for log in logs1 if log["message"].get("event_type") == user_create_api_event_type]
+        logs1 = index_logs(parse_log_json(log_stream.getvalue()))
+        create_user_logs1 = logs1[user_create_api_event_type]
         assert len(create_user_logs1) >= 1
+        last_log_message1 = create_user_logs1[-1]["message"]
         # data_changed_summary should be absent or minimal (current decorator doesn't add it if LOG_DATA_MODIFICATIONS is False)
-        assert "data_changed_summary" not in create_user_logs1[-1]["message"], \
+        assert "data_changed_summary" not in last_log_message1, \
             "data_changed_summary should be absent when LOG_DATA_MODIFICATIONS is False."
 
         log_stream.truncate(0); log_stream.seek(0) # Clear stream
 
         # --- Scenario 2: LOG_DATA_MODIFICATIONS is enabled ---
         put_resp_log_data_mod_enable = client.put(
-            f"{ADMIN_LOGGING_SETTINGS_ENDPOINT}/LOG_DATA_MODIFICATIONS", 
-            json={"is_enabled": True}, 
+            f"{ADMIN_LOGGING_SETTINGS_ENDPOINT}/",
+            json={"settings": {"LOG_DATA_MODIFICATIONS": True}},
             headers=admin_user_headers
         )
         assert put_resp_log_data_mod_enable.status_code == status.HTTP_200_OK
@@ -142,8 +148,8 @@ class TestLoggingBehavior:
         assert response_create2.status_code == status.HTTP_201_CREATED
         created_user_id2 = response_create2.json()["id"]
 
-        logs2 = parse_log_json(log_stream.getvalue())
-        create_user_logs2 = [log for log in logs2 if log["message"].get("event_type") == user_create_api_event_type]
+        logs2 = index_logs(parse_log_json(log_stream.getvalue()))
+        create_user_logs2 = logs2[user_create_api_event_type]
         assert len(create_user_logs2) >= 1
         
         last_log_message = create_user_logs2[-1]["message"]
@@ -1,40 +1,71 @@
+import asyncio
+import functools
+import json
 import unittest
 from unittest.mock import MagicMock, AsyncMock, patch
 from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
+from starlette.responses import Response
 from fastapi import HTTPException # For testing specific exception handling
 
 # Adjust import path based on your project structure
-from middleware.activity_logging_middleware import ActivityLoggingMiddleware
+from middleware.activity_logging_middleware import ActivityLoggingMiddleware, LogEvent, ErrorLogEvent
 from services.activity_logger_service import ActivityLoggerService # For type hint
 
-# Ensure the middleware directory is in the Python path for imports
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+try:
+    import uvloop # Optional: faster loop for the shared test event loop
+except ImportError:
+    uvloop = None
 
 
-class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
+# Attribute names of Request, computed once at import. A name-list spec gives the same
+# attribute checking as spec=Request without re-introspecting the class on every mock.
+_REQUEST_SPEC = dir(Request)
+
+
+def run_in_class_loop(test_coro):
+    """Runs an async test method on the class-wide event loop instead of a fresh one per test."""
+    @functools.wraps(test_coro)
+    def wrapper(self):
+        return self.loop.run_until_complete(test_coro(self))
+    return wrapper
+
+
+class TestActivityLoggingMiddleware(unittest.TestCase):
+
+    # Prebuilt call_next results; raw bytes skip JSON encoding on every test
+    _CANNED_OK = Response(content=b'{"message":"success"}', status_code=200, media_type="application/json")
+    _CANNED_USER = Response(content=b'{"message":"user processed"}', status_code=200, media_type="application/json")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
 
-    async def asyncSetUp(self):
         # Mock the ActivityLoggerService that the middleware will instantiate
-        self.mock_logger_service_instance = MagicMock(spec=ActivityLoggerService)
-        self.mock_logger_service_instance.log = MagicMock() # Mock the log method
+        cls.mock_logger_service_instance = MagicMock(spec=ActivityLoggerService)
+        cls.mock_logger_service_instance.log = MagicMock() # Mock the log method
 
         # Patch the ActivityLoggerService where it's imported by the middleware module
-        self.activity_logger_patcher = patch('middleware.activity_logging_middleware.ActivityLoggerService')
-        self.MockActivityLoggerServiceClass = self.activity_logger_patcher.start()
-        self.MockActivityLoggerServiceClass.return_value = self.mock_logger_service_instance
+        cls.activity_logger_patcher = patch('middleware.activity_logging_middleware.ActivityLoggerService')
+        cls.MockActivityLoggerServiceClass = cls.activity_logger_patcher.start()
+        cls.MockActivityLoggerServiceClass.return_value = cls.mock_logger_service_instance
         
-        # Dummy app object for middleware instantiation
-        self.dummy_app = MagicMock() 
-        self.middleware = ActivityLoggingMiddleware(app=self.dummy_app)
+        # Dummy app object for middleware instantiation; one middleware is shared by all tests
+        cls.dummy_app = MagicMock() 
+        cls.middleware = ActivityLoggingMiddleware(app=cls.dummy_app)
 
-    async def asyncTearDown(self):
-        self.activity_logger_patcher.stop()
+    @classmethod
+    def tearDownClass(cls):
+        cls.activity_logger_patcher.stop()
+        cls.loop.close()
 
+    def setUp(self):
+        # Only the shared mock's recorded state needs resetting between tests
+        self.mock_logger_service_instance.reset_mock()
+        self.mock_logger_service_instance.is_enabled.return_value = False
+
+    @run_in_class_loop
     async def test_successful_request_logging(self):
-        mock_request = MagicMock(spec=Request)
+        mock_request = MagicMock(spec=_REQUEST_SPEC)
         mock_request.client = MagicMock()
         mock_request.client.host = "127.0.0.1"
         mock_request.method = "GET"
@@ -54,8 +85,7 @@ class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
 
         # Mock call_next to simulate request processing
         mock_response_content = {"message": "success"}
-        mock_call_next_response = JSONResponse(content=mock_response_content, status_code=200)
-        call_next_func = AsyncMock(return_value=mock_call_next_response)
+        call_next_func = AsyncMock(return_value=self._CANNED_OK)
 
         # Dispatch the request through the middleware
         response = await self.middleware.dispatch(mock_request, call_next_func)
@@ -63,25 +93,23 @@ class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
         # Assertions
         call_next_func.assert_called_once_with(mock_request)
         self.assertEqual(response.status_code, 200)
-        response_body = b""
-        async for chunk in response.body_iterator: # Iterate over async generator
-            response_body += chunk
-        self.assertEqual(json.loads(response_body.decode()), mock_response_content)
+        self.assertEqual(json.loads(response.body), mock_response_content)
 
 
         self.mock_logger_service_instance.log.assert_called_once()
         logged_event = self.mock_logger_service_instance.log.call_args[0][0]
         
-        self.assertEqual(logged_event["event_type"], "REQUEST_RESPONSE_CYCLE")
-        self.assertEqual(logged_event["user_email"], "test@example.com")
-        self.assertEqual(logged_event["request_ip_address"], "127.0.0.1")
-        self.assertEqual(logged_event["request_method"], "GET")
-        self.assertEqual(logged_event["request_path"], "/test/path")
-        self.assertEqual(logged_event["response_status_code"], 200)
-        self.assertIn("response_time_ms", logged_event)
+        self.assertIsInstance(logged_event, LogEvent)
+        self.assertEqual(logged_event.event_type, "REQUEST_RESPONSE_CYCLE")
+        self.assertEqual(logged_event.user_email, "test@example.com")
+        self.assertEqual(logged_event.request_ip_address, "127.0.0.1")
+        self.assertEqual(logged_event.request_method, "GET")
+        self.assertEqual(logged_event.request_path, "/test/path")
+        self.assertEqual(logged_event.response_status_code, 200)
+        self.assertIsInstance(logged_event.response_time_ms, float)
 
         # Test fingerprinting headers
-        fingerprint = logged_event["request_fingerprint_headers"]
+        fingerprint = logged_event.request_fingerprint_headers
         self.assertEqual(fingerprint["user-agent"], "TestAgent/1.0")
         self.assertEqual(fingerprint["referer"], "http://example.com")
         self.assertEqual(fingerprint["origin"], "http://example.com")
@@ -91,12 +119,14 @@ class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(fingerprint["x-forwarded-for"], "1.2.3.4")
         self.assertEqual(fingerprint["x-real-ip"], "unknown") # Not present in mock_request.headers
 
+    @run_in_class_loop
     async def test_unhandled_exception_logging(self):
-        mock_request = MagicMock(spec=Request)
+        mock_request = MagicMock(spec=_REQUEST_SPEC)
         mock_request.client = MagicMock(); mock_request.client.host = "127.0.0.1"
         mock_request.method = "POST"; mock_request.url = MagicMock(); mock_request.url.path = "/error/path"
         mock_request.headers = {"user-agent": "ErrorAgent/1.0"}
         mock_request.state = MagicMock(); mock_request.state.user = None # Anonymous user
+        self.mock_logger_service_instance.is_enabled.return_value = True
 
         # Simulate call_next raising a generic exception
         call_next_func = AsyncMock(side_effect=ValueError("Something broke badly"))
@@ -107,25 +137,42 @@ class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
         # Assertions
         call_next_func.assert_called_once_with(mock_request)
         self.assertEqual(response.status_code, 500) # Should return a generic 500
-        response_body = b""
-        async for chunk in response.body_iterator:
-            response_body += chunk
-        self.assertEqual(json.loads(response_body.decode()), {"detail": "Internal Server Error"})
+        self.assertEqual(json.loads(response.body), {"detail": "Internal Server Error"})
 
         self.mock_logger_service_instance.log.assert_called_once()
         logged_event = self.mock_logger_service_instance.log.call_args[0][0]
 
-        self.assertEqual(logged_event["event_type"], "UNHANDLED_EXCEPTION")
-        self.assertEqual(logged_event["user_email"], "anonymous") # User not set on state
-        self.assertEqual(logged_event["response_status_code"], 500)
-        self.assertEqual(logged_event["error_type"], "ValueError")
-        self.assertEqual(logged_event["error_message"], "Something broke badly")
-        self.assertIn("error_stacktrace", logged_event)
-        self.assertTrue(len(logged_event["error_stacktrace"]) > 0)
-        self.assertEqual(logged_event["request_fingerprint_headers"]["user-agent"], "ErrorAgent/1.0")
+        self.assertIsInstance(logged_event, ErrorLogEvent)
+        self.assertEqual(logged_event.event_type, "UNHANDLED_EXCEPTION")
+        self.assertEqual(logged_event.user_email, "anonymous") # User not set on state
+        self.assertEqual(logged_event.response_status_code, 500)
+        self.assertEqual(logged_event.error_type, "ValueError")
+        self.assertEqual(logged_event.error_message, "Something broke badly")
+        self.assertTrue(len(logged_event.error_stacktrace) > 0)
+        self.assertEqual(logged_event.request_fingerprint_headers["user-agent"], "ErrorAgent/1.0")
+
+    @run_in_class_loop
+    async def test_unhandled_exception_not_logged_when_disabled(self):
+        mock_request = MagicMock(spec=_REQUEST_SPEC)
+        mock_request.client = MagicMock(); mock_request.client.host = "127.0.0.1"
+        mock_request.method = "POST"; mock_request.url = MagicMock(); mock_request.url.path = "/error/path"
+        mock_request.headers = {}
+        mock_request.state = MagicMock(); mock_request.state.user = None
+        self.mock_logger_service_instance.is_enabled.return_value = False
+
+        call_next_func = AsyncMock(side_effect=ValueError("Something broke badly"))
+
+        with patch('middleware.activity_logging_middleware.traceback.format_exc') as mock_format_exc:
+            response = await self.middleware.dispatch(mock_request, call_next_func)
+
+        # Still a generic 500, but no stacktrace formatting and no log call
+        self.assertEqual(response.status_code, 500)
+        mock_format_exc.assert_not_called()
+        self.mock_logger_service_instance.log.assert_not_called()
 
+    @run_in_class_loop
     async def test_http_exception_reraised(self):
-        mock_request = MagicMock(spec=Request)
+        mock_request = MagicMock(spec=_REQUEST_SPEC)
         mock_request.client = MagicMock(); mock_request.client.host = "127.0.0.1"
         mock_request.method = "PUT"; mock_request.url = MagicMock(); mock_request.url.path = "/http-error"
         mock_request.headers = {}
@@ -147,8 +194,9 @@ class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
         # If the requirement was to log HTTPExceptions in middleware too, this test would change.
         self.mock_logger_service_instance.log.assert_not_called() 
 
+    @run_in_class_loop
     async def test_user_extraction_from_state_after_call_next(self):
-        mock_request = MagicMock(spec=Request)
+        mock_request = MagicMock(spec=_REQUEST_SPEC)
         mock_request.client = MagicMock(); mock_request.client.host = "127.0.0.1"
         mock_request.method = "GET"; mock_request.url = MagicMock(); mock_request.url.path = "/user-test"
         mock_request.headers = {}
@@ -162,7 +210,7 @@ class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
         async def call_next_side_effect(request_arg):
             # Simulate user being set on state during downstream processing
             request_arg.state.user = MagicMock(email="user_set_downstream@example.com", id="user_downstream_id")
-            return JSONResponse(content={"message": "user processed"}, status_code=200)
+            return self._CANNED_USER
 
         call_next_func = AsyncMock(side_effect=call_next_side_effect)
 
@@ -171,12 +219,10 @@ class TestActivityLoggingMiddleware(unittest.IsolatedAsyncioTestCase):
         self.mock_logger_service_instance.log.assert_called_once()
         logged_event = self.mock_logger_service_instance.log.call_args[0][0]
         
-        self.assertEqual(logged_event["user_email"], "user_set_downstream@example.com")
+        self.assertEqual(logged_event.user_email, "user_set_downstream@example.com")
 
 
 if __name__ == '__main__':
-    # Required for JSONResponse body iteration in tests if run directly (though typically run via test runner)
-    import json 
     unittest.main()
 
 # Ensure the test file ends with a newline
@@ -2,16 +2,15 @@ import unittest
 from unittest.mock import patch, MagicMock, call
 import logging
 import os
+import orjson
+from logging.handlers import QueueHandler
 
 # Adjust import path based on your project structure
 # Assuming 'services' is a top-level directory or discoverable in PYTHONPATH
 from services.activity_logger_service import ActivityLoggerService, JsonFormatter
+from utils.activity_logging_decorators import EventDetails # Dataclass event for the formatter test
 from sqlalchemy.orm import Session # For type hinting if needed for Session mock
 
-# Ensure the services directory is in the Python path for imports
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
-
 
 class TestJsonFormatter(unittest.TestCase):
     def test_format_dict_message(self):
@@ -27,10 +26,10 @@ class TestJsonFormatter(unittest.TestCase):
             func='test_func'
         )
         # Simulate that record.created is set by logging.makeLogRecord
-        record.created = 1678886400.0 # Example: 2023-03-15 12:00:00 UTC
+        record.created = 1678881600.0 # Example: 2023-03-15 12:00:00 UTC
 
-        formatted_json_str = formatter.format(record)
-        formatted_dict = json.loads(formatted_json_str)
+        # Assert on the payload dict directly; no encode/decode round-trip needed
+        formatted_dict = formatter._build(record)
 
         self.assertEqual(formatted_dict['level'], 'INFO')
         self.assertEqual(formatted_dict['module'], 'test_pathname') # module comes from pathname
@@ -55,13 +54,38 @@ class TestJsonFormatter(unittest.TestCase):
             exc_info=None,
             func='another_func'
         )
-        record.created = 1678886400.0
+        record.created = 1678881600.0
 
-        formatted_json_str = formatter.format(record)
-        formatted_dict = json.loads(formatted_json_str)
+        formatted_dict = formatter._build(record)
 
         self.assertEqual(formatted_dict['level'], 'WARNING')
         self.assertEqual(formatted_dict['message'], "This is a string message")
+        # format() is just the serialized payload
+        self.assertEqual(orjson.loads(formatter.format(record)), formatted_dict)
+
+    def test_format_dataclass_message_omits_unset_fields(self):
+        formatter = JsonFormatter()
+        event = EventDetails("TEST_EVENT", "test_func", "test_module")
+        event.target_resource_ids.append("res1")
+        record = logging.LogRecord(
+            name='test_logger',
+            level=logging.INFO,
+            pathname='test_pathname',
+            lineno=1,
+            msg=event,
+            args=(),
+            exc_info=None,
+            func='test_func'
+        )
+        record.created = 1678881600.0
+
+        message = orjson.loads(formatter.format(record))['message']
+
+        self.assertEqual(message['event_type'], 'TEST_EVENT')
+        self.assertEqual(message['target_resource_ids'], ['res1'])
+        # Optional fields left as None are omitted, as they would be from a dict event
+        self.assertNotIn('error_stacktrace', message)
+        self.assertNotIn('actor_user_email', message)
 
 
 # Patch logging.getLogger and TimedRotatingFileHandler for all tests in TestActivityLoggerService
@@ -80,9 +104,15 @@ class TestActivityLoggerService(unittest.TestCase):
         # Mock the DB session
         self.mock_db_session = MagicMock(spec=Session)
 
+        # Don't start a real background listener thread in unit tests
+        self.listener_patcher = patch('services.activity_logger_service.QueueListener')
+        self.MockQueueListener = self.listener_patcher.start()
+        self.addCleanup(self.listener_patcher.stop)
+
 
     def test_singleton_behavior(self, MockAdminService, MockMakeDirs, MockTimedRotatingFileHandler, MockGetLogger):
         mock_logger = MockGetLogger.return_value
+        mock_logger.handlers = [] # A fresh logger has no handlers yet
         MockAdminService.return_value.get_all_settings.return_value = {} # Default empty config
 
         instance1 = ActivityLoggerService(db=self.mock_db_session, log_file_path="test_logs/activity.log")
@@ -100,6 +130,7 @@ class TestActivityLoggerService(unittest.TestCase):
 
     def test_logger_initialization(self, MockAdminService, MockMakeDirs, MockTimedRotatingFileHandler, MockGetLogger):
         mock_logger = MockGetLogger.return_value
+        mock_logger.handlers = [] # A fresh logger has no handlers yet
         MockAdminService.return_value.get_all_settings.return_value = {}
 
         log_file_path = "custom_path/activity.log"
@@ -118,12 +149,15 @@ class TestActivityLoggerService(unittest.TestCase):
             encoding='utf-8'
         )
         
+        # The logger gets a JSON-formatting QueueHandler; the file handler is driven by a QueueListener
+        mock_logger.addHandler.assert_called_once()
+        queue_handler = mock_logger.addHandler.call_args[0][0]
+        self.assertIsInstance(queue_handler, QueueHandler)
+        self.assertIsInstance(queue_handler.formatter, JsonFormatter)
+
         mock_handler_instance = MockTimedRotatingFileHandler.return_value
-        mock_handler_instance.setFormatter.assert_called_once()
-        formatter_arg = mock_handler_instance.setFormatter.call_args[0][0]
-        self.assertIsInstance(formatter_arg, JsonFormatter)
-        
-        mock_logger.addHandler.assert_called_once_with(mock_handler_instance)
+        self.MockQueueListener.assert_called_once_with(queue_handler.queue, mock_handler_instance)
+        self.MockQueueListener.return_value.start.assert_called_once()
         
         # Test AdminLoggingSettingService initialization
         MockAdminService.assert_called_once_with(self.mock_db_session)
@@ -146,6 +180,13 @@ class TestActivityLoggerService(unittest.TestCase):
         
         mock_logger.info.assert_called_once_with(event_details)
 
+        # Disabling the event through reload_config must clear its bit in the gate
+        MockAdminService.return_value.get_all_settings.return_value = {"TEST_EVENT": False, "OTHER_EVENT": False}
+        service.reload_config(db=self.mock_db_session)
+        mock_logger.info.reset_mock()
+        service.log(event_details)
+        mock_logger.info.assert_not_called()
+
     def test_log_event_disabled(self, MockAdminService, MockMakeDirs, MockTimedRotatingFileHandler, MockGetLogger):
         mock_logger = MockGetLogger.return_value
         mock_config = {"TEST_EVENT": True, "OTHER_EVENT": False}
@@ -210,8 +251,6 @@ class TestActivityLoggerService(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    # Need to load json for the JsonFormatter tests if run directly
-    import json
     unittest.main()
 
 # Ensure the test file ends with a newline
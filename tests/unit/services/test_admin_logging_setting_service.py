@@ -1,40 +1,49 @@
 import unittest
-from unittest.mock import MagicMock, patch, call # Added call
-from sqlalchemy.orm import Session # For type hinting Session mock
+from unittest.mock import MagicMock
+from fastapi import HTTPException
 
 # Adjust import path based on your project structure
 from services.admin_logging_setting_service import AdminLoggingSettingService
 from models.admin_logging_setting import AdminLoggingSetting # For creating mock return objects
 from repositories.admin_logging_setting_repository import AdminLoggingSettingRepository
 
-# Ensure the services directory is in the Python path for imports
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+class _FakeSession:
+    """Stands in for a Session; records only the transaction calls the service makes."""
+    __slots__ = ("commits", "rollbacks")
+
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def refresh(self, instance):
+        pass
 
 
 class TestAdminLoggingSettingService(unittest.TestCase):
 
-    def setUp(self):
-        self.mock_db_session = MagicMock(spec=Session)
-        # Patch the repository within the service's module context
-        self.patcher = patch('services.admin_logging_setting_service.AdminLoggingSettingRepository')
-        self.MockAdminLoggingSettingRepository = self.patcher.start()
-        
-        # Instantiate the service, which will use the mocked repository
-        self.mock_repository_instance = self.MockAdminLoggingSettingRepository.return_value
-        self.service = AdminLoggingSettingService(db=self.mock_db_session)
+    # Model instances are never mutated by the service paths under test, so build them once
+    _ALL_SETTINGS = [
+        AdminLoggingSetting(setting_name="EVENT_A", is_enabled=True, description="Desc A"),
+        AdminLoggingSetting(setting_name="EVENT_B", is_enabled=False, description="Desc B")
+    ]
+    _UPDATED_SETTING = AdminLoggingSetting(setting_name="EVENT_A", is_enabled=False)
 
-    def tearDown(self):
-        self.patcher.stop()
+    def setUp(self):
+        self.mock_db_session = _FakeSession()
+        # Inject the mocked repository directly; no module-level patching needed
+        self.mock_repository_instance = MagicMock()
+        self.service = AdminLoggingSettingService(db=self.mock_db_session, repository=self.mock_repository_instance)
 
     def test_get_all_settings(self):
         # Setup mock repository response
-        mock_settings_list = [
-            AdminLoggingSetting(setting_name="EVENT_A", is_enabled=True, description="Desc A"),
-            AdminLoggingSetting(setting_name="EVENT_B", is_enabled=False, description="Desc B")
-        ]
-        self.mock_repository_instance.get_all_settings.return_value = mock_settings_list
+        self.mock_repository_instance.get_all_settings.return_value = self._ALL_SETTINGS
 
         # Call the service method
         result = self.service.get_all_settings()
@@ -49,19 +58,15 @@ class TestAdminLoggingSettingService(unittest.TestCase):
         new_is_enabled_status = False
         
         # Mock repository returning an updated setting object
-        updated_setting_mock = AdminLoggingSetting(
-            setting_name=setting_name_to_update, 
-            is_enabled=new_is_enabled_status
-        )
-        self.mock_repository_instance.update_setting.return_value = updated_setting_mock
+        self.mock_repository_instance.update_setting.return_value = self._UPDATED_SETTING
 
         # Call the service method
         result = self.service.update_setting(setting_name_to_update, new_is_enabled_status)
 
         # Assertions
         self.mock_repository_instance.update_setting.assert_called_once_with(setting_name_to_update, new_is_enabled_status)
-        expected_result = {setting_name_to_update: new_is_enabled_status}
-        self.assertEqual(result, expected_result)
+        self.assertIs(result, self._UPDATED_SETTING) # The service returns the committed ORM object
+        self.assertEqual(self.mock_db_session.commits, 1)
 
     def test_update_setting_not_found(self):
         setting_name_to_update = "NON_EXISTENT_EVENT"
@@ -70,11 +75,40 @@ class TestAdminLoggingSettingService(unittest.TestCase):
         self.mock_repository_instance.update_setting.return_value = None # Simulate setting not found
 
         # Call the service method
-        result = self.service.update_setting(setting_name_to_update, new_is_enabled_status)
+        with self.assertRaises(HTTPException) as cm:
+            self.service.update_setting(setting_name_to_update, new_is_enabled_status)
 
         # Assertions
         self.mock_repository_instance.update_setting.assert_called_once_with(setting_name_to_update, new_is_enabled_status)
-        self.assertIsNone(result)
+        self.assertEqual(cm.exception.status_code, 404)
+        self.assertEqual(self.mock_db_session.commits, 0)
+
+    def test_update_settings_bulk(self):
+        settings_update = {"EVENT_A": False, "EVENT_B": True}
+        updated_settings = [
+            AdminLoggingSetting(setting_name="EVENT_A", is_enabled=False),
+            AdminLoggingSetting(setting_name="EVENT_B", is_enabled=True)
+        ]
+        self.mock_repository_instance.update_settings_bulk.return_value = updated_settings
+
+        result = self.service.update_settings_bulk(settings_update)
+
+        # One repository call and one commit for the whole batch
+        self.mock_repository_instance.update_settings_bulk.assert_called_once_with(settings_update)
+        self.assertEqual(self.mock_db_session.commits, 1)
+        self.assertEqual(result, updated_settings)
+
+    def test_update_settings_bulk_unknown_name(self):
+        self.mock_repository_instance.update_settings_bulk.return_value = [
+            AdminLoggingSetting(setting_name="EVENT_A", is_enabled=True)
+        ]
+
+        with self.assertRaises(HTTPException) as context:
+            self.service.update_settings_bulk({"EVENT_A": True, "NON_EXISTENT_EVENT": True})
+
+        self.assertEqual(context.exception.status_code, 404)
+        self.assertEqual(self.mock_db_session.commits, 0)
+        self.assertEqual(self.mock_db_session.rollbacks, 1)
 
     def test_initialize_default_settings(self):
         # Define the default settings as they are in the service
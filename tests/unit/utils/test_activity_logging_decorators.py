@@ -1,18 +1,18 @@
+import asyncio
+import io
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import MagicMock, patch, AsyncMock
 import functools # For wraps, though not strictly needed for test structure
+from collections import ChainMap
+from types import SimpleNamespace
 from fastapi import Request, HTTPException
 from pydantic import BaseModel, Field
 
 # Adjust import path based on your project structure
-from utils.activity_logging_decorators import log_activity, SENSITIVE_FIELD_NAMES
+from utils.activity_logging_decorators import log_activity, EventDetails, SENSITIVE_FIELD_NAMES
 from services.activity_logger_service import ActivityLoggerService # For type hint
 
-# Ensure the utils directory is in the Python path for imports
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
-
 # --- Test Pydantic Models ---
 class MockUserInputSchema(BaseModel):
     username: str
@@ -21,7 +21,7 @@ class MockUserInputSchema(BaseModel):
     
 class MockUpdateSchema(BaseModel):
     description: str
-    secret_field: str = Field(default="default_secret") # Sensitive
+    api_key: str = Field(default="default_key") # Sensitive
 
 class MockResourceResponse(BaseModel):
     id: str
@@ -29,71 +29,146 @@ class MockResourceResponse(BaseModel):
     value: int
 
 
-class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
+# Default logger_service config, shared read-only by all tests
+_DEFAULT_CONFIG = {
+    "LOG_DATA_MODIFICATIONS": False, # Default to False
+    # Add other event types if needed for specific tests
+    "MOCK_CREATE_SUCCESS": True,
+    "MOCK_UPDATE_SUCCESS": True,
+    "MOCK_DELETE_SUCCESS": True,
+    "MOCK_OPERATION_SUCCESS": True,
+    "MOCK_OPERATION_FAILURE": True,
+    "MOCK_HTTP_FAILURE": True,
+    "MOCK_GENERAL_FAILURE": True,
+}
+
+# --- Lightweight fakes ---
+# The decorator only reads request.app.state.activity_logger_service, so plain
+# objects are enough; a spec'd MagicMock(spec=Request) is also falsy (Request
+# is a Mapping, so the mock's __len__ returns 0) and would be skipped.
+class _FakeAppState:
+    __slots__ = ("activity_logger_service",)
+
+    def __init__(self, activity_logger_service):
+        self.activity_logger_service = activity_logger_service
+
+class _FakeApp:
+    __slots__ = ("state",)
+
+    def __init__(self, state):
+        self.state = state
+
+class _FakeRequest:
+    __slots__ = ("app",)
+
+    def __init__(self, app):
+        self.app = app
+
 
-    async def asyncSetUp(self):
-        self.mock_logger_service = MagicMock(spec=ActivityLoggerService)
-        self.mock_logger_service.log = MagicMock() # Mock the log method itself
+def run_in_class_loop(test_coro):
+    """Runs an async test method on the class-wide event loop instead of a fresh one per test."""
+    @functools.wraps(test_coro)
+    def wrapper(self):
+        return self.loop.run_until_complete(test_coro(self))
+    return wrapper
+
+
+class TestLogActivityDecorator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+
+        # The spec'd logger mock is built once; tests share it and reset it in tearDown.
+        # MagicMock is kept only for the logger service, whose log calls are asserted.
+        cls._shared_logger_service = MagicMock(spec=ActivityLoggerService)
+        cls._shared_logger_service.log = MagicMock() # Mock the log method itself
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.close()
+
+    def setUp(self):
+        self.mock_logger_service = self._shared_logger_service
         
-        # Mock request object and its state
-        self.mock_request = MagicMock(spec=Request)
-        self.mock_request.app = MagicMock()
-        self.mock_request.app.state = MagicMock()
-        self.mock_request.app.state.activity_logger_service = self.mock_logger_service
-
-        # Default config for logger_service
-        self.mock_logger_service.config = {
-            "LOG_DATA_MODIFICATIONS": False, # Default to False
-            # Add other event types if needed for specific tests
-            "MOCK_CREATE_SUCCESS": True,
-            "MOCK_UPDATE_SUCCESS": True,
-            "MOCK_DELETE_SUCCESS": True,
-            "MOCK_OPERATION_SUCCESS": True,
-            "MOCK_OPERATION_FAILURE": True,
-            "MOCK_HTTP_FAILURE": True,
-            "MOCK_GENERAL_FAILURE": True,
-        }
+        # Fake request object and its app state
+        self.mock_request = _FakeRequest(_FakeApp(_FakeAppState(self.mock_logger_service)))
+
+        # Default config for logger_service; per-test overrides land in the empty front map
+        self.mock_logger_service.config = ChainMap({}, _DEFAULT_CONFIG)
+        # Answer is_enabled from whatever config the test installs, like the real service does
+        self.mock_logger_service.is_enabled.side_effect = lambda event_type: bool(self.mock_logger_service.config.get(event_type))
+
+    def tearDown(self):
+        self.mock_logger_service.reset_mock()
 
     # --- Test Decorated Functions ---
-    async def test_success_path_basic_logging(self):
+    @run_in_class_loop
+    async def test_success_paths(self):
         @log_activity(success_event_type="MOCK_OPERATION_SUCCESS", failure_event_type="MOCK_OPERATION_FAILURE")
-        async def mock_successful_operation(param1: str, request: Request, current_user: MagicMock = None):
+        async def mock_successful_operation(param1: str, request: Request, current_user: SimpleNamespace = None):
             return {"status": "ok", "result_id": "res123"}
 
-        mock_user = MagicMock()
-        mock_user.email = "test@example.com"
-        mock_user.id = "user_uuid_123"
-
-        await mock_successful_operation("value1", request=self.mock_request, current_user=mock_user)
-
-        self.mock_logger_service.log.assert_called_once()
-        logged_event = self.mock_logger_service.log.call_args[0][0]
-        
-        self.assertEqual(logged_event["event_type"], "MOCK_OPERATION_SUCCESS")
-        self.assertEqual(logged_event["actor_user_email"], "test@example.com")
-        self.assertEqual(logged_event["function_name"], "mock_successful_operation")
-        self.assertIn("input_args_summary", logged_event)
-        self.assertEqual(logged_event["input_args_summary"]["param1"], "value1")
-        self.assertNotIn("data_changed_summary", logged_event) # LOG_DATA_MODIFICATIONS is False by default
-
-    async def test_success_path_with_log_data_modifications_create(self):
-        self.mock_logger_service.config["LOG_DATA_MODIFICATIONS"] = True
-        
         @log_activity(success_event_type="MOCK_CREATE_SUCCESS", failure_event_type="MOCK_OPERATION_FAILURE")
-        async def mock_create_operation(item_data: MockUserInputSchema, request: Request, current_user: MagicMock = None):
+        async def mock_create_operation(item_data: MockUserInputSchema, request: Request, current_user: SimpleNamespace = None):
             return MockResourceResponse(id="new_item_id_789", name=item_data.username, value=100)
 
-        mock_user = MagicMock(email="creator@example.com", id="creator_id")
-        input_data = MockUserInputSchema(username="testuser", password="securepassword", email="newuser@example.com")
-
-        await mock_create_operation(item_data=input_data, request=self.mock_request, current_user=mock_user)
-        
-        self.mock_logger_service.log.assert_called_once()
-        logged_event = self.mock_logger_service.log.call_args[0][0]
+        @log_activity(success_event_type="MOCK_UPDATE_SUCCESS", failure_event_type="MOCK_OPERATION_FAILURE")
+        async def mock_update_operation(item_id: str, update_data: MockUpdateSchema, request: Request, current_user: SimpleNamespace = None):
+            # Simulate returning the updated object or just a success status
+            return {"id": item_id, "description": update_data.description, "status": "updated"}
 
-        self.assertEqual(logged_event["event_type"], "MOCK_CREATE_SUCCESS")
-        self.assertIn("data_changed_summary", logged_event)
-        summary = logged_event["data_changed_summary"]
+        # (case name, config overrides, call of the decorated function, checks on the logged event)
+        cases = [
+            (
+                "basic_logging", {},
+                # FastAPI calls endpoints with keyword arguments, and only those are summarized
+                lambda: mock_successful_operation(
+                    param1="value1", request=self.mock_request,
+                    current_user=SimpleNamespace(email="test@example.com", id="user_uuid_123")),
+                self._check_basic_logging,
+            ),
+            (
+                "log_data_modifications_create", {"LOG_DATA_MODIFICATIONS": True},
+                lambda: mock_create_operation(
+                    item_data=MockUserInputSchema(username="testuser", password="securepassword", email="newuser@example.com"),
+                    request=self.mock_request,
+                    current_user=SimpleNamespace(email="creator@example.com", id="creator_id")),
+                self._check_log_data_modifications_create,
+            ),
+            (
+                "log_data_modifications_update", {"LOG_DATA_MODIFICATIONS": True},
+                lambda: mock_update_operation(
+                    item_id="item_xyz_123",
+                    update_data=MockUpdateSchema(description="New Description", api_key="new_key"),
+                    request=self.mock_request,
+                    current_user=SimpleNamespace(email="updater@example.com", id="updater_id")),
+                self._check_log_data_modifications_update,
+            ),
+        ]
+
+        for name, config_overrides, call, check in cases:
+            with self.subTest(case=name):
+                self.mock_logger_service.log.reset_mock()
+                self.mock_logger_service.config = ChainMap(dict(config_overrides), _DEFAULT_CONFIG)
+
+                await call()
+
+                self.mock_logger_service.log.assert_called_once()
+                check(self.mock_logger_service.log.call_args[0][0])
+
+    def _check_basic_logging(self, logged_event):
+        self.assertEqual(logged_event.event_type, "MOCK_OPERATION_SUCCESS")
+        self.assertEqual(logged_event.actor_user_email, "test@example.com")
+        self.assertEqual(logged_event.function_name, "mock_successful_operation")
+        self.assertIsInstance(logged_event, EventDetails)
+        self.assertEqual(logged_event.input_args_summary["param1"], "value1")
+        self.assertIsNone(logged_event.data_changed_summary) # LOG_DATA_MODIFICATIONS is False by default
+
+    def _check_log_data_modifications_create(self, logged_event):
+        self.assertEqual(logged_event.event_type, "MOCK_CREATE_SUCCESS")
+        self.assertIsNotNone(logged_event.data_changed_summary)
+        summary = logged_event.data_changed_summary
         
         self.assertIn("input_data", summary)
         self.assertEqual(summary["input_data"]["username"], "testuser")
@@ -101,37 +176,23 @@ class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
         self.assertNotIn("password", summary["input_data"]) # Sensitive field check
 
         self.assertEqual(summary["created_resource_id"], "new_item_id_789")
-        self.assertIn("result_id:new_item_id_789", logged_event["target_resource_ids"])
+        self.assertIn("result_id:new_item_id_789", logged_event.target_resource_ids)
 
-
-    async def test_success_path_with_log_data_modifications_update(self):
-        self.mock_logger_service.config["LOG_DATA_MODIFICATIONS"] = True
-
-        @log_activity(success_event_type="MOCK_UPDATE_SUCCESS", failure_event_type="MOCK_OPERATION_FAILURE")
-        async def mock_update_operation(item_id: str, update_data: MockUpdateSchema, request: Request, current_user: MagicMock = None):
-            # Simulate returning the updated object or just a success status
-            return {"id": item_id, "description": update_data.description, "status": "updated"}
-
-        mock_user = MagicMock(email="updater@example.com", id="updater_id")
-        update_payload = MockUpdateSchema(description="New Description", secret_field="new_secret")
+    def _check_log_data_modifications_update(self, logged_event):
         item_to_update_id = "item_xyz_123"
 
-        await mock_update_operation(item_id=item_to_update_id, update_data=update_payload, request=self.mock_request, current_user=mock_user)
-        
-        self.mock_logger_service.log.assert_called_once()
-        logged_event = self.mock_logger_service.log.call_args[0][0]
-        
-        self.assertEqual(logged_event["event_type"], "MOCK_UPDATE_SUCCESS")
-        self.assertIn("data_changed_summary", logged_event)
-        summary = logged_event["data_changed_summary"]
+        self.assertEqual(logged_event.event_type, "MOCK_UPDATE_SUCCESS")
+        self.assertIsNotNone(logged_event.data_changed_summary)
+        summary = logged_event.data_changed_summary
 
         self.assertIn(item_to_update_id, summary["target_resource_ids"])
         self.assertIn("update_payload", summary)
         self.assertEqual(summary["update_payload"]["description"], "New Description")
-        self.assertNotIn("secret_field", summary["update_payload"]) # Sensitive field check
-        self.assertIn(item_to_update_id, logged_event["target_resource_ids"]) # From kwargs extraction
+        self.assertNotIn("api_key", summary["update_payload"]) # Sensitive field check
+        self.assertIn(item_to_update_id, logged_event.target_resource_ids) # From kwargs extraction
 
 
+    @run_in_class_loop
     async def test_failure_path_http_exception(self):
         @log_activity(success_event_type="MOCK_OPERATION_SUCCESS", failure_event_type="MOCK_HTTP_FAILURE")
         async def mock_operation_http_fail(request: Request):
@@ -143,11 +204,12 @@ class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
         self.mock_logger_service.log.assert_called_once()
         logged_event = self.mock_logger_service.log.call_args[0][0]
 
-        self.assertEqual(logged_event["event_type"], "MOCK_HTTP_FAILURE")
-        self.assertEqual(logged_event["error_message"], "Permission Denied")
-        self.assertEqual(logged_event["status_code"], 403)
-        self.assertNotIn("error_stacktrace", logged_event) # Stacktrace not typically for HTTPException by default
+        self.assertEqual(logged_event.event_type, "MOCK_HTTP_FAILURE")
+        self.assertEqual(logged_event.error_message, "Permission Denied")
+        self.assertEqual(logged_event.status_code, 403)
+        self.assertIsNone(logged_event.error_stacktrace) # Stacktrace not typically for HTTPException by default
 
+    @run_in_class_loop
     async def test_failure_path_general_exception(self):
         @log_activity(success_event_type="MOCK_OPERATION_SUCCESS", failure_event_type="MOCK_GENERAL_FAILURE")
         async def mock_operation_general_fail(request: Request):
@@ -159,22 +221,53 @@ class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
         self.mock_logger_service.log.assert_called_once()
         logged_event = self.mock_logger_service.log.call_args[0][0]
 
-        self.assertEqual(logged_event["event_type"], "MOCK_GENERAL_FAILURE")
-        self.assertEqual(logged_event["error_message"], "Something went very wrong")
-        self.assertEqual(logged_event["error_type"], "ValueError")
-        self.assertIn("error_stacktrace", logged_event)
-        self.assertTrue(len(logged_event["error_stacktrace"]) > 0)
+        self.assertEqual(logged_event.event_type, "MOCK_GENERAL_FAILURE")
+        self.assertEqual(logged_event.error_message, "Something went very wrong")
+        self.assertEqual(logged_event.error_type, "ValueError")
+        self.assertIsNotNone(logged_event.error_stacktrace)
+        self.assertTrue(len(logged_event.error_stacktrace) > 0)
+
+    @run_in_class_loop
+    async def test_failure_path_stacktrace_disabled(self):
+        self.mock_logger_service.config = ChainMap({"LOG_STACKTRACES": False}, _DEFAULT_CONFIG)
+
+        @log_activity(success_event_type="MOCK_OPERATION_SUCCESS", failure_event_type="MOCK_GENERAL_FAILURE")
+        async def mock_operation_general_fail(request: Request):
+            raise ValueError("Something went very wrong")
 
+        with patch('utils.activity_logging_decorators.traceback.format_exc') as mock_format_exc:
+            with self.assertRaises(ValueError):
+                await mock_operation_general_fail(request=self.mock_request)
+
+        mock_format_exc.assert_not_called()
+        logged_event = self.mock_logger_service.log.call_args[0][0]
+        self.assertEqual(logged_event.error_type, "ValueError")
+        self.assertIsNone(logged_event.error_stacktrace)
+
+    @run_in_class_loop
     async def test_resource_id_extraction_from_kwargs(self):
         @log_activity(success_event_type="MOCK_OPERATION_SUCCESS")
-        async def mock_op_with_ids(sample_id: str, user_id: str, request: Request): # sample_id should be picked first
+        async def mock_op_with_ids(sample_id: str, user_id: str, request: Request): # user_id comes first in _RESOURCE_ID_KEYS
             return "ok"
 
         await mock_op_with_ids(sample_id="sample1", user_id="user1", request=self.mock_request)
         logged_event = self.mock_logger_service.log.call_args[0][0]
-        self.assertIn("sample1", logged_event["target_resource_ids"])
-        self.assertNotIn("user1", logged_event["target_resource_ids"]) # Only first one from preferred list
+        self.assertIn("user1", logged_event.target_resource_ids)
+        self.assertNotIn("sample1", logged_event.target_resource_ids) # Only first one from preferred list
+
+    @run_in_class_loop
+    async def test_request_and_user_resolved_positionally(self):
+        @log_activity(success_event_type="MOCK_OPERATION_SUCCESS")
+        async def mock_positional_operation(item_name: str, http_request: Request, current_user: SimpleNamespace):
+            return "ok"
+
+        await mock_positional_operation("widget", self.mock_request, SimpleNamespace(email="positional@example.com", id="user_pos"))
+
+        self.mock_logger_service.log.assert_called_once()
+        logged_event = self.mock_logger_service.log.call_args[0][0]
+        self.assertEqual(logged_event.actor_user_email, "positional@example.com")
 
+    @run_in_class_loop
     async def test_input_args_summary_sensitive_field_exclusion(self):
         # This test focuses on the input_args_summary, not data_changed_summary's schema extraction
         @log_activity(success_event_type="MOCK_OPERATION_SUCCESS")
@@ -184,11 +277,12 @@ class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
         await mock_op_with_sensitive_args(request=self.mock_request, password="test_password", token="test_token", normal_arg="visible")
         logged_event = self.mock_logger_service.log.call_args[0][0]
         
-        summary = logged_event["input_args_summary"]
+        summary = logged_event.input_args_summary
         self.assertNotIn("password", summary)
         self.assertNotIn("token", summary)
         self.assertEqual(summary["normal_arg"], "visible")
 
+    @run_in_class_loop
     async def test_no_logger_service_available(self):
         # Detach logger service from request mock
         self.mock_request.app.state.activity_logger_service = None 
@@ -198,12 +292,26 @@ class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
             return "success"
         
         # Should run without error and without calling log
-        with patch('builtins.print') as mock_print: # To check for the warning
+        captured_stdout = io.StringIO() # To check for the warning
+        with redirect_stdout(captured_stdout):
             result = await mock_operation(request=self.mock_request)
-            self.assertEqual(result, "success")
-            self.mock_logger_service.log.assert_not_called()
-            mock_print.assert_any_call("Warning: ActivityLoggerService not found for event MOCK_OPERATION_SUCCESS. Operation will proceed without logging.")
+        self.assertEqual(result, "success")
+        self.mock_logger_service.log.assert_not_called()
+        self.assertIn("Warning: ActivityLoggerService not found for event MOCK_OPERATION_SUCCESS. Operation will proceed without logging.", captured_stdout.getvalue())
+
+    @run_in_class_loop
+    async def test_disabled_event_types_skip_logging(self):
+        @log_activity(success_event_type="MOCK_DISABLED_SUCCESS", failure_event_type="MOCK_DISABLED_FAILURE")
+        async def mock_operation(request: Request, payload: str):
+            return "done"
+
+        result = await mock_operation(request=self.mock_request, payload="x" * 1000)
+
+        # Neither event type is enabled in the config, so nothing is built or sent to the logger
+        self.assertEqual(result, "done")
+        self.mock_logger_service.log.assert_not_called()
 
+    @run_in_class_loop
     async def test_sync_function_decoration_basic_call(self):
         # Note: The sync wrapper in PoC is very basic and might not find logger_service
         # This test primarily checks if it wraps without error and calls the original function.
@@ -224,7 +332,7 @@ class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(result_success, "Sync result: 10")
             mock_sync_logger_instance.log.assert_called_once()
             logged_event_success = mock_sync_logger_instance.log.call_args[0][0]
-            self.assertEqual(logged_event_success["event_type"], "MOCK_SYNC_SUCCESS")
+            self.assertEqual(logged_event_success.event_type, "MOCK_SYNC_SUCCESS")
 
             mock_sync_logger_instance.log.reset_mock() # Reset for next call
 
@@ -234,10 +342,10 @@ class TestLogActivityDecorator(unittest.IsolatedAsyncioTestCase):
             
             mock_sync_logger_instance.log.assert_called_once()
             logged_event_failure = mock_sync_logger_instance.log.call_args[0][0]
-            self.assertEqual(logged_event_failure["event_type"], "MOCK_SYNC_FAILURE")
-            self.assertEqual(logged_event_failure["error_message"], "Sync negative value")
-            self.assertEqual(logged_event_failure["error_type"], "ValueError")
-            self.assertIn("error_stacktrace", logged_event_failure)
+            self.assertEqual(logged_event_failure.event_type, "MOCK_SYNC_FAILURE")
+            self.assertEqual(logged_event_failure.error_message, "Sync negative value")
+            self.assertEqual(logged_event_failure.error_type, "ValueError")
+            self.assertIsNotNone(logged_event_failure.error_stacktrace)
 
 
 if __name__ == '__main__':
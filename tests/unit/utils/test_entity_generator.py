@@ -1,4 +1,5 @@
 import unittest
+import glob
 import json
 import os
 import shutil
@@ -13,85 +14,135 @@ from utils.entity_generator import (
     map_sqlalchemy_type,
     map_pydantic_type,
     map_pydantic_default,
-    generate_entity_files
+    generate_entity_files,
+    _get_env,
+    _write_file
 )
 
 class TestEntityGeneratorHelpers(unittest.TestCase):
 
     def test_to_snake_case(self):
-        self.assertEqual(to_snake_case("HelloWorld"), "hello_world")
-        self.assertEqual(to_snake_case("HelloHTMLWorld"), "hello_html_world")
-        self.assertEqual(to_snake_case("Already_Snake_Case"), "already_snake_case")
-        self.assertEqual(to_snake_case("ProductItem"), "product_item")
+        for src, expected in [
+            ("HelloWorld", "hello_world"),
+            ("HelloHTMLWorld", "hello_html_world"),
+            ("Already_Snake_Case", "already_snake_case"),
+            ("ProductItem", "product_item"),
+            ("", ""), # Empty input short-circuits
+        ]:
+            with self.subTest(src=src):
+                self.assertEqual(to_snake_case(src), expected)
 
     def test_to_pascal_case(self):
-        self.assertEqual(to_pascal_case("hello_world"), "HelloWorld")
-        self.assertEqual(to_pascal_case("hello_html_world"), "HelloHtmlWorld")
-        self.assertEqual(to_pascal_case("ProductItem"), "ProductItem")
-        self.assertEqual(to_pascal_case("project"), "Project")
+        for src, expected in [
+            ("hello_world", "HelloWorld"),
+            ("hello_html_world", "HelloHtmlWorld"),
+            ("ProductItem", "ProductItem"),
+            ("project", "Project"),
+            ("UUID", "Uuid"), # All-caps names are lowered after the first letter
+            ("", ""), # Empty input short-circuits
+        ]:
+            with self.subTest(src=src):
+                self.assertEqual(to_pascal_case(src), expected)
 
     def test_map_sqlalchemy_type(self):
-        self.assertEqual(map_sqlalchemy_type("string"), "String")
-        self.assertEqual(map_sqlalchemy_type("integer"), "Integer")
-        self.assertEqual(map_sqlalchemy_type("datetime"), "DateTime")
-        self.assertEqual(map_sqlalchemy_type("unknown"), "String") # Test default
+        for src, expected in [
+            ("string", "String"),
+            ("integer", "Integer"),
+            ("datetime", "DateTime"),
+            ("unknown", "String"), # Test default
+        ]:
+            with self.subTest(src=src):
+                self.assertEqual(map_sqlalchemy_type(src), expected)
 
     def test_map_pydantic_type(self):
-        self.assertEqual(map_pydantic_type("string"), "str")
-        self.assertEqual(map_pydantic_type("integer"), "int")
-        self.assertEqual(map_pydantic_type("datetime"), "datetime")
-        self.assertEqual(map_pydantic_type("unknown"), "str") # Test default
+        for src, expected in [
+            ("string", "str"),
+            ("integer", "int"),
+            ("datetime", "datetime"),
+            ("unknown", "str"), # Test default
+        ]:
+            with self.subTest(src=src):
+                self.assertEqual(map_pydantic_type(src), expected)
 
     def test_map_pydantic_default(self):
-        self.assertEqual(map_pydantic_default(None), "None")
-        self.assertEqual(map_pydantic_default(True), "True")
-        self.assertEqual(map_pydantic_default(10), "10")
-        self.assertEqual(map_pydantic_default("test"), '"test"')
-        self.assertEqual(map_pydantic_default(0.5), "0.5")
+        for src, expected in [
+            (None, "None"),
+            (True, "True"),
+            (10, "10"),
+            ("test", '"test"'),
+            (0.5, "0.5"),
+        ]:
+            with self.subTest(src=src):
+                self.assertEqual(map_pydantic_default(src), expected)
+
+
+# Path to the test.json file from the actual project structure
+# This assumes the tests are run from the project root or test.json is accessible
+TEST_JSON_PATH = "test.json"
 
 
 class TestEntityGeneration(unittest.TestCase):
 
-    def setUp(self):
-        # Create a temporary directory to act as the project root for tests
-        self.test_dir = tempfile.mkdtemp()
-        self.templates_dir = os.path.join(self.test_dir, "templates")
+    @classmethod
+    def setUpClass(cls):
+        # The dummy templates are read-only inputs, so build them once for the whole class
+        cls._templates_root = tempfile.mkdtemp()
+        cls._templates_src = os.path.join(cls._templates_root, "templates")
 
         # Create dummy template structure (simplified)
-        os.makedirs(os.path.join(self.templates_dir, "models"), exist_ok=True)
-        os.makedirs(os.path.join(self.templates_dir, "schemas"), exist_ok=True)
-        os.makedirs(os.path.join(self.templates_dir, "routers"), exist_ok=True)
-        os.makedirs(os.path.join(self.templates_dir, "services"), exist_ok=True)
-        os.makedirs(os.path.join(self.templates_dir, "repositories"), exist_ok=True)
+        os.makedirs(os.path.join(cls._templates_src, "models"), exist_ok=True)
+        os.makedirs(os.path.join(cls._templates_src, "schemas"), exist_ok=True)
+        os.makedirs(os.path.join(cls._templates_src, "routers"), exist_ok=True)
+        os.makedirs(os.path.join(cls._templates_src, "services"), exist_ok=True)
+        os.makedirs(os.path.join(cls._templates_src, "repositories"), exist_ok=True)
 
         # Create very basic dummy templates for testing generation paths
-        with open(os.path.join(self.templates_dir, "models/model.py.j2"), "w") as f:
+        with open(os.path.join(cls._templates_src, "models/model.py.j2"), "w") as f:
             f.write("Model: {{ entity_name }}\nSnake: {{ entity_name_snake }}\nDesc: {{ entity_description }}\n{% for prop in properties %}{{prop.name}}:{{prop.type|map_sqlalchemy_type}}\n{% endfor %}{% for rel in relationships %}Rel: {{ rel.name }} to {{ rel.target_entity_pascal }} ({{ rel.type }}) BP: {{rel.back_populates}}{% if rel.type == 'many-to-one' %} FK: {{rel.foreign_key_column}}{% endif %}{% if rel.type == 'many-to-many' %} Assoc: {{ entity_name_snake }}_{{ rel.target_entity_snake }}_association{% endif %}\n{% endfor %}")
-        with open(os.path.join(self.templates_dir, "schemas/schema.py.j2"), "w") as f:
+        with open(os.path.join(cls._templates_src, "schemas/schema.py.j2"), "w") as f:
             f.write("Schema: {{ entity_name }}\n{% for prop in properties %}{{prop.name}}:{{prop.type|map_pydantic_type}}={{prop.default_value|map_pydantic_default}}\n{% endfor %}")
-        with open(os.path.join(self.templates_dir, "routers/router.py.j2"), "w") as f:
+        with open(os.path.join(cls._templates_src, "routers/router.py.j2"), "w") as f:
             f.write("Router: {{ entity_name_snake }}")
-        with open(os.path.join(self.templates_dir, "services/service.py.j2"), "w") as f:
+        with open(os.path.join(cls._templates_src, "services/service.py.j2"), "w") as f:
             f.write("Service: {{ entity_name }}")
-        with open(os.path.join(self.templates_dir, "repositories/repository.py.j2"), "w") as f:
+        with open(os.path.join(cls._templates_src, "repositories/repository.py.j2"), "w") as f:
             f.write("Repository: {{ entity_name }}")
 
-        # Path to the test.json file from the actual project structure
-        # This assumes the tests are run from the project root or test.json is accessible
-        self.test_json_path = "test.json"
-        if not os.path.exists(self.test_json_path):
-            # Create a dummy test.json in the temp dir if the real one is not found
-            # This is a fallback for isolated testing, but ideally, it uses the real one.
-            self.test_json_path = os.path.join(self.test_dir, "test.json")
-            with open(self.test_json_path, "w") as f:
-                json.dump([{"name": "Dummy", "properties": [{"name": "field1", "type": "string"}]}], f)
-                print(f"WARNING: Using dummy test.json for tests: {self.test_json_path}")
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._templates_root)
+        # The generator caches an Environment per templates dir; drop those for the removed trees
+        _get_env.cache_clear()
 
+    def _make_project_dir(self):
+        """Creates a fresh project root with the dummy templates; the caller removes it."""
+        project_dir = tempfile.mkdtemp()
+        # One copytree of the shared templates instead of rebuilding them for every test
+        shutil.copytree(self._templates_src, os.path.join(project_dir, "templates"))
+        return project_dir
+
+    def setUp(self):
+        # Create a temporary directory to act as the project root for tests
+        self.test_dir = self._make_project_dir()
+        self.templates_dir = os.path.join(self.test_dir, "templates")
 
     def tearDown(self):
         # Remove the temporary directory after tests
         shutil.rmtree(self.test_dir)
 
+    def _read_outputs(self, root=None):
+        """Reads every generated .py file and the SQL privileges file once, keyed by path relative to root (default self.test_dir)."""
+        root = root or self.test_dir
+        paths = glob.glob(os.path.join(root, "**", "*.py"), recursive=True)
+        sql_path = os.path.join(root, "generated_privileges.sql")
+        if os.path.exists(sql_path):
+            paths.append(sql_path)
+        outputs = {}
+        for path in paths:
+            with open(path, "r") as f:
+                outputs[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+        return outputs
+
     def test_generate_single_entity_no_relationships(self):
         single_entity_json_string = json.dumps([
             {
@@ -106,32 +157,78 @@ class TestEntityGeneration(unittest.TestCase):
         ])
 
         generate_entity_files(single_entity_json_string, base_output_path=self.test_dir)
+        outputs = self._read_outputs()
 
         # Check if files are created
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "models/my_test_entity.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "schemas/my_test_entity_schema.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "routers/my_test_entity.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "services/my_test_entity.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "repositories/my_test_entity.py")))
+        for path in ("models/my_test_entity.py", "schemas/my_test_entity_schema.py", "routers/my_test_entity.py",
+                     "services/my_test_entity.py", "repositories/my_test_entity.py"):
+            with self.subTest(path=path):
+                self.assertIn(path, outputs)
 
         # Check some content (basic check based on dummy templates)
-        with open(os.path.join(self.test_dir, "models/my_test_entity.py"), "r") as f:
-            content = f.read()
-            self.assertIn("Model: MyTestEntity", content)
-            self.assertIn("name:String", content)
+        content = outputs["models/my_test_entity.py"]
+        self.assertIn("Model: MyTestEntity", content)
+        self.assertIn("name:String", content)
 
         # Check SQL privileges file
-        sql_file_path = os.path.join(self.test_dir, "generated_privileges.sql")
-        self.assertTrue(os.path.exists(sql_file_path))
-        with open(sql_file_path, "r") as f:
-            sql_content = f.read()
-            self.assertIn("my_test_entity:create", sql_content)
-            self.assertIn("my_test_entity:read", sql_content)
-            self.assertIn("my_test_entity:update", sql_content)
-            self.assertIn("my_test_entity:delete", sql_content)
-            self.assertEqual(sql_content.count("INSERT INTO privilege"), 4)
+        sql_content = outputs["generated_privileges.sql"]
+        for privilege in ("my_test_entity:create", "my_test_entity:read", "my_test_entity:update", "my_test_entity:delete"):
+            with self.subTest(privilege=privilege):
+                self.assertIn(privilege, sql_content)
+        self.assertEqual(sql_content.count("INSERT INTO privilege"), 4)
 
 
+    def test_parallel_writes_match_serial_output(self):
+        json_string = json.dumps([
+            {"name": "Invoice", "properties": [{"name": "amount", "type": "float"}], "relationships": []},
+            {"name": "LineItem", "properties": [{"name": "quantity", "type": "integer"}], "relationships": []},
+        ])
+        generate_entity_files(json_string, base_output_path=self.test_dir)
+        serial_outputs = self._read_outputs()
+
+        parallel_dir = self._make_project_dir() # Separate output dir for the parallel run
+        self.addCleanup(shutil.rmtree, parallel_dir)
+        generate_entity_files(json_string, base_output_path=parallel_dir, parallel_writes=True)
+        parallel_outputs = self._read_outputs(parallel_dir)
+
+        # Privilege ids are random per run, so only the rendered entity files are compared
+        serial_py = {path: content for path, content in serial_outputs.items() if path.endswith(".py")}
+        self.assertEqual(len(serial_py), 10)
+        self.assertEqual({path: parallel_outputs[path] for path in serial_py}, serial_py)
+        self.assertEqual(parallel_outputs["generated_privileges.sql"].count("INSERT INTO privilege"), 8)
+
+    def test_privileges_sql_flushed_per_entity(self):
+        json_string = json.dumps([
+            {"name": "Invoice", "properties": [], "relationships": []},
+            {"name": "LineItem", "properties": [], "relationships": []},
+        ])
+        # A one-byte threshold forces a write after every entity
+        with patch("utils.entity_generator._SQL_FLUSH_BYTES", 1):
+            generate_entity_files(json_string, base_output_path=self.test_dir)
+        sql_lines = self._read_outputs()["generated_privileges.sql"].splitlines()
+        self.assertEqual(len(sql_lines), 8)
+        self.assertEqual([line.split("'")[3] for line in sql_lines],
+                         ["invoice:create", "invoice:read", "invoice:update", "invoice:delete",
+                          "line_item:create", "line_item:read", "line_item:update", "line_item:delete"])
+
+    def test_unchanged_files_not_rewritten(self):
+        json_string = json.dumps([{"name": "Invoice", "properties": [], "relationships": []}])
+        generate_entity_files(json_string, base_output_path=self.test_dir)
+        model_path = os.path.join(self.test_dir, "models", "invoice.py")
+        router_path = os.path.join(self.test_dir, "routers", "invoice.py")
+        with open(model_path, "a") as f:
+            f.write("# hand edit\n")
+
+        with patch("utils.entity_generator._write_file", wraps=_write_file) as mock_write:
+            generate_entity_files(json_string, base_output_path=self.test_dir)
+
+        # Only the hand-edited file is written again, restoring the rendered content
+        self.assertEqual([call.args[0] for call in mock_write.call_args_list], [model_path])
+        with open(model_path) as f:
+            self.assertNotIn("# hand edit", f.read())
+        self.assertTrue(os.path.exists(router_path))
+
+    @unittest.skipUnless(os.path.exists(TEST_JSON_PATH), "requires the test.json fixture in the project root")
     def test_generate_from_test_json_file(self):
         # This test uses the test.json created in the previous plan step
         # Ensure utils/entity_generator.py can find 'templates' relative to base_output_path
@@ -139,47 +236,34 @@ class TestEntityGeneration(unittest.TestCase):
         # We need to make sure the 'templates' dir used by the generator is the one in self.test_dir
         # The generator constructs template_dir = os.path.join(base_output_path, "templates")
 
-        with open(self.test_json_path, "r") as f:
+        with open(TEST_JSON_PATH, "r") as f:
             json_string = f.read()
 
         generate_entity_files(json_string, base_output_path=self.test_dir)
+        outputs = self._read_outputs()
 
-        # Check for Project entity files
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "models/project.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "schemas/project_schema.py")))
-
-        # Check for Task entity files
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "models/task.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "schemas/task_schema.py")))
-
-        # Check for Tag entity files
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "models/tag.py")))
-        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "schemas/tag_schema.py")))
+        # Check for Project, Task and Tag entity files
+        for path in ("models/project.py", "schemas/project_schema.py", "models/task.py",
+                     "schemas/task_schema.py", "models/tag.py", "schemas/tag_schema.py"):
+            with self.subTest(path=path):
+                self.assertIn(path, outputs)
 
         # Verify some relationship content in generated model (Project and Task)
-        with open(os.path.join(self.test_dir, "models/project.py"), "r") as f:
-            content = f.read()
-            self.assertIn("Rel: tasks to Task (one-to-many) BP: project", content)
+        self.assertIn("Rel: tasks to Task (one-to-many) BP: project", outputs["models/project.py"])
 
-        with open(os.path.join(self.test_dir, "models/task.py"), "r") as f:
-            content = f.read()
-            self.assertIn("Rel: project to Project (many-to-one) BP: tasks FK: project_id", content)
-            self.assertIn("Rel: tags to Tag (many-to-many) BP: tasks Assoc: task_tag_association", content)
+        content = outputs["models/task.py"]
+        self.assertIn("Rel: project to Project (many-to-one) BP: tasks FK: project_id", content)
+        self.assertIn("Rel: tags to Tag (many-to-many) BP: tasks Assoc: task_tag_association", content)
 
         # Verify association table name in Tag model
-        with open(os.path.join(self.test_dir, "models/tag.py"), "r") as f:
-            content = f.read()
-            self.assertIn("Rel: tasks to Task (many-to-many) BP: tags Assoc: tag_task_association", content) # Note: entity_name_snake is 'tag', rel.target_entity_snake is 'task'
+        self.assertIn("Rel: tasks to Task (many-to-many) BP: tags Assoc: tag_task_association", outputs["models/tag.py"]) # Note: entity_name_snake is 'tag', rel.target_entity_snake is 'task'
 
         # Verify SQL privileges
-        sql_file_path = os.path.join(self.test_dir, "generated_privileges.sql")
-        self.assertTrue(os.path.exists(sql_file_path))
-        with open(sql_file_path, "r") as f:
-            sql_content = f.read()
-            self.assertIn("project:create", sql_content)
-            self.assertIn("task:read", sql_content)
-            self.assertIn("tag:delete", sql_content)
-            self.assertEqual(sql_content.count("INSERT INTO privilege"), 3 * 4) # 3 entities, 4 actions each
+        sql_content = outputs["generated_privileges.sql"]
+        for privilege in ("project:create", "task:read", "tag:delete"):
+            with self.subTest(privilege=privilege):
+                self.assertIn(privilege, sql_content)
+        self.assertEqual(sql_content.count("INSERT INTO privilege"), 3 * 4) # 3 entities, 4 actions each
 
 if __name__ == "__main__":
     # This allows running the tests directly
@@ -0,0 +1,71 @@
+"""
+JSON helpers for the configuration files used by the CLI.
+
+Uses orjson when it is installed and falls back to the standard library otherwise.
+Both backends take and return bytes, so callers open files in binary mode.
+"""
+
+import mmap
+import os
+
+# Files at least this large are parsed straight from a read-only memory map (orjson only)
+# instead of being read into a bytes object first; below it the mapping costs more than it saves.
+MMAP_THRESHOLD = 256 * 1024
+
+try:
+    import orjson
+
+    _loads_buffer = True  # orjson parses any buffer, including a memoryview over an mmap
+
+    def loads(data: bytes):
+        return orjson.loads(data)
+
+    def dumps(obj, pretty: bool = True) -> bytes:
+        """Serialize obj as indented JSON (2 spaces), or compactly when pretty is False."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+except ImportError:
+    import json
+
+    _loads_buffer = False
+
+    def loads(data: bytes):
+        return json.loads(data)
+
+    def dumps(obj, pretty: bool = True) -> bytes:
+        """Serialize obj as indented JSON (2 spaces), or compactly when pretty is False."""
+        if pretty:
+            return json.dumps(obj, indent=2).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def load_file(file_path: str):
+    """Parse the JSON file at file_path."""
+    with open(file_path, 'rb') as f:
+        if _loads_buffer and os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return loads(view)
+        return loads(f.read())
+
+
+def dump_file(obj, file_path: str, pretty: bool = True):
+    """
+    Write obj as JSON to file_path atomically; indented unless pretty is False.
+    
+    The data goes to a temporary file next to the target, is fsynced, and then
+    replaces the target in one rename, so a crash never leaves a half-written file.
+    """
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(obj, pretty))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
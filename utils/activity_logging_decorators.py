@@ -1,36 +1,129 @@
 import functools
 import inspect # For checking async
 import traceback # Added for stacktrace
+from dataclasses import dataclass
+from typing import Any, List, Optional
 from fastapi import Request, HTTPException
 from starlette.responses import Response # For type hinting if result is Response
 from pydantic import BaseModel # For checking schema instances
 
+# Imported once here rather than on every call of the sync wrapper
+try:
+    from services.activity_logger_service import ActivityLoggerService
+except ImportError:
+    ActivityLoggerService = None
+
 # Placeholder for where ActivityLoggerService might be globally available or how it's accessed.
 # In this PoC, we will rely on it being in request.app.state.activity_logger_service
 
-SENSITIVE_FIELD_NAMES = {'password', 'token', 'secret', 'credentials', 'cvv', 'card_number', 'api_key', 'access_token', 'refresh_token'}
+SENSITIVE_FIELD_NAMES = frozenset({'password', 'token', 'secret', 'credentials', 'cvv', 'card_number', 'api_key', 'access_token', 'refresh_token'})
+
+# kwargs never copied into input_args_summary: FastAPI/service objects and sensitive fields
+_EXCLUDED_KWARG_KEYS = frozenset({'db', 'request', 'current_user', 'password', 'token', 'credentials', 'form_data'})
+
+# kwargs checked, in priority order, for the id of the resource an operation targets.
+# A tuple rather than a set: the first key present wins.
+_RESOURCE_ID_KEYS = ("user_id", "sample_id", "role_id", "privilege_id", "id", "item_id")
+
+def _summarize_value(value):
+    """Returns value unchanged if its text form is under 200 chars, else that text truncated.
+    The text form is computed at most once, and not at all for strings."""
+    text = value if isinstance(value, str) else str(value)
+    return value if len(text) < 200 else text[:197] + "..."
+
+# Slotted event built by the decorator on every call instead of a dict. __slots__ is declared
+# by hand since dataclass(slots=True) needs Python 3.10; slots cannot carry class-level
+# defaults, so init=False and the optional fields are defaulted in __init__ instead.
+@dataclass(init=False)
+class EventDetails:
+    __slots__ = (
+        "event_type", "function_name", "module_name", "target_resource_ids", "input_args_summary",
+        "actor_user_email", "actor_user_id", "data_changed_summary",
+        "status_code", "error_type", "error_message", "error_stacktrace",
+    )
+    event_type: str
+    function_name: str
+    module_name: str
+    target_resource_ids: List[str]
+    input_args_summary: Any # Dict of summarized kwargs, or an error note if summarizing failed
+    actor_user_email: Optional[str]
+    actor_user_id: Optional[str]
+    data_changed_summary: Optional[dict]
+    status_code: Optional[int]
+    error_type: Optional[str]
+    error_message: Optional[str]
+    error_stacktrace: Optional[str]
+
+    def __init__(self, event_type: str, function_name: str, module_name: str):
+        self.event_type = event_type
+        self.function_name = function_name
+        self.module_name = module_name
+        self.target_resource_ids = []
+        self.input_args_summary = {}
+        self.actor_user_email = None
+        self.actor_user_id = None
+        self.data_changed_summary = None
+        self.status_code = None
+        self.error_type = None
+        self.error_message = None
+        self.error_stacktrace = None
 
 def log_activity(success_event_type: str, failure_event_type: str = "GENERIC_OPERATION_FAILURE"):
+    # Which kind of data change the success event describes; fixed per decorator, so worked out once here
+    event_type_upper = success_event_type.upper()
+    if "CREATE" in event_type_upper:
+        operation_kind = "CREATE"
+    elif "UPDATE" in event_type_upper:
+        operation_kind = "UPDATE"
+    elif "DELETE" in event_type_upper:
+        operation_kind = "DELETE"
+    else:
+        operation_kind = None
+
     def decorator(func):
         
-        def _extract_schema_data(values_dict, exclude_unset=False):
-            for v in values_dict:
+        def _extract_schema_data(args, kwargs, exclude_unset=False):
+            if body_name is not None:
+                # Body parameter known from the signature: look it up directly
+                v = kwargs.get(body_name)
+                if v is None and body_index is not None and len(args) > body_index:
+                    v = args[body_index]
+                values = (v,) if v is not None else ()
+            else:
+                values = kwargs.values() # No annotated body parameter: scan the kwargs
+            for v in values:
                 if isinstance(v, BaseModel) and not isinstance(v, Request): # Ensure it's a Pydantic model and not Request
-                    try:
-                        return v.dict(exclude_unset=exclude_unset, exclude=SENSITIVE_FIELD_NAMES)
-                    except Exception: # Fallback if exclude fails for some reason
-                        return {k: val for k, val in v.dict(exclude_unset=exclude_unset).items() if k not in SENSITIVE_FIELD_NAMES}
+                    # Serialize once, then drop sensitive top-level keys in place
+                    data = v.dict(exclude_unset=exclude_unset)
+                    for key in SENSITIVE_FIELD_NAMES & data.keys():
+                        del data[key]
+                    return data
             return None
 
+        # Resolve where the Request and current_user arguments live once, at decoration time,
+        # so calls can look them up directly instead of scanning every positional argument.
+        params = list(inspect.signature(func).parameters.values())
+        positional_names = [
+            p.name for p in params
+            if p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        ]
+        request_name = next(
+            (p.name for p in params if p.annotation in (Request, "Request") or p.name == "request"), "request"
+        )
+        request_index = positional_names.index(request_name) if request_name in positional_names else None
+        user_index = positional_names.index("current_user") if "current_user" in positional_names else None
+        # Likewise the Pydantic body parameter, when the signature annotates one
+        body_name = next(
+            (p.name for p in params if isinstance(p.annotation, type) and issubclass(p.annotation, BaseModel)), None
+        )
+        body_index = positional_names.index(body_name) if body_name in positional_names else None
+
         @functools.wraps(func)
         async def wrapper_async(*args, **kwargs):
             # Try to find Request object to access ActivityLoggerService
-            request: Request = kwargs.get("request")
-            if not request:
-                for arg in args:
-                    if isinstance(arg, Request):
-                        request = arg
-                        break
+            request: Request = kwargs.get(request_name)
+            if not request and request_index is not None and len(args) > request_index:
+                request = args[request_index]
             
             logger_service = None
             if request and hasattr(request.app.state, "activity_logger_service"):
@@ -40,51 +133,42 @@ def log_activity(success_event_type: str, failure_event_type: str = "GENERIC_OPE
                 print(f"Warning: ActivityLoggerService not found for event {success_event_type}. Operation will proceed without logging.")
                 return await func(*args, **kwargs)
 
-            event_details = {
-                "event_type": success_event_type,
-                "target_resource_ids": [],
-                "input_args_summary": {},
-                "function_name": func.__name__,
-                "module_name": func.__module__,
-            }
+            # The logger drops events whose type is not enabled, so when neither outcome would be
+            # logged skip building the event (and stringifying every kwarg) altogether.
+            if not (logger_service.is_enabled(success_event_type) or logger_service.is_enabled(failure_event_type)):
+                return await func(*args, **kwargs)
+
+            event_details = EventDetails(success_event_type, func.__name__, func.__module__)
 
             # Attempt to get user_email from current_user if available in kwargs or args
             current_user = kwargs.get("current_user")
-            if not current_user:
-                for arg in args:
-                    # This is a simplistic check; User model might not be directly User class
-                    # and might be in args without name 'current_user'.
-                    # A more robust solution would inspect type or have a convention.
-                    if hasattr(arg, 'email') and hasattr(arg, 'id'): # Basic check for a user-like object
-                        current_user = arg
-                        break
+            if not current_user and user_index is not None and len(args) > user_index:
+                current_user = args[user_index]
             
             if current_user and hasattr(current_user, 'email'):
-                event_details["actor_user_email"] = current_user.email
+                event_details.actor_user_email = current_user.email
             elif current_user and hasattr(current_user, 'id'): # Fallback to user ID
-                 event_details["actor_user_id"] = str(current_user.id)
+                 event_details.actor_user_id = str(current_user.id)
 
 
             # Basic attempt to get resource ID from kwargs (common for update/delete/get_one)
             # This is very generic; specific extractors might be better.
-            resource_id_keys = ["user_id", "sample_id", "role_id", "privilege_id", "id", "item_id"]
-            for key in resource_id_keys:
+            for key in _RESOURCE_ID_KEYS:
                 resource_id = kwargs.get(key)
                 if resource_id:
-                    event_details["target_resource_ids"].append(str(resource_id))
+                    event_details.target_resource_ids.append(resource_id if isinstance(resource_id, str) else str(resource_id))
                     break # Found one, assuming primary target
 
             # Summarize kwargs (simple version, be careful with sensitive data)
             # Exclude common FastAPI/service objects and sensitive fields by default.
-            excluded_keys = ['db', 'request', 'current_user', 'password', 'token', 'credentials', 'form_data']
             try:
-                event_details["input_args_summary"] = {
-                    k: v if len(str(v)) < 200 else str(v)[:197] + "..." # Truncate long values
+                event_details.input_args_summary = {
+                    k: _summarize_value(v) # Truncate long values
                     for k, v in kwargs.items() 
-                    if k not in excluded_keys and not isinstance(v, (Request, Response))
+                    if k not in _EXCLUDED_KWARG_KEYS and not isinstance(v, (Request, Response))
                 }
             except Exception:
-                event_details["input_args_summary"] = "Error summarizing kwargs"
+                event_details.input_args_summary = "Error summarizing kwargs"
 
 
             try:
@@ -93,110 +177,103 @@ def log_activity(success_event_type: str, failure_event_type: str = "GENERIC_OPE
                 # --- Enhanced data change summary ---
                 if logger_service and logger_service.config.get("LOG_DATA_MODIFICATIONS", False):
                     data_changed_summary = {}
-                    input_schema_data = _extract_schema_data(kwargs.values())
+                    input_schema_data = _extract_schema_data(args, kwargs)
 
-                    if "CREATE" in success_event_type.upper():
+                    if operation_kind == "CREATE":
                         if input_schema_data:
                             data_changed_summary["input_data"] = input_schema_data
                         if hasattr(result, 'id'):
                             data_changed_summary["created_resource_id"] = str(result.id)
                     
-                    elif "UPDATE" in success_event_type.upper():
-                        if event_details.get("target_resource_ids"):
-                             data_changed_summary["target_resource_ids"] = event_details["target_resource_ids"]
-                        update_payload_data = _extract_schema_data(kwargs.values(), exclude_unset=True)
+                    elif operation_kind == "UPDATE":
+                        if event_details.target_resource_ids:
+                             data_changed_summary["target_resource_ids"] = event_details.target_resource_ids
+                        update_payload_data = _extract_schema_data(args, kwargs, exclude_unset=True)
                         if update_payload_data:
                              data_changed_summary["update_payload"] = update_payload_data
                     
-                    elif "DELETE" in success_event_type.upper():
-                        if event_details.get("target_resource_ids"):
-                            data_changed_summary["deleted_resource_id"] = event_details["target_resource_ids"]
+                    elif operation_kind == "DELETE":
+                        if event_details.target_resource_ids:
+                            data_changed_summary["deleted_resource_id"] = event_details.target_resource_ids
 
                     if data_changed_summary:
-                        event_details["data_changed_summary"] = data_changed_summary
+                        event_details.data_changed_summary = data_changed_summary
                 # --- End of enhanced data change summary ---
 
                 # Add result ID if not already captured as a primary target
-                if hasattr(result, 'id') and str(result.id) not in event_details["target_resource_ids"]:
-                     event_details["target_resource_ids"].append(f"result_id:{str(result.id)}")
+                if hasattr(result, 'id') and str(result.id) not in event_details.target_resource_ids:
+                     event_details.target_resource_ids.append(f"result_id:{str(result.id)}")
                 
                 logger_service.log(event_details)
                 return result
             except HTTPException as e:
-                event_details["event_type"] = failure_event_type
-                event_details["error_message"] = str(e.detail)
-                event_details["status_code"] = e.status_code
+                event_details.event_type = failure_event_type
+                event_details.error_message = str(e.detail)
+                event_details.status_code = e.status_code
                 logger_service.log(event_details)
                 raise
             except Exception as e:
-                event_details["event_type"] = failure_event_type
-                event_details["error_type"] = type(e).__name__ # Added
-                event_details["error_message"] = str(e)
-                event_details["error_stacktrace"] = traceback.format_exc() # Added
+                event_details.event_type = failure_event_type
+                event_details.error_type = type(e).__name__ # Added
+                event_details.error_message = str(e)
+                # Formatting the traceback walks every frame, so only do it when stacktraces are kept
+                if logger_service.config.get("LOG_STACKTRACES", True):
+                    event_details.error_stacktrace = traceback.format_exc() # Added
                 logger_service.log(event_details)
                 raise
         
+        if inspect.iscoroutinefunction(func):
+            return wrapper_async
+
         # Synchronous wrapper (basic, for non-async functions if needed)
         # For this PoC, the primary focus is on async FastAPI routes/services.
         # A more robust decorator might inspect `func` and provide a truly universal wrapper.
         # This synchronous part is NOT fully developed as per PoC focus on async.
+        # Everything that does not change between calls (the warning text, whether a logger
+        # service exists at all, the function's names) is resolved here, once per decoration.
+        context_warning = f"Warning: log_activity decorator used on synchronous function {func.__name__} without full context. Logging may be limited."
+        func_name = func.__name__
+        module_name = func.__module__
+
+        if ActivityLoggerService is None:
+            @functools.wraps(func)
+            def wrapper_sync(*args, **kwargs):
+                print(context_warning)
+                print(f"Warning: ActivityLoggerService not found for event {success_event_type} in sync wrapper.")
+                return func(*args, **kwargs)
+            return wrapper_sync
+
         @functools.wraps(func)
         def wrapper_sync(*args, **kwargs):
             # Simplified: assumes no request object easily available for sync context unless passed explicitly
             # This part of the PoC is less critical as per instructions to focus on async.
-            print(f"Warning: log_activity decorator used on synchronous function {func.__name__} without full context. Logging may be limited.")
-            # Basic logging attempt without request context (logger must be globally available or passed in)
-            # For now, it will likely fail to find logger_service if not passed explicitly.
-            
-            # This synchronous path is not fully fleshed out as per the PoC focus.
-            # A real implementation would need a way to get logger_service here.
-            # If we assume ActivityLoggerService is a singleton and already configured:
-            try:
-                from services.activity_logger_service import ActivityLoggerService
-                logger_service = ActivityLoggerService() # Get singleton
-            except ImportError:
-                logger_service = None
-
-            if not logger_service or not hasattr(logger_service, 'log'):
-                 print(f"Warning: ActivityLoggerService not found for event {success_event_type} in sync wrapper.")
-                 return func(*args, **kwargs)
-
-            event_details = {
-                "event_type": success_event_type,
-                "function_name": func.__name__,
-                "module_name": func.__module__,
-            }
+            print(context_warning)
+            # ActivityLoggerService is a singleton and always has log(); it is instantiated per call
+            # rather than here so that decorating a function never sets up log handlers at import time.
+            logger_service = ActivityLoggerService()
+
+            event_details = EventDetails(success_event_type, func_name, module_name)
             # Limited details for sync version in this PoC
             try:
                 result = func(*args, **kwargs)
                 logger_service.log(event_details)
                 return result
             except HTTPException as e: # Catch HTTPExceptions if they can be raised by sync services
-                event_details["event_type"] = failure_event_type
-                event_details["error_message"] = str(e.detail)
-                event_details["status_code"] = e.status_code
+                event_details.event_type = failure_event_type
+                event_details.error_message = str(e.detail)
+                event_details.status_code = e.status_code
                 logger_service.log(event_details)
                 raise
             except Exception as e:
-                event_details["event_type"] = failure_event_type
-                event_details["error_type"] = type(e).__name__ # Added
-                event_details["error_message"] = str(e)
-                event_details["error_stacktrace"] = traceback.format_exc() # Added
+                event_details.event_type = failure_event_type
+                event_details.error_type = type(e).__name__ # Added
+                event_details.error_message = str(e)
+                # Formatting the traceback walks every frame, so only do it when stacktraces are kept
+                if logger_service.config.get("LOG_STACKTRACES", True):
+                    event_details.error_stacktrace = traceback.format_exc() # Added
                 logger_service.log(event_details)
                 raise
 
-        if inspect.iscoroutinefunction(func):
-            return wrapper_async
-        else:
-            # For this PoC, the sync wrapper is very basic.
-            # Consider if sync methods are a primary target for this decorator.
-            # If so, it needs more robust logger access.
-            # Given the focus on FastAPI, async is primary.
-            # Returning the async wrapper even for sync functions might work if they are called with `await`
-            # but it's not ideal. For this PoC, we'll keep it simple and focus on async.
-            # The problem statement focuses on async service methods / routers.
-            # So, we primarily care about `wrapper_async`.
-            # If a sync function is decorated, it will use `wrapper_sync`.
-            return wrapper_sync
+        return wrapper_sync
             
     return decorator
@@ -1,15 +1,230 @@
+import functools
 import os
 import sys
-import json
+from utils import _json  # orjson when available, stdlib json otherwise
 import argparse
-from typing import Dict, List, Optional, Any
-import inquirer
-from inquirer import errors
-from rich.console import Console
-from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
+
+# inquirer and rich are imported inside the methods that use them: loading, saving and
+# templating configs then never pull in either package.
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Integer settings that hand-edited config files sometimes carry as strings, by codebase_config section
+_INT_SETTINGS = {
+    "database": ("postgres_port",),
+    "jwt": ("access_token_expire_minutes", "refresh_token_expire_days"),
+    "dragonfly": ("port", "db"),
+}
+
+
+def _normalize_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Coerce known integer settings to int in place, right after parsing.
+    
+    Only the handful of sections that hold integers are visited, rather than
+    re-walking the whole tree. Values that are not numeric strings are left as-is.
+    
+    Args:
+        config: Parsed configuration dictionary
+        
+    Returns:
+        The same dictionary
+    """
+    codebase_config = config.get("codebase_config")
+    if isinstance(codebase_config, dict):
+        for section, keys in _INT_SETTINGS.items():
+            values = codebase_config.get(section)
+            if isinstance(values, dict):
+                for key in keys:
+                    value = values.get(key)
+                    if isinstance(value, str) and value.strip().isdigit():
+                        values[key] = int(value)
+    for model in config.get("models_config") or ():
+        cache = model.get("cache") if isinstance(model, dict) else None
+        if isinstance(cache, dict) and isinstance(cache.get("duration"), str) and cache["duration"].strip().isdigit():
+            cache["duration"] = int(cache["duration"])
+    return config
+
+
+# Prompt choices, shared by prompt_for_config and edit_config_item
+_EDIT_CHOICES = ("Codebase Configuration", "Model Configuration", "Cancel")
+_MODEL_EDIT_CHOICES = ("Model Name", "Fields", "Relationships", "Cache Configuration", "Cancel")
+# (label, value) entries appended after the per-item choices in edit_config_item's pickers
+_CANCEL_CHOICE = ("Cancel", "Cancel")
+_ADD_FIELD_TRAILER = (("Add New Field", "Add New Field"), _CANCEL_CHOICE)
+_ADD_RELATIONSHIP_TRAILER = (("Add New Relationship", "Add New Relationship"), _CANCEL_CHOICE)
+_FIELD_TYPES = ("string", "integer", "float", "boolean", "text", "date", "datetime", "uuid")
+_RELATIONSHIP_TYPES = ("one-to-many", "many-to-one", "many-to-many", "one-to-one")
+
+# Cache duration choice -> seconds, and back
+_DURATION_MAP = MappingProxyType({
+    "30 seconds": 30,
+    "1 minute": 60,
+    "5 minutes": 300,
+    "15 minutes": 900,
+    "30 minutes": 1800,
+    "1 hour": 3600,
+})
+_DURATION_LABELS = MappingProxyType({seconds: label for label, seconds in _DURATION_MAP.items()})
+_DURATION_CHOICES = (*_DURATION_MAP, "Custom")
+
+# Setting type -> (inquirer question class, converter for the answer), for edit_config_item.
+# Keyed by exact type, so booleans are never mistaken for ints.
+_VALUE_EDITORS = {
+    bool: ("Confirm", None),
+    int: ("Text", int),
+}
+_DEFAULT_VALUE_EDITOR = ("Text", None)
+
+# edit_config_item menu choice -> ConfigurationManager method that performs it.
+# Each method takes the list being edited and the index of the chosen item.
+_FIELD_EDITORS = {
+    "Field Name": "_edit_field_name",
+    "Field Type": "_edit_field_type",
+    "Field Options": "_edit_field_options",
+    "Delete Field": "_delete_field",
+}
+_FIELD_EDIT_CHOICES = (*_FIELD_EDITORS, "Cancel")
+_RELATIONSHIP_EDITORS = {
+    "Relationship Type": "_edit_relationship_type",
+    "Target Model": "_edit_relationship_target",
+    "Field Name": "_edit_relationship_field_name",
+    "Delete Relationship": "_delete_relationship",
+}
+_RELATIONSHIP_EDIT_CHOICES = (*_RELATIONSHIP_EDITORS, "Cancel")
+
+
+@functools.lru_cache(maxsize=None)
+def _section_panel(title: str):
+    """Section header panel; built once per title (Rich is imported on first use) and reused."""
+    from rich.panel import Panel
+    from rich.text import Text
+    return Panel(Text(title, style="bold cyan"))
+
+
+def _validate_int(_answers, value: str) -> bool:
+    """inquirer validator: accept only non-negative whole numbers, so the later int() cannot fail."""
+    return value.strip().isdigit()
+
+
+def _int_question(name: str, message: str, default: int):
+    """Text question for an integer setting; inquirer re-asks until the answer parses."""
+    import inquirer
+    return inquirer.Text(name, message=message, default=str(default), validate=_validate_int)
+
+# Question kind -> inquirer question class name; "int" questions go through _int_question
+_QUESTION_CLASSES = {
+    "text": "Text",
+    "password": "Password",
+    "confirm": "Confirm",
+}
+
+
+def _default_db_name(answers) -> str:
+    """Default database name, derived from the project name answered earlier in the same prompt."""
+    return answers["project_name"].lower().replace(" ", "_")
+
+
+def _oauth_disabled(answers) -> bool:
+    return not answers["google_oauth.enabled"]
+
+
+# Sections asked by prompt_for_config: (panel title, questions). Each question is
+# (dotted path under codebase_config, kind, message, default, ignore callable or None);
+# every section is asked as a single inquirer prompt.
+_PROMPT_SECTIONS = (
+    ("Project & Database Configuration", (
+        ("project_name", "text", "Project name", "FastAPI Project", None),
+        ("project_dir", "text", "Project directory", "./fastapi_project", None),
+        ("database.postgres_server", "text", "PostgreSQL server", "localhost", None),
+        ("database.postgres_port", "int", "PostgreSQL port", 5432, None),
+        ("database.postgres_db", "text", "PostgreSQL database name", _default_db_name, None),
+        ("database.postgres_user", "text", "PostgreSQL username", "postgres", None),
+        ("database.postgres_password", "password", "PostgreSQL password", "postgres", None),
+    )),
+    ("Google OAuth Configuration", (
+        ("google_oauth.enabled", "confirm", "Enable Google OAuth?", True, None),
+        ("google_oauth.client_id", "text", "Google Client ID", None, _oauth_disabled),
+        ("google_oauth.client_secret", "password", "Google Client Secret", None, _oauth_disabled),
+        ("google_oauth.redirect_uri", "text", "Google Redirect URI", "http://localhost:8000/auth/google/auth", _oauth_disabled),
+    )),
+    ("DragonFly & Kafka Configuration", (
+        ("dragonfly.host", "text", "DragonFly host", "localhost", None),
+        ("dragonfly.port", "int", "DragonFly port", 6379, None),
+        ("dragonfly.db", "int", "DragonFly database", 0, None),
+        ("dragonfly.password", "password", "DragonFly password (optional)", None, None),
+        ("kafka.bootstrap_servers", "text", "Kafka bootstrap servers", "localhost:9092", None),
+    )),
+)
+
+# Default configuration returned by generate_json_template, serialized once at import.
+_TEMPLATE_BYTES = _json.dumps({
+    "codebase_config": {
+        "project_name": "FastAPI Project",
+        "project_dir": "./fastapi_project",
+        "database": {
+            "postgres_server": "localhost",
+            "postgres_port": 5432,
+            "postgres_db": "fastapi_db",
+            "postgres_user": "postgres",
+            "postgres_password": "postgres"
+        },
+        "jwt": {
+            "secret_key": "generate_random_secret_key",
+            "algorithm": "HS256",
+            "access_token_expire_minutes": 30,
+            "refresh_token_expire_days": 7
+        },
+        "google_oauth": {
+            "enabled": True,
+            "client_id": "",
+            "client_secret": "",
+            "redirect_uri": ""
+        },
+        "dragonfly": {
+            "host": "localhost",
+            "port": 6379,
+            "db": 0,
+            "password": ""
+        },
+        "kafka": {
+            "bootstrap_servers": "localhost:9092"
+        }
+    },
+    "models_config": [
+        {
+            "name": "Sample",
+            "fields": [
+                {
+                    "name": "name",
+                    "type": "string",
+                    "nullable": False,
+                    "unique": True,
+                    "index": True
+                },
+                {
+                    "name": "description",
+                    "type": "text",
+                    "nullable": True
+                },
+                {
+                    "name": "is_active",
+                    "type": "boolean",
+                    "nullable": False,
+                    "default": True
+                }
+            ],
+            "relationships": [],
+            "cache": {
+                "enabled": True,
+                "duration": 60
+            }
+        }
+    ]
+})
+
 
 class ConfigurationManager:
     """
@@ -22,7 +237,12 @@ class ConfigurationManager:
     - Configuration visualization
     """
     
-    def __init__(self, console: Console):
+    # Only these two attributes are ever set; slots drop the per-instance __dict__
+    __slots__ = ("console", "config")
+    console: "Console"
+    config: Dict[str, Any]
+    
+    def __init__(self, console: "Console"):
         """
         Initialize the configuration manager.
         
@@ -43,8 +263,7 @@ class ConfigurationManager:
             Configuration dictionary
         """
         try:
-            with open(file_path, 'r') as f:
-                config = json.load(f)
+            config = _normalize_config(_json.load_file(file_path))
             self.console.print(f"[green]Configuration loaded from {file_path}[/green]")
             self.config = config
             return config
@@ -64,8 +283,7 @@ class ConfigurationManager:
             True if successful, False otherwise
         """
         try:
-            with open(file_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            _json.dump_file(config, file_path)
             self.console.print(f"[green]Configuration saved to {file_path}[/green]")
             return True
         except Exception as e:
@@ -79,72 +297,8 @@ class ConfigurationManager:
         Returns:
             Template configuration dictionary
         """
-        template = {
-            "codebase_config": {
-                "project_name": "FastAPI Project",
-                "project_dir": "./fastapi_project",
-                "database": {
-                    "postgres_server": "localhost",
-                    "postgres_port": 5432,
-                    "postgres_db": "fastapi_db",
-                    "postgres_user": "postgres",
-                    "postgres_password": "postgres"
-                },
-                "jwt": {
-                    "secret_key": "generate_random_secret_key",
-                    "algorithm": "HS256",
-                    "access_token_expire_minutes": 30,
-                    "refresh_token_expire_days": 7
-                },
-                "google_oauth": {
-                    "enabled": True,
-                    "client_id": "",
-                    "client_secret": "",
-                    "redirect_uri": ""
-                },
-                "dragonfly": {
-                    "host": "localhost",
-                    "port": 6379,
-                    "db": 0,
-                    "password": ""
-                },
-                "kafka": {
-                    "bootstrap_servers": "localhost:9092"
-                }
-            },
-            "models_config": [
-                {
-                    "name": "Sample",
-                    "fields": [
-                        {
-                            "name": "name",
-                            "type": "string",
-                            "nullable": False,
-                            "unique": True,
-                            "index": True
-                        },
-                        {
-                            "name": "description",
-                            "type": "text",
-                            "nullable": True
-                        },
-                        {
-                            "name": "is_active",
-                            "type": "boolean",
-                            "nullable": False,
-                            "default": True
-                        }
-                    ],
-                    "relationships": [],
-                    "cache": {
-                        "enabled": True,
-                        "duration": 60
-                    }
-                }
-            ]
-        }
-        
-        return template
+        # Decoding the pre-serialized template builds a fresh, independent tree each call
+        return _json.loads(_TEMPLATE_BYTES)
     
     def display_config(self, config: Dict[str, Any]):
         """
@@ -153,7 +307,11 @@ class ConfigurationManager:
         Args:
             config: Configuration dictionary
         """
-        self.console.print(Panel(Text("Configuration", style="bold cyan")))
+        from rich.console import Group
+        from rich.table import Table
+        
+        # Renderables are collected and printed as one Group, so the console renders and flushes once
+        parts = [_section_panel("Configuration")]
         
         # Display codebase config
         if "codebase_config" in config:
@@ -163,24 +321,24 @@ class ConfigurationManager:
             
             codebase_config = config["codebase_config"]
             
-            # Add simple key-value pairs
+            # Add simple key-value pairs, setting nested sections aside in the same pass
+            nested_sections = []
             for key, value in codebase_config.items():
-                if not isinstance(value, dict):
+                if isinstance(value, dict):
+                    nested_sections.append((key, value))
+                else:
                     codebase_table.add_row(key, str(value))
             
-            # Add nested configurations
-            for key, value in codebase_config.items():
-                if isinstance(value, dict):
-                    nested_table = Table(title=f"{key} Configuration")
-                    nested_table.add_column("Setting", style="cyan")
-                    nested_table.add_column("Value", style="green")
-                    
-                    for nested_key, nested_value in value.items():
-                        nested_table.add_row(nested_key, str(nested_value))
-                    
-                    self.console.print(nested_table)
+            # Add nested configurations as sections of the same table, so all
+            # settings are measured and rendered in one pass
+            for key, value in nested_sections:
+                codebase_table.add_section()
+                codebase_table.add_row(f"[bold]{key}[/bold]", "")
+                
+                for nested_key, nested_value in value.items():
+                    codebase_table.add_row(f"  {nested_key}", str(nested_value))
             
-            self.console.print(codebase_table)
+            parts.append(codebase_table)
         
         # Display models config
         if "models_config" in config:
@@ -194,7 +352,7 @@ class ConfigurationManager:
                     if not isinstance(value, (dict, list)):
                         model_table.add_row(key, str(value))
                 
-                self.console.print(model_table)
+                parts.append(model_table)
                 
                 # Display fields
                 if "fields" in model:
@@ -205,16 +363,16 @@ class ConfigurationManager:
                     fields_table.add_column("Unique", style="magenta")
                     fields_table.add_column("Index", style="blue")
                     
-                    for field in model["fields"]:
-                        fields_table.add_row(
-                            field["name"],
-                            field["type"],
-                            str(field.get("nullable", True)),
-                            str(field.get("unique", False)),
-                            str(field.get("index", False))
-                        )
+                    # Rows are built in one comprehension, then added in a tight loop
+                    field_rows = [
+                        (field["name"], field["type"], str(field.get("nullable", True)),
+                         str(field.get("unique", False)), str(field.get("index", False)))
+                        for field in model["fields"]
+                    ]
+                    for row in field_rows:
+                        fields_table.add_row(*row)
                     
-                    self.console.print(fields_table)
+                    parts.append(fields_table)
                 
                 # Display relationships
                 if "relationships" in model and model["relationships"]:
@@ -230,7 +388,7 @@ class ConfigurationManager:
                             rel["field_name"]
                         )
                     
-                    self.console.print(rel_table)
+                    parts.append(rel_table)
                 
                 # Display cache config
                 if "cache" in model:
@@ -241,7 +399,9 @@ class ConfigurationManager:
                     for key, value in model["cache"].items():
                         cache_table.add_row(key, str(value))
                     
-                    self.console.print(cache_table)
+                    parts.append(cache_table)
+        
+        self.console.print(Group(*parts))
     
     def prompt_for_config(self) -> Dict[str, Any]:
         """
@@ -250,71 +410,11 @@ class ConfigurationManager:
         Returns:
             Configuration dictionary
         """
-        config = {"codebase_config": {}, "models_config": []}
-        
-        # Project configuration
-        self.console.print(Panel(Text("Project Configuration", style="bold cyan")))
-        
-        questions = [
-            inquirer.Text('project_name', message="Project name", default="FastAPI Project"),
-            inquirer.Text('project_dir', message="Project directory", default="./fastapi_project"),
-        ]
-        
-        answers = inquirer.prompt(questions)
-        config["codebase_config"]["project_name"] = answers["project_name"]
-        config["codebase_config"]["project_dir"] = answers["project_dir"]
-        
-        # Database configuration
-        self.console.print(Panel(Text("Database Configuration", style="bold cyan")))
-        
-        db_questions = [
-            inquirer.Text('postgres_server', message="PostgreSQL server", default="localhost"),
-            inquirer.Text('postgres_port', message="PostgreSQL port", default="5432"),
-            inquirer.Text('postgres_db', message="PostgreSQL database name", default=answers["project_name"].lower().replace(" ", "_")),
-            inquirer.Text('postgres_user', message="PostgreSQL username", default="postgres"),
-            inquirer.Password('postgres_password', message="PostgreSQL password", default="postgres"),
-        ]
-        
-        db_answers = inquirer.prompt(db_questions)
-        config["codebase_config"]["database"] = {
-            "postgres_server": db_answers["postgres_server"],
-            "postgres_port": int(db_answers["postgres_port"]),
-            "postgres_db": db_answers["postgres_db"],
-            "postgres_user": db_answers["postgres_user"],
-            "postgres_password": db_answers["postgres_password"],
-        }
-        
-        # Google OAuth configuration
-        self.console.print(Panel(Text("Google OAuth Configuration", style="bold cyan")))
+        import inquirer
         
-        oauth_questions = [
-            inquirer.Confirm('enabled', message="Enable Google OAuth?", default=True),
-        ]
+        config = {"codebase_config": {}, "models_config": []}
         
-        oauth_answers = inquirer.prompt(oauth_questions)
-        
-        if oauth_answers["enabled"]:
-            oauth_details = [
-                inquirer.Text('client_id', message="Google Client ID"),
-                inquirer.Password('client_secret', message="Google Client Secret"),
-                inquirer.Text('redirect_uri', message="Google Redirect URI", default="http://localhost:8000/auth/google/auth"),
-            ]
-            
-            oauth_details_answers = inquirer.prompt(oauth_details)
-            
-            config["codebase_config"]["google_oauth"] = {
-                "enabled": True,
-                "client_id": oauth_details_answers["client_id"],
-                "client_secret": oauth_details_answers["client_secret"],
-                "redirect_uri": oauth_details_answers["redirect_uri"],
-            }
-        else:
-            config["codebase_config"]["google_oauth"] = {
-                "enabled": False,
-                "client_id": "",
-                "client_secret": "",
-                "redirect_uri": "",
-            }
+        self._prompt_sections(config["codebase_config"])
         
         # JWT configuration
         config["codebase_config"]["jwt"] = {
@@ -323,38 +423,8 @@ class ConfigurationManager:
             "refresh_token_expire_days": 7,
         }
         
-        # DragonFly configuration
-        self.console.print(Panel(Text("DragonFly Configuration", style="bold cyan")))
-        
-        dragonfly_questions = [
-            inquirer.Text('host', message="DragonFly host", default="localhost"),
-            inquirer.Text('port', message="DragonFly port", default="6379"),
-            inquirer.Text('db', message="DragonFly database", default="0"),
-            inquirer.Password('password', message="DragonFly password (optional)"),
-        ]
-        
-        dragonfly_answers = inquirer.prompt(dragonfly_questions)
-        config["codebase_config"]["dragonfly"] = {
-            "host": dragonfly_answers["host"],
-            "port": int(dragonfly_answers["port"]),
-            "db": int(dragonfly_answers["db"]),
-            "password": dragonfly_answers["password"],
-        }
-        
-        # Kafka configuration
-        self.console.print(Panel(Text("Kafka Configuration", style="bold cyan")))
-        
-        kafka_questions = [
-            inquirer.Text('bootstrap_servers', message="Kafka bootstrap servers", default="localhost:9092"),
-        ]
-        
-        kafka_answers = inquirer.prompt(kafka_questions)
-        config["codebase_config"]["kafka"] = {
-            "bootstrap_servers": kafka_answers["bootstrap_servers"],
-        }
-        
         # Model configuration
-        self.console.print(Panel(Text("Model Configuration", style="bold cyan")))
+        self.console.print(_section_panel("Model Configuration"))
         
         while True:
             model_questions = [
@@ -372,40 +442,11 @@ class ConfigurationManager:
             self.console.print(f"[cyan]Configuring fields for {model_answers['name']}[/cyan]")
             
             while True:
-                field_questions = [
-                    inquirer.Text('name', message="Field name (leave empty to finish)"),
-                ]
-                
-                field_answers = inquirer.prompt(field_questions)
+                field = self._prompt_new_field("Field name (leave empty to finish)", stop_on_empty_name=True)
                 
-                if not field_answers["name"]:
+                if field is None:
                     break
                 
-                field_type_question = [
-                    inquirer.List('type',
-                                 message="Field type",
-                                 choices=["string", "integer", "float", "boolean", "text", "date", "datetime", "uuid"],
-                                 default="string"),
-                ]
-                
-                field_type_answer = inquirer.prompt(field_type_question)
-                
-                field_options = [
-                    inquirer.Confirm('nullable', message="Is this field nullable?", default=True),
-                    inquirer.Confirm('unique', message="Is this field unique?", default=False),
-                    inquirer.Confirm('index', message="Create an index for this field?", default=False),
-                ]
-                
-                field_options_answers = inquirer.prompt(field_options)
-                
-                field = {
-                    "name": field_answers["name"],
-                    "type": field_type_answer["type"],
-                    "nullable": field_options_answers["nullable"],
-                    "unique": field_options_answers["unique"],
-                    "index": field_options_answers["index"],
-                }
-                
                 model_config["fields"].append(field)
             
             # Relationships configuration
@@ -424,7 +465,7 @@ class ConfigurationManager:
                 rel_details = [
                     inquirer.List('type',
                                  message="Relationship type",
-                                 choices=["one-to-many", "many-to-one", "many-to-many", "one-to-one"],
+                                 choices=_RELATIONSHIP_TYPES,
                                  default="many-to-one"),
                     inquirer.Text('target', message="Target model name"),
                     inquirer.Text('field_name', message="Field name for this relationship"),
@@ -453,30 +494,21 @@ class ConfigurationManager:
                 cache_duration_question = [
                     inquirer.List('duration',
                                  message="Cache duration",
-                                 choices=["30 seconds", "1 minute", "5 minutes", "15 minutes", "30 minutes", "1 hour", "Custom"],
+                                 choices=_DURATION_CHOICES,
                                  default="1 minute"),
                 ]
                 
                 cache_duration_answer = inquirer.prompt(cache_duration_question)
                 
-                duration_map = {
-                    "30 seconds": 30,
-                    "1 minute": 60,
-                    "5 minutes": 300,
-                    "15 minutes": 900,
-                    "30 minutes": 1800,
-                    "1 hour": 3600,
-                }
-                
                 if cache_duration_answer["duration"] == "Custom":
                     custom_duration_question = [
-                        inquirer.Text('seconds', message="Custom duration in seconds", default="60"),
+                        _int_question('seconds', "Custom duration in seconds", 60),
                     ]
                     
                     custom_duration_answer = inquirer.prompt(custom_duration_question)
                     duration = int(custom_duration_answer["seconds"])
                 else:
-                    duration = duration_map[cache_duration_answer["duration"]]
+                    duration = _DURATION_MAP[cache_duration_answer["duration"]]
                 
                 model_config["cache"] = {
                     "enabled": True,
@@ -492,6 +524,188 @@ class ConfigurationManager:
         
         return config
     
+    def _prompt_sections(self, target: Dict[str, Any]):
+        """
+        Ask the questions in _PROMPT_SECTIONS, one inquirer prompt per section.
+        
+        Args:
+            target: Dictionary the answers are stored into, at each question's dotted path
+        """
+        import inquirer
+        
+        for title, entries in _PROMPT_SECTIONS:
+            self.console.print(_section_panel(title))
+            
+            questions = []
+            for path, kind, message, default, ignore in entries:
+                if kind == "int":
+                    questions.append(_int_question(path, message, default))
+                else:
+                    question_class = getattr(inquirer, _QUESTION_CLASSES[kind])
+                    questions.append(question_class(path, message=message, default=default, ignore=ignore))
+            
+            answers = inquirer.prompt(questions)
+            for path, kind, _, _, ignore in entries:
+                # Skipped questions are stored as empty strings
+                value = "" if ignore and ignore(answers) else answers[path]
+                if kind == "int":
+                    value = int(value)
+                section, _, key = path.rpartition(".")
+                (target.setdefault(section, {}) if section else target)[key] = value
+    
+    def _prompt_new_value(self, label: str, current_value: Any) -> Any:
+        """
+        Prompt for a replacement of a single setting, using a question suited to its current type.
+        
+        Args:
+            label: Setting name shown in the prompt
+            current_value: Current value, used as the default
+            
+        Returns:
+            New value, converted back to the current value's type where needed
+        """
+        import inquirer
+        
+        question_type, parse = _VALUE_EDITORS.get(type(current_value), _DEFAULT_VALUE_EDITOR)
+        if parse is int:
+            question = _int_question('value', f"New value for {label}", current_value)
+        else:
+            default = current_value if question_type == "Confirm" else str(current_value)
+            question = getattr(inquirer, question_type)('value', message=f"New value for {label}", default=default)
+        value_answer = inquirer.prompt([question])
+        return parse(value_answer["value"]) if parse else value_answer["value"]
+    
+    def _prompt_new_field(self, name_message: str = "Field name", stop_on_empty_name: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Prompt for a new field's name, type and options.
+        
+        Args:
+            name_message: Prompt shown for the field name
+            stop_on_empty_name: Return None, without asking anything else, if the name is left empty
+            
+        Returns:
+            Field dictionary, or None if stopped on an empty name
+        """
+        import inquirer
+        
+        field_answers = inquirer.prompt([
+            inquirer.Text('name', message=name_message),
+        ])
+        
+        if stop_on_empty_name and not field_answers["name"]:
+            return None
+        
+        field_type_answer = inquirer.prompt([
+            inquirer.List('type',
+                         message="Field type",
+                         choices=_FIELD_TYPES,
+                         default="string"),
+        ])
+        
+        field_options_answers = inquirer.prompt([
+            inquirer.Confirm('nullable', message="Is this field nullable?", default=True),
+            inquirer.Confirm('unique', message="Is this field unique?", default=False),
+            inquirer.Confirm('index', message="Create an index for this field?", default=False),
+        ])
+        
+        return {
+            "name": field_answers["name"],
+            "type": field_type_answer["type"],
+            "nullable": field_options_answers["nullable"],
+            "unique": field_options_answers["unique"],
+            "index": field_options_answers["index"],
+        }
+    
+    def _edit_field_name(self, fields: List[Dict[str, Any]], index: int):
+        """Ask for a new name for fields[index]."""
+        import inquirer
+        
+        field = fields[index]
+        name_answer = inquirer.prompt([
+            inquirer.Text('name', message="New field name", default=field["name"]),
+        ])
+        field["name"] = name_answer["name"]
+    
+    def _edit_field_type(self, fields: List[Dict[str, Any]], index: int):
+        """Ask for a new type for fields[index]."""
+        import inquirer
+        
+        field = fields[index]
+        type_answer = inquirer.prompt([
+            inquirer.List('type',
+                         message="New field type",
+                         choices=_FIELD_TYPES,
+                         default=field["type"]),
+        ])
+        field["type"] = type_answer["type"]
+    
+    def _edit_field_options(self, fields: List[Dict[str, Any]], index: int):
+        """Ask again for the nullable/unique/index options of fields[index]."""
+        import inquirer
+        
+        field = fields[index]
+        options_answers = inquirer.prompt([
+            inquirer.Confirm('nullable', message="Is this field nullable?", default=field.get("nullable", True)),
+            inquirer.Confirm('unique', message="Is this field unique?", default=field.get("unique", False)),
+            inquirer.Confirm('index', message="Create an index for this field?", default=field.get("index", False)),
+        ])
+        field["nullable"] = options_answers["nullable"]
+        field["unique"] = options_answers["unique"]
+        field["index"] = options_answers["index"]
+    
+    def _delete_field(self, fields: List[Dict[str, Any]], index: int):
+        """Delete fields[index] after confirmation."""
+        import inquirer
+        
+        confirm_answer = inquirer.prompt([
+            inquirer.Confirm('confirm', message=f"Are you sure you want to delete the field {fields[index]['name']}?", default=False),
+        ])
+        if confirm_answer["confirm"]:
+            del fields[index]
+    
+    def _edit_relationship_type(self, relationships: List[Dict[str, Any]], index: int):
+        """Ask for a new type for relationships[index]."""
+        import inquirer
+        
+        relationship = relationships[index]
+        type_answer = inquirer.prompt([
+            inquirer.List('type',
+                         message="New relationship type",
+                         choices=_RELATIONSHIP_TYPES,
+                         default=relationship["type"]),
+        ])
+        relationship["type"] = type_answer["type"]
+    
+    def _edit_relationship_target(self, relationships: List[Dict[str, Any]], index: int):
+        """Ask for a new target model for relationships[index]."""
+        import inquirer
+        
+        relationship = relationships[index]
+        target_answer = inquirer.prompt([
+            inquirer.Text('target', message="New target model name", default=relationship["target"]),
+        ])
+        relationship["target"] = target_answer["target"]
+    
+    def _edit_relationship_field_name(self, relationships: List[Dict[str, Any]], index: int):
+        """Ask for a new field name for relationships[index]."""
+        import inquirer
+        
+        relationship = relationships[index]
+        field_name_answer = inquirer.prompt([
+            inquirer.Text('field_name', message="New field name for this relationship", default=relationship["field_name"]),
+        ])
+        relationship["field_name"] = field_name_answer["field_name"]
+    
+    def _delete_relationship(self, relationships: List[Dict[str, Any]], index: int):
+        """Delete relationships[index] after confirmation."""
+        import inquirer
+        
+        confirm_answer = inquirer.prompt([
+            inquirer.Confirm('confirm', message="Are you sure you want to delete this relationship?", default=False),
+        ])
+        if confirm_answer["confirm"]:
+            del relationships[index]
+    
     def edit_config_item(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Allow user to edit a single configuration item.
@@ -502,20 +716,16 @@ class ConfigurationManager:
         Returns:
             Updated configuration dictionary
         """
+        import inquirer
+        
         # Display current configuration
         self.display_config(config)
         
         # Choose what to edit
-        edit_choices = [
-            "Codebase Configuration",
-            "Model Configuration",
-            "Cancel"
-        ]
-        
         edit_question = [
             inquirer.List('choice',
                          message="What would you like to edit?",
-                         choices=edit_choices),
+                         choices=_EDIT_CHOICES),
         ]
         
         edit_answer = inquirer.prompt(edit_question)
@@ -525,12 +735,10 @@ class ConfigurationManager:
         
         if edit_answer["choice"] == "Codebase Configuration":
             # Choose which section to edit
-            codebase_sections = list(config["codebase_config"].keys())
-            
             section_question = [
                 inquirer.List('section',
                              message="Which section would you like to edit?",
-                             choices=codebase_sections + ["Cancel"]),
+                             choices=[*config["codebase_config"], "Cancel"]),
             ]
             
             section_answer = inquirer.prompt(section_question)
@@ -542,12 +750,10 @@ class ConfigurationManager:
             
             if isinstance(config["codebase_config"][section], dict):
                 # Edit a nested section
-                keys = list(config["codebase_config"][section].keys())
-                
                 key_question = [
                     inquirer.List('key',
                                  message=f"Which {section} setting would you like to edit?",
-                                 choices=keys + ["Cancel"]),
+                                 choices=[*config["codebase_config"][section], "Cancel"]),
                 ]
                 
                 key_answer = inquirer.prompt(key_question)
@@ -558,56 +764,12 @@ class ConfigurationManager:
                 key = key_answer["key"]
                 current_value = config["codebase_config"][section][key]
                 
-                # Prompt for new value
-                if isinstance(current_value, bool):
-                    value_question = [
-                        inquirer.Confirm('value', message=f"New value for {key}", default=current_value),
-                    ]
-                elif isinstance(current_value, int):
-                    value_question = [
-                        inquirer.Text('value', message=f"New value for {key}", default=str(current_value)),
-                    ]
-                else:
-                    value_question = [
-                        inquirer.Text('value', message=f"New value for {key}", default=str(current_value)),
-                    ]
-                
-                value_answer = inquirer.prompt(value_question)
-                
-                # Update config
-                if isinstance(current_value, int):
-                    config["codebase_config"][section][key] = int(value_answer["value"])
-                elif isinstance(current_value, bool):
-                    config["codebase_config"][section][key] = value_answer["value"]
-                else:
-                    config["codebase_config"][section][key] = value_answer["value"]
+                config["codebase_config"][section][key] = self._prompt_new_value(key, current_value)
             else:
                 # Edit a simple value
                 current_value = config["codebase_config"][section]
                 
-                # Prompt for new value
-                if isinstance(current_value, bool):
-                    value_question = [
-                        inquirer.Confirm('value', message=f"New value for {section}", default=current_value),
-                    ]
-                elif isinstance(current_value, int):
-                    value_question = [
-                        inquirer.Text('value', message=f"New value for {section}", default=str(current_value)),
-                    ]
-                else:
-                    value_question = [
-                        inquirer.Text('value', message=f"New value for {section}", default=str(current_value)),
-                    ]
-                
-                value_answer = inquirer.prompt(value_question)
-                
-                # Update config
-                if isinstance(current_value, int):
-                    config["codebase_config"][section] = int(value_answer["value"])
-                elif isinstance(current_value, bool):
-                    config["codebase_config"][section] = value_answer["value"]
-                else:
-                    config["codebase_config"][section] = value_answer["value"]
+                config["codebase_config"][section] = self._prompt_new_value(section, current_value)
         
         elif edit_answer["choice"] == "Model Configuration":
             # Choose which model to edit
@@ -615,12 +777,11 @@ class ConfigurationManager:
                 self.console.print("[yellow]No models to edit[/yellow]")
                 return config
             
-            model_names = [model["name"] for model in config["models_config"]]
-            
+            # (label, value) choices: the answer is the model's index, so no name lookup is needed
             model_question = [
                 inquirer.List('model',
                              message="Which model would you like to edit?",
-                             choices=model_names + ["Cancel"]),
+                             choices=[*((model["name"], i) for i, model in enumerate(config["models_config"])), _CANCEL_CHOICE]),
             ]
             
             model_answer = inquirer.prompt(model_question)
@@ -628,22 +789,15 @@ class ConfigurationManager:
             if model_answer["model"] == "Cancel":
                 return config
             
-            model_name = model_answer["model"]
-            model_index = model_names.index(model_name)
+            model_index = model_answer["model"]
+            model_cfg = config["models_config"][model_index]
+            model_name = model_cfg["name"]
             
             # Choose what to edit in the model
-            model_edit_choices = [
-                "Model Name",
-                "Fields",
-                "Relationships",
-                "Cache Configuration",
-                "Cancel"
-            ]
-            
             model_edit_question = [
                 inquirer.List('choice',
                              message=f"What would you like to edit in {model_name}?",
-                             choices=model_edit_choices),
+                             choices=_MODEL_EDIT_CHOICES),
             ]
             
             model_edit_answer = inquirer.prompt(model_edit_question)
@@ -659,54 +813,22 @@ class ConfigurationManager:
                 
                 name_answer = inquirer.prompt(name_question)
                 
-                config["models_config"][model_index]["name"] = name_answer["name"]
+                model_cfg["name"] = name_answer["name"]
             
             elif model_edit_answer["choice"] == "Fields":
                 # Edit fields
-                if not config["models_config"][model_index]["fields"]:
+                fields = model_cfg["fields"]
+                if not fields:
                     self.console.print("[yellow]No fields to edit. Add a new field.[/yellow]")
                     
                     # Add a new field
-                    field_questions = [
-                        inquirer.Text('name', message="Field name"),
-                    ]
-                    
-                    field_answers = inquirer.prompt(field_questions)
-                    
-                    field_type_question = [
-                        inquirer.List('type',
-                                     message="Field type",
-                                     choices=["string", "integer", "float", "boolean", "text", "date", "datetime", "uuid"],
-                                     default="string"),
-                    ]
-                    
-                    field_type_answer = inquirer.prompt(field_type_question)
-                    
-                    field_options = [
-                        inquirer.Confirm('nullable', message="Is this field nullable?", default=True),
-                        inquirer.Confirm('unique', message="Is this field unique?", default=False),
-                        inquirer.Confirm('index', message="Create an index for this field?", default=False),
-                    ]
-                    
-                    field_options_answers = inquirer.prompt(field_options)
-                    
-                    field = {
-                        "name": field_answers["name"],
-                        "type": field_type_answer["type"],
-                        "nullable": field_options_answers["nullable"],
-                        "unique": field_options_answers["unique"],
-                        "index": field_options_answers["index"],
-                    }
-                    
-                    config["models_config"][model_index]["fields"].append(field)
+                    fields.append(self._prompt_new_field())
                 else:
                     # Choose a field to edit or add a new one
-                    field_names = [field["name"] for field in config["models_config"][model_index]["fields"]]
-                    
                     field_question = [
                         inquirer.List('field',
                                      message="Which field would you like to edit?",
-                                     choices=field_names + ["Add New Field", "Cancel"]),
+                                     choices=[*((field["name"], i) for i, field in enumerate(fields)), *_ADD_FIELD_TRAILER]),
                     ]
                     
                     field_answer = inquirer.prompt(field_question)
@@ -716,56 +838,17 @@ class ConfigurationManager:
                     
                     if field_answer["field"] == "Add New Field":
                         # Add a new field
-                        field_questions = [
-                            inquirer.Text('name', message="Field name"),
-                        ]
-                        
-                        field_answers = inquirer.prompt(field_questions)
-                        
-                        field_type_question = [
-                            inquirer.List('type',
-                                         message="Field type",
-                                         choices=["string", "integer", "float", "boolean", "text", "date", "datetime", "uuid"],
-                                         default="string"),
-                        ]
-                        
-                        field_type_answer = inquirer.prompt(field_type_question)
-                        
-                        field_options = [
-                            inquirer.Confirm('nullable', message="Is this field nullable?", default=True),
-                            inquirer.Confirm('unique', message="Is this field unique?", default=False),
-                            inquirer.Confirm('index', message="Create an index for this field?", default=False),
-                        ]
-                        
-                        field_options_answers = inquirer.prompt(field_options)
-                        
-                        field = {
-                            "name": field_answers["name"],
-                            "type": field_type_answer["type"],
-                            "nullable": field_options_answers["nullable"],
-                            "unique": field_options_answers["unique"],
-                            "index": field_options_answers["index"],
-                        }
-                        
-                        config["models_config"][model_index]["fields"].append(field)
+                        fields.append(self._prompt_new_field())
                     else:
                         # Edit an existing field
-                        field_name = field_answer["field"]
-                        field_index = field_names.index(field_name)
+                        field_index = field_answer["field"]
+                        field_name = fields[field_index]["name"]
                         
                         # Choose what to edit in the field
-                        field_edit_choices = [
-                            "Field Name",
-                            "Field Type",
-                            "Field Options",
-                            "Delete Field",
-                            "Cancel"
-                        ]
-                        
                         field_edit_question = [
                             inquirer.List('choice',
                                          message=f"What would you like to edit in {field_name}?",
-                                         choices=field_edit_choices),
+                                         choices=_FIELD_EDIT_CHOICES),
                         ]
                         
                         field_edit_answer = inquirer.prompt(field_edit_question)
@@ -773,68 +856,19 @@ class ConfigurationManager:
                         if field_edit_answer["choice"] == "Cancel":
                             return config
                         
-                        if field_edit_answer["choice"] == "Field Name":
-                            # Edit field name
-                            name_question = [
-                                inquirer.Text('name', message="New field name", default=field_name),
-                            ]
-                            
-                            name_answer = inquirer.prompt(name_question)
-                            
-                            config["models_config"][model_index]["fields"][field_index]["name"] = name_answer["name"]
-                        
-                        elif field_edit_answer["choice"] == "Field Type":
-                            # Edit field type
-                            current_type = config["models_config"][model_index]["fields"][field_index]["type"]
-                            
-                            type_question = [
-                                inquirer.List('type',
-                                             message="New field type",
-                                             choices=["string", "integer", "float", "boolean", "text", "date", "datetime", "uuid"],
-                                             default=current_type),
-                            ]
-                            
-                            type_answer = inquirer.prompt(type_question)
-                            
-                            config["models_config"][model_index]["fields"][field_index]["type"] = type_answer["type"]
-                        
-                        elif field_edit_answer["choice"] == "Field Options":
-                            # Edit field options
-                            current_options = config["models_config"][model_index]["fields"][field_index]
-                            
-                            options_questions = [
-                                inquirer.Confirm('nullable', message="Is this field nullable?", default=current_options.get("nullable", True)),
-                                inquirer.Confirm('unique', message="Is this field unique?", default=current_options.get("unique", False)),
-                                inquirer.Confirm('index', message="Create an index for this field?", default=current_options.get("index", False)),
-                            ]
-                            
-                            options_answers = inquirer.prompt(options_questions)
-                            
-                            config["models_config"][model_index]["fields"][field_index]["nullable"] = options_answers["nullable"]
-                            config["models_config"][model_index]["fields"][field_index]["unique"] = options_answers["unique"]
-                            config["models_config"][model_index]["fields"][field_index]["index"] = options_answers["index"]
-                        
-                        elif field_edit_answer["choice"] == "Delete Field":
-                            # Delete field
-                            confirm_question = [
-                                inquirer.Confirm('confirm', message=f"Are you sure you want to delete the field {field_name}?", default=False),
-                            ]
-                            
-                            confirm_answer = inquirer.prompt(confirm_question)
-                            
-                            if confirm_answer["confirm"]:
-                                del config["models_config"][model_index]["fields"][field_index]
+                        getattr(self, _FIELD_EDITORS[field_edit_answer["choice"]])(fields, field_index)
             
             elif model_edit_answer["choice"] == "Relationships":
                 # Edit relationships
-                if not config["models_config"][model_index]["relationships"]:
+                relationships = model_cfg["relationships"]
+                if not relationships:
                     self.console.print("[yellow]No relationships to edit. Add a new relationship.[/yellow]")
                     
                     # Add a new relationship
                     rel_details = [
                         inquirer.List('type',
                                      message="Relationship type",
-                                     choices=["one-to-many", "many-to-one", "many-to-many", "one-to-one"],
+                                     choices=_RELATIONSHIP_TYPES,
                                      default="many-to-one"),
                         inquirer.Text('target', message="Target model name"),
                         inquirer.Text('field_name', message="Field name for this relationship"),
@@ -848,15 +882,15 @@ class ConfigurationManager:
                         "field_name": rel_details_answers["field_name"],
                     }
                     
-                    config["models_config"][model_index]["relationships"].append(relationship)
+                    relationships.append(relationship)
                 else:
                     # Choose a relationship to edit or add a new one
-                    rel_names = [f"{rel['type']} to {rel['target']}" for rel in config["models_config"][model_index]["relationships"]]
+                    rel_choices = [(f"{rel['type']} to {rel['target']}", i) for i, rel in enumerate(relationships)]
                     
                     rel_question = [
                         inquirer.List('relationship',
                                      message="Which relationship would you like to edit?",
-                                     choices=rel_names + ["Add New Relationship", "Cancel"]),
+                                     choices=[*rel_choices, *_ADD_RELATIONSHIP_TRAILER]),
                     ]
                     
                     rel_answer = inquirer.prompt(rel_question)
@@ -869,7 +903,7 @@ class ConfigurationManager:
                         rel_details = [
                             inquirer.List('type',
                                          message="Relationship type",
-                                         choices=["one-to-many", "many-to-one", "many-to-many", "one-to-one"],
+                                         choices=_RELATIONSHIP_TYPES,
                                          default="many-to-one"),
                             inquirer.Text('target', message="Target model name"),
                             inquirer.Text('field_name', message="Field name for this relationship"),
@@ -883,24 +917,16 @@ class ConfigurationManager:
                             "field_name": rel_details_answers["field_name"],
                         }
                         
-                        config["models_config"][model_index]["relationships"].append(relationship)
+                        relationships.append(relationship)
                     else:
                         # Edit an existing relationship
-                        rel_index = rel_names.index(rel_answer["relationship"])
+                        rel_index = rel_answer["relationship"]
                         
                         # Choose what to edit in the relationship
-                        rel_edit_choices = [
-                            "Relationship Type",
-                            "Target Model",
-                            "Field Name",
-                            "Delete Relationship",
-                            "Cancel"
-                        ]
-                        
                         rel_edit_question = [
                             inquirer.List('choice',
                                          message=f"What would you like to edit in this relationship?",
-                                         choices=rel_edit_choices),
+                                         choices=_RELATIONSHIP_EDIT_CHOICES),
                         ]
                         
                         rel_edit_answer = inquirer.prompt(rel_edit_question)
@@ -908,59 +934,11 @@ class ConfigurationManager:
                         if rel_edit_answer["choice"] == "Cancel":
                             return config
                         
-                        if rel_edit_answer["choice"] == "Relationship Type":
-                            # Edit relationship type
-                            current_type = config["models_config"][model_index]["relationships"][rel_index]["type"]
-                            
-                            type_question = [
-                                inquirer.List('type',
-                                             message="New relationship type",
-                                             choices=["one-to-many", "many-to-one", "many-to-many", "one-to-one"],
-                                             default=current_type),
-                            ]
-                            
-                            type_answer = inquirer.prompt(type_question)
-                            
-                            config["models_config"][model_index]["relationships"][rel_index]["type"] = type_answer["type"]
-                        
-                        elif rel_edit_answer["choice"] == "Target Model":
-                            # Edit target model
-                            current_target = config["models_config"][model_index]["relationships"][rel_index]["target"]
-                            
-                            target_question = [
-                                inquirer.Text('target', message="New target model name", default=current_target),
-                            ]
-                            
-                            target_answer = inquirer.prompt(target_question)
-                            
-                            config["models_config"][model_index]["relationships"][rel_index]["target"] = target_answer["target"]
-                        
-                        elif rel_edit_answer["choice"] == "Field Name":
-                            # Edit field name
-                            current_field_name = config["models_config"][model_index]["relationships"][rel_index]["field_name"]
-                            
-                            field_name_question = [
-                                inquirer.Text('field_name', message="New field name for this relationship", default=current_field_name),
-                            ]
-                            
-                            field_name_answer = inquirer.prompt(field_name_question)
-                            
-                            config["models_config"][model_index]["relationships"][rel_index]["field_name"] = field_name_answer["field_name"]
-                        
-                        elif rel_edit_answer["choice"] == "Delete Relationship":
-                            # Delete relationship
-                            confirm_question = [
-                                inquirer.Confirm('confirm', message=f"Are you sure you want to delete this relationship?", default=False),
-                            ]
-                            
-                            confirm_answer = inquirer.prompt(confirm_question)
-                            
-                            if confirm_answer["confirm"]:
-                                del config["models_config"][model_index]["relationships"][rel_index]
+                        getattr(self, _RELATIONSHIP_EDITORS[rel_edit_answer["choice"]])(relationships, rel_index)
             
             elif model_edit_answer["choice"] == "Cache Configuration":
                 # Edit cache configuration
-                current_cache = config["models_config"][model_index].get("cache", {"enabled": False, "duration": 0})
+                current_cache = model_cfg.get("cache", {"enabled": False, "duration": 0})
                 
                 cache_questions = [
                     inquirer.Confirm('enabled', message="Enable caching for this model?", default=current_cache.get("enabled", False)),
@@ -972,51 +950,33 @@ class ConfigurationManager:
                     current_duration = current_cache.get("duration", 60)
                     
                     # Map duration to choice
-                    duration_map = {
-                        30: "30 seconds",
-                        60: "1 minute",
-                        300: "5 minutes",
-                        900: "15 minutes",
-                        1800: "30 minutes",
-                        3600: "1 hour",
-                    }
-                    
-                    default_choice = duration_map.get(current_duration, "Custom")
+                    default_choice = _DURATION_LABELS.get(current_duration, "Custom")
                     
                     cache_duration_question = [
                         inquirer.List('duration',
                                      message="Cache duration",
-                                     choices=["30 seconds", "1 minute", "5 minutes", "15 minutes", "30 minutes", "1 hour", "Custom"],
+                                     choices=_DURATION_CHOICES,
                                      default=default_choice),
                     ]
                     
                     cache_duration_answer = inquirer.prompt(cache_duration_question)
                     
-                    reverse_duration_map = {
-                        "30 seconds": 30,
-                        "1 minute": 60,
-                        "5 minutes": 300,
-                        "15 minutes": 900,
-                        "30 minutes": 1800,
-                        "1 hour": 3600,
-                    }
-                    
                     if cache_duration_answer["duration"] == "Custom":
                         custom_duration_question = [
-                            inquirer.Text('seconds', message="Custom duration in seconds", default=str(current_duration)),
+                            _int_question('seconds', "Custom duration in seconds", current_duration),
                         ]
                         
                         custom_duration_answer = inquirer.prompt(custom_duration_question)
                         duration = int(custom_duration_answer["seconds"])
                     else:
-                        duration = reverse_duration_map[cache_duration_answer["duration"]]
+                        duration = _DURATION_MAP[cache_duration_answer["duration"]]
                     
-                    config["models_config"][model_index]["cache"] = {
+                    model_cfg["cache"] = {
                         "enabled": True,
                         "duration": duration,
                     }
                 else:
-                    config["models_config"][model_index]["cache"] = {
+                    model_cfg["cache"] = {
                         "enabled": False,
                         "duration": 0,
                     }
@@ -1,49 +1,57 @@
+import functools
 import json
 import os
-import re
 import uuid # For generating privilege IDs
-from jinja2 import Environment, FileSystemLoader
-
-# Helper function to convert entity_name to snake_case for filenames/variables
+from utils import _json  # orjson when available, stdlib json otherwise
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+# Helper function to convert entity_name to snake_case for filenames/variables.
+# Both case helpers are pure and see the same entity/target names over and over
+# (relationships, templates), so results are memoized.
+@functools.lru_cache(maxsize=1024)
 def to_snake_case(name: str) -> str:
     if not name:
         return ""
-    # Add an underscore before an uppercase letter if it's preceded by a lowercase letter or digit,
-    # but not if it's preceded by an underscore (to avoid double underscores).
-    name = re.sub(r'(?<=[a-z0-9])(?=[A-Z])', r'_', name)
-    # Add an underscore before an uppercase letter if it's preceded by another uppercase letter
-    # and followed by a lowercase letter (e.g., SimpleHTTPServer -> Simple_HTTP_Server)
-    # This also helps with acronyms like HTMLWorld -> HTML_World if not already split by previous rule.
-    name = re.sub(r'(?<=[A-Z])(?=[A-Z][a-z])', r'_', name)
-    return name.lower().replace('__', '_') # Ensure any introduced double underscores are cleaned.
+    # Single pass over the characters. An underscore goes before an uppercase letter when
+    # it is preceded by a lowercase letter or digit (HelloWorld -> hello_world), or when it
+    # is preceded by another uppercase letter and followed by a lowercase one, which splits
+    # acronyms (SimpleHTTPServer -> simple_http_server). Only ASCII letters count, as before.
+    out = []
+    append = out.append
+    last = len(name) - 1
+    prev = ""
+    for i, c in enumerate(name):
+        if "A" <= c <= "Z" and ("a" <= prev <= "z" or "0" <= prev <= "9"
+                or ("A" <= prev <= "Z" and i < last and "a" <= name[i + 1] <= "z")):
+            append("_")
+        append(c)
+        prev = c
+    snake = "".join(out).lower()
+    # Double underscores can only come from the input itself; they are still collapsed.
+    return snake.replace('__', '_') if '__' in snake else snake
 
 # Helper function to convert entity_name to PascalCase for class names
 # This is the version from the previous successful test run (after my fix for pascal case)
+@functools.lru_cache(maxsize=1024)
 def to_pascal_case(name: str) -> str:
     if not name:
         return ""
 
     # Heuristic for already PascalCase names like "ProductItem" or "Project"
     if '_' not in name and name[0].isupper():
-        is_pascal_like = True
         # Check for all caps like "UUID" or "ID"
         if name.isupper():
             # Standard behavior: "UUID" -> "Uuid", "ID" -> "Id"
-            return name[0] + name[1:].lower() if len(name) > 1 else name
-
-        # For mixed case like "ProductItem"
-        # Check if it contains lowercase characters after the first letter
-        has_lower_after_first = any(c.islower() for c in name[1:])
-        if has_lower_after_first:
-             # If it's like "ProductItem" (mixed case after first char), assume it's intended PascalCase
-             return name
-        else:
-            # If all caps after first (e.g. "PRoject" which is unlikely, or "PPROJECT"),
-            # or single char "P", fallback to default splitting behavior.
-            # But if it's like "PROject" this will be an issue.
-            # The current test cases "ProductItem" and "project" are the main drivers.
-            # "ProductItem" is returned as is. "project" goes to default.
-            pass # Fall through to default splitting if not clearly "ProductItem" like or all caps.
+            return name[0] + name[1:].lower()
+
+        # For mixed case like "ProductItem", assume it's intended PascalCase. Not being all caps
+        # already means some later character is not uppercase; for ASCII names that can only be
+        # a lowercase letter, so the per-character scan is left to non-ASCII names.
+        if name.isascii() or any(c.islower() for c in name[1:]):
+            return name
+        # Otherwise fall through to default splitting.
 
 
     # Default for snake_case or other variants: split by underscore, capitalize each part.
@@ -53,143 +61,267 @@ def to_pascal_case(name: str) -> str:
     return "".join(word.capitalize() for word in name.replace('-', '_').split('_'))
 
 
-# Jinja2 filter to map general types to SQLAlchemy types
+# General type -> SQLAlchemy / Pydantic type, keyed by lowercase type name
+_SQLALCHEMY_TYPES = {
+    "string": "String",
+    "text": "Text",
+    "integer": "Integer",
+    "float": "Float",
+    "boolean": "Boolean",
+    "datetime": "DateTime",
+    "uuid": "UUID",
+}
+_PYDANTIC_TYPES = {
+    "string": "str",
+    "text": "str",
+    "integer": "int",
+    "float": "float",
+    "boolean": "bool",
+    "datetime": "datetime",
+    "uuid": "UUID",
+}
+
+# Jinja2 filter to map general types to SQLAlchemy types.
+# Property types are normally already lowercase, so the exact lookup usually hits and .lower() is skipped.
 def map_sqlalchemy_type(general_type):
-    mapping = {
-        "string": "String",
-        "text": "Text",
-        "integer": "Integer",
-        "float": "Float",
-        "boolean": "Boolean",
-        "datetime": "DateTime",
-        "uuid": "UUID",
-    }
-    return mapping.get(general_type.lower(), "String")
+    return _SQLALCHEMY_TYPES.get(general_type) or _SQLALCHEMY_TYPES.get(general_type.lower(), "String")
 
 # Jinja2 filter to map general types to Pydantic types
 def map_pydantic_type(general_type):
-    mapping = {
-        "string": "str",
-        "text": "str",
-        "integer": "int",
-        "float": "float",
-        "boolean": "bool",
-        "datetime": "datetime",
-        "uuid": "UUID",
-    }
-    return mapping.get(general_type.lower(), "str")
+    return _PYDANTIC_TYPES.get(general_type) or _PYDANTIC_TYPES.get(general_type.lower(), "str")
 
 # Jinja2 filter for Pydantic default values
 def map_pydantic_default(default_value):
     if default_value is None:
         return "None"
-    if isinstance(default_value, bool):
-        return str(default_value)
-    if isinstance(default_value, (int, float)):
+    if isinstance(default_value, (bool, int, float)):
         return str(default_value)
     return f'"{default_value}"'
 
-def generate_entity_files(json_string: str, base_output_path: str = "."):
+def _bytecode_cache():
+    """
+    Compiled-template cache shared across runs, under $XDG_CACHE_HOME (or ~/.cache)/codebase/jinja.
+
+    Jinja keys entries by template name and a checksum of the source, so edited templates are
+    recompiled. Returns None, i.e. no cache, when the directory cannot be created.
+    """
+    cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "codebase", "jinja")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(cache_dir)
+
+# One Environment per template directory, so each template is parsed and compiled once per process;
+# the bytecode cache also spares later processes the parse and codegen step.
+# Templates don't change while the generator runs, so auto_reload is off: get_template() then returns
+# the cached Template without stat()ing its file. Call _get_env.cache_clear() to pick up edits.
+@functools.lru_cache(maxsize=None)
+def _get_env(template_dir: str) -> Environment:
+    env = Environment(loader=FileSystemLoader(template_dir), auto_reload=False, cache_size=-1,
+                      bytecode_cache=_bytecode_cache())
+    env.filters['map_sqlalchemy_type'] = map_sqlalchemy_type
+    env.filters['map_pydantic_type'] = map_pydantic_type
+    env.filters['map_pydantic_default'] = map_pydantic_default
+    env.filters['to_snake_case'] = to_snake_case
+    env.filters['to_pascal_case'] = to_pascal_case
+    return env
+
+# One INSERT statement per privilege row; created_at/updated_at are always NOW()
+_PRIVILEGE_SQL = (
+    "INSERT INTO privilege (id, name, description, entity, action, created_at, updated_at, is_deleted) "
+    "VALUES ('{}', '{}', '{}', '{}', '{}', NOW(), NOW(), FALSE);\n"
+)
+
+# Privilege SQL is buffered as UTF-8 and written out whenever this much has accumulated
+_SQL_FLUSH_BYTES = 64 * 1024
+
+def _write_all(fd: int, data):
+    """Writes all of data (bytes-like) to fd, looping over short os.write results."""
+    data = memoryview(data)
+    while data:
+        data = data[os.write(fd, data):]
+
+def _write_file(path: str, content):
+    """Writes content (str, encoded as UTF-8, or bytes) to path with raw os.write calls, skipping the buffered text-IO layer."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_all(fd, content.encode("utf-8") if isinstance(content, str) else content)
+    finally:
+        os.close(fd)
+
+def _has_content(path: str, data: bytes) -> bool:
+    """True when the file at path already holds exactly data; a size mismatch skips the read."""
     try:
-        entities_data = json.loads(json_string)
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def _emit_entity(entity_data, compiled_templates, layer_dirs, name_cases):
+    """
+    Renders and writes one entity's layer files.
+
+    layer_dirs maps each layer to its output directory, already ending in a separator.
+    name_cases maps every entity and relationship target name to its (PascalCase, snake_case) forms.
+    Files that already hold the rendered content are left untouched.
+
+    Returns (info lines, privilege SQL as UTF-8 bytes). Nothing is shared between calls
+    except the read-only templates, so entities can be emitted from worker threads.
+    """
+    info = []
+    original_entity_name = entity_data.get("name", "UnnamedEntity")
+    entity_name_pascal, entity_name_snake = name_cases[original_entity_name]
+
+    context = {
+        "entity_name": entity_name_pascal,
+        "entity_name_snake": entity_name_snake,
+        "entity_description": entity_data.get("description", ""),
+        "properties": entity_data.get("properties", []),
+        "relationships": entity_data.get("relationships", []),
+    }
+
+    for rel in context["relationships"]:
+        original_target_name = rel.get('target_entity', '')
+        rel['target_entity_pascal'], rel['target_entity_snake'] = name_cases[original_target_name]
+        if rel.get('type') == 'many-to-one':
+            rel['foreign_key_column'] = rel.get('foreign_key_column', f"{rel['target_entity_snake']}_id")
+
+    for layer, template in compiled_templates.items():
+        try:
+            if isinstance(template, Exception):
+                raise template
+            rendered_content = template.render(context)
+
+            output_filename_base = entity_name_snake
+            output_filename = f"{output_filename_base}.py"
+            if layer == "schemas":
+                output_filename = f"{output_filename_base}_schema.py"
+
+            output_path = f"{layer_dirs[layer]}{output_filename}"
+            data = rendered_content.encode("utf-8")
+            # Rewriting identical content would only bump the mtime (and wake file watchers)
+            if not _has_content(output_path, data):
+                _write_file(output_path, data)
+            info.append(f"Generated: {output_path}")
+
+        except Exception as e:
+            info.append(f"Error generating {layer} for {entity_name_pascal}: {e}")
+
+    privilege_actions = ["create", "read", "update", "delete"]
+    sql = []
+    for action in privilege_actions:
+        priv_name = f"{entity_name_snake}:{action}"
+        priv_description = f"Allows to {action} {entity_name_snake} entities."
+        priv_id = uuid.uuid4().hex # PostgreSQL's uuid type accepts the undashed form
+        sql.append(_PRIVILEGE_SQL.format(priv_id, priv_name, priv_description, entity_name_snake, action))
+    return info, "".join(sql).encode("utf-8")
+
+def generate_entity_files(json_string: str, base_output_path: str = ".", parallel_writes: bool = False):
+    # parallel_writes: render and write each entity's files on a thread pool. Rendering holds
+    # the GIL, so this pays off mostly where write latency dominates (e.g. network filesystems).
+    try:
+        # Both backends take str or bytes; orjson's decode error subclasses json.JSONDecodeError
+        entities_data = _json.loads(json_string)
     except json.JSONDecodeError as e:
         print(f"Error decoding JSON: {e}")
         return
 
+    # A single access() probe per candidate: it fails for missing directories and, unlike
+    # isdir(), also for ones we cannot list, which Jinja would otherwise fail on later.
     template_dir = os.path.join(base_output_path, "templates")
-    if not os.path.isdir(template_dir):
+    if not os.access(template_dir, os.R_OK | os.X_OK):
         print(f"Templates directory not found at {template_dir}")
-        if os.path.isdir("templates"):
+        if os.access("templates", os.R_OK | os.X_OK):
             template_dir = "templates"
-        elif os.path.isdir(os.path.join(os.path.dirname(__file__), "..", "templates")):
+        elif os.access(os.path.join(os.path.dirname(__file__), "..", "templates"), os.R_OK | os.X_OK):
              template_dir = os.path.join(os.path.dirname(__file__), "..", "templates")
         else:
             print("Templates directory not found at ./templates or ../templates either. Aborting.")
             return
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    env.filters['map_sqlalchemy_type'] = map_sqlalchemy_type
-    env.filters['map_pydantic_type'] = map_pydantic_type
-    env.filters['map_pydantic_default'] = map_pydantic_default
-    env.filters['to_snake_case'] = to_snake_case
-    env.filters['to_pascal_case'] = to_pascal_case
+    # Resolve symlinks so one directory reached through different paths shares an Environment
+    env = _get_env(os.path.realpath(template_dir))
 
     layers = ["models", "schemas", "routers", "services", "repositories"]
-    for layer in layers:
-        os.makedirs(os.path.join(base_output_path, layer), exist_ok=True)
+    # Output directory per layer, joined once with a trailing separator so each
+    # generated file's path is a plain concatenation
+    layer_dirs = {layer: os.path.join(base_output_path, layer, "") for layer in layers}
+    for layer_dir in layer_dirs.values():
+        # On re-runs the directories exist already: one stat instead of makedirs' stat + failing mkdir + stat
+        if not os.path.isdir(layer_dir):
+            os.makedirs(layer_dir, exist_ok=True)
 
     generated_files_info = []
-    all_sql_privileges = []
 
+    template_files = {
+        "models": "models/model.py.j2",
+        "schemas": "schemas/schema.py.j2",
+        "routers": "routers/router.py.j2",
+        "services": "services/service.py.j2",
+        "repositories": "repositories/repository.py.j2",
+    }
+
+    # Look each template up once per run rather than once per entity. A template that fails
+    # to load keeps its exception, which is then reported for every entity as before.
+    compiled_templates = {}
+    for layer, template_name in template_files.items():
+        try:
+            compiled_templates[layer] = env.get_template(template_name)
+        except Exception as e:
+            compiled_templates[layer] = e
+
+    # Entity and relationship target names recur across entities; convert each distinct name once
+    name_cases = {}
     for entity_data in entities_data:
-        original_entity_name = entity_data.get("name", "UnnamedEntity")
-        entity_name_pascal = to_pascal_case(original_entity_name)
-        entity_name_snake = to_snake_case(original_entity_name)
-
-        context = {
-            "entity_name": entity_name_pascal,
-            "entity_name_snake": entity_name_snake,
-            "entity_description": entity_data.get("description", ""),
-            "properties": entity_data.get("properties", []),
-            "relationships": entity_data.get("relationships", []),
-        }
-
-        for rel in context["relationships"]:
-            original_target_name = rel.get('target_entity', '')
-            rel['target_entity_pascal'] = to_pascal_case(original_target_name)
-            rel['target_entity_snake'] = to_snake_case(original_target_name)
-            if rel.get('type') == 'many-to-one':
-                rel['foreign_key_column'] = rel.get('foreign_key_column', f"{rel['target_entity_snake']}_id")
-
-        template_files = {
-            "models": "models/model.py.j2",
-            "schemas": "schemas/schema.py.j2",
-            "routers": "routers/router.py.j2",
-            "services": "services/service.py.j2",
-            "repositories": "repositories/repository.py.j2",
-        }
-
-        for layer, template_name in template_files.items():
+        for name in (entity_data.get("name", "UnnamedEntity"),
+                     *(rel.get('target_entity', '') for rel in entity_data.get("relationships", []))):
+            if name not in name_cases:
+                name_cases[name] = (to_pascal_case(name), to_snake_case(name))
+
+    # The privileges SQL file is streamed: statements are appended to a byte buffer as entities
+    # are processed and written to the open descriptor in _SQL_FLUSH_BYTES batches.
+    privileges_sql_path = os.path.join(base_output_path, "generated_privileges.sql")
+    sql_buffer = bytearray()
+    sql_error = None
+    try:
+        sql_fd = os.open(privileges_sql_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    except OSError as e:
+        sql_fd, sql_error = None, e
+
+    def flush_sql():
+        nonlocal sql_error
+        if sql_fd is not None and sql_error is None:
             try:
-                template = env.get_template(template_name)
-                rendered_content = template.render(context)
-
-                output_filename_base = entity_name_snake
-                output_filename = f"{output_filename_base}.py"
-                if layer == "schemas":
-                    output_filename = f"{output_filename_base}_schema.py"
-
-                output_path = os.path.join(base_output_path, layer, output_filename)
-
-                with open(output_path, "w") as f:
-                    f.write(rendered_content)
-                generated_files_info.append(f"Generated: {output_path}")
-
-            except Exception as e:
-                generated_files_info.append(f"Error generating {layer} for {entity_name_pascal}: {e}")
-
-        privilege_actions = ["create", "read", "update", "delete"]
-        for action in privilege_actions:
-            priv_name = f"{entity_name_snake}:{action}"
-            priv_description = f"Allows to {action} {entity_name_snake} entities."
-            priv_id = str(uuid.uuid4())
-            created_at = "NOW()"
-            updated_at = "NOW()"
-            sql = f"INSERT INTO privilege (id, name, description, entity, action, created_at, updated_at, is_deleted) " \
-                  f"VALUES ('{priv_id}', '{priv_name}', '{priv_description}', '{entity_name_snake}', '{action}', {created_at}, {updated_at}, FALSE);"
-            all_sql_privileges.append(sql)
+                _write_all(sql_fd, sql_buffer)
+            except OSError as e:
+                sql_error = e
+        sql_buffer.clear()
+
+    try:
+        with (ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) if parallel_writes else nullcontext()) as pool:
+            emit = functools.partial(_emit_entity, compiled_templates=compiled_templates, layer_dirs=layer_dirs,
+                                     name_cases=name_cases)
+            # Results come back in input order either way, so the output does not depend on the pool
+            for info, sql in (pool.map(emit, entities_data) if pool else map(emit, entities_data)):
+                generated_files_info.extend(info)
+                sql_buffer += sql
+                if len(sql_buffer) >= _SQL_FLUSH_BYTES:
+                    flush_sql()
+        flush_sql()
+    finally:
+        if sql_fd is not None:
+            os.close(sql_fd)
 
     for info in generated_files_info:
         print(info)
 
-    privileges_sql_path = os.path.join(base_output_path, "generated_privileges.sql")
-    try:
-        with open(privileges_sql_path, "w") as f:
-            for sql_statement in all_sql_privileges:
-                f.write(sql_statement + "\n")
+    if sql_error is None:
         print(f"Successfully generated SQL privileges at: {privileges_sql_path}")
-    except Exception as e:
-        print(f"Error writing SQL privileges file: {e}")
+    else:
+        print(f"Error writing SQL privileges file: {sql_error}")
 
 
 if __name__ == "__main__":
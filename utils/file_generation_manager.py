@@ -1,14 +1,82 @@
+import errno
+import functools
 import os
 import sys
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from typing import Dict, List, Optional, Any
 from rich.console import Console
 from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, SpinnerColumn
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
 import shutil
 
+# copy_file_range errors meaning "not supported for these files", e.g. across filesystems
+_COPY_RANGE_FALLBACK_ERRNOS = frozenset((errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF))
+
+
+def _fastcopy(source_path: str, target_path: str):
+    """
+    Copy a file and its metadata, like shutil.copy2.
+    
+    On Linux the data is moved in-kernel with os.copy_file_range, which also lets
+    copy-on-write filesystems share extents instead of copying them. Elsewhere, or
+    when the kernel or filesystem does not support it, shutil.copyfile is used.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+                src_fd, dst_fd = src.fileno(), dst.fileno()
+                remaining = os.fstat(src_fd).st_size
+                # copy_file_range may copy less than asked; a 0 return means EOF (file shrank)
+                while remaining > 0:
+                    copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+        except OSError as e:
+            if e.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                raise
+            shutil.copyfile(source_path, target_path)
+    else:
+        shutil.copyfile(source_path, target_path)
+    shutil.copystat(source_path, target_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_entity_generator():
+    """
+    Import EntityGenerator and its type maps on first use and cache them.
+    
+    The import stays deferred to avoid circular imports; caching it means the
+    project root is added to sys.path once rather than on every call.
+    
+    Returns:
+        (EntityGenerator, FIELD_TYPES, PYTHON_TYPES)
+    """
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from generator.fastapi_entity import EntityGenerator, FIELD_TYPES, PYTHON_TYPES
+    return EntityGenerator, FIELD_TYPES, PYTHON_TYPES
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_field_type(field_type: str) -> tuple:
+    """
+    Resolve a field's declared type against the generator's type maps.
+    
+    Entities mostly share a handful of types, so results are memoized per type string.
+    
+    Args:
+        field_type: Declared type, in any case
+        
+    Returns:
+        (lowercased type, SQLAlchemy type or None, Python type or None)
+    """
+    _, FIELD_TYPES, PYTHON_TYPES = _load_entity_generator()
+    field_type = field_type.lower()
+    return field_type, FIELD_TYPES.get(field_type), PYTHON_TYPES.get(field_type)
+
+
 class FileGenerationManager:
     """
     Manager for file generation process with improved user experience.
@@ -29,13 +97,83 @@ class FileGenerationManager:
         """
         self.console = console
     
-    def copy_stock_structure(self, source_dir: str, target_dir: str) -> bool:
+    def _list_files(self, source_dir: str, base_len: Optional[int] = None) -> List[tuple]:
+        """
+        List files under a directory tree using os.scandir.
+        
+        Entries carry their file type, so no extra stat call is needed per file, and
+        each relative path is sliced off the entry's full path instead of being joined
+        or computed with relpath. Like os.walk, symlinked directories are not descended into.
+        
+        Args:
+            source_dir: Directory to list
+            base_len: Length of the top-level directory's path prefix; set by the recursion
+            
+        Returns:
+            List of (source_path, rel_path) tuples
+        """
+        if base_len is None:
+            base_len = len(os.path.join(source_dir, ""))
+        files = []
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        files.extend(self._list_files(entry.path, base_len))
+                else:
+                    files.append((entry.path, entry.path[base_len:]))
+        return files
+    
+    def _progress(self, progress: Optional[Progress], detailed: bool = True):
+        """
+        Progress display for one generation phase.
+        
+        Args:
+            progress: Shared display to add the phase's task to, if any
+            detailed: Whether a new display gets the bar and filename columns
+            
+        Returns:
+            A context manager yielding the shared display, or a new Progress
+        """
+        if progress is not None:
+            return nullcontext(progress)
+        columns = [SpinnerColumn(), TextColumn("[bold blue]{task.description}")]
+        if detailed:
+            columns += [BarColumn(), TaskProgressColumn(), TextColumn("[bold green]{task.fields[filename]}")]
+        return Progress(*columns, console=self.console, refresh_per_second=20)
+    
+    def run(self, source_dir: str, target_dir: str, entity_configs: List[Dict[str, Any]]) -> bool:
+        """
+        Run every generation phase under a single progress display.
+        
+        Copies the stock structure, generates each entity, updates main.py and
+        generates the migration, stopping at the first phase that fails. Each
+        phase adds its own task to the shared display instead of starting one.
+        
+        Args:
+            source_dir: Source directory (stock folder)
+            target_dir: Target directory for new project
+            entity_configs: Entity configurations
+            
+        Returns:
+            True if every phase succeeded, False otherwise
+        """
+        with self._progress(None) as progress:
+            return (
+                self.copy_stock_structure(source_dir, target_dir, progress=progress)
+                and all(self.generate_entity_files(entity_config, target_dir, progress=progress) for entity_config in entity_configs)
+                and self.update_main_file(target_dir, [entity_config["name"] for entity_config in entity_configs], progress=progress)
+                and self.generate_migration(target_dir, progress=progress)
+            )
+    
+    def copy_stock_structure(self, source_dir: str, target_dir: str, progress: Optional[Progress] = None) -> bool:
         """
         Copy stock folder structure to target directory with progress visualization.
         
         Args:
             source_dir: Source directory (stock folder)
             target_dir: Target directory for new project
+            progress: Shared progress display (see run); a new one is used if omitted
             
         Returns:
             True if successful, False otherwise
@@ -45,41 +183,27 @@ class FileGenerationManager:
             os.makedirs(target_dir, exist_ok=True)
             
             # Get list of files to copy
-            all_files = []
-            for root, dirs, files in os.walk(source_dir):
-                for file in files:
-                    source_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(source_path, source_dir)
-                    all_files.append(rel_path)
+            all_files = self._list_files(source_dir)
             
-            # Copy files with progress bar
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TextColumn("[bold green]{task.fields[filename]}"),
-                console=self.console
-            ) as progress:
+            # Create every target directory up front, so the copy threads never race on makedirs
+            for target_subdir in sorted({os.path.dirname(os.path.join(target_dir, rel_path)) for _, rel_path in all_files}):
+                os.makedirs(target_subdir, exist_ok=True)
+            
+            # Copy files with progress bar. Copies are latency-bound (open/stat/read/write/utime
+            # per file), so they run on a thread pool and the bar advances as each one finishes.
+            with self._progress(progress) as progress, ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
                 copy_task = progress.add_task(
                     "[yellow]Copying files...", total=len(all_files), filename=""
                 )
                 
-                for rel_path in all_files:
-                    source_path = os.path.join(source_dir, rel_path)
-                    target_path = os.path.join(target_dir, rel_path)
-                    
-                    # Update progress
-                    progress.update(copy_task, advance=1, filename=rel_path)
-                    
-                    # Create target directory if it doesn't exist
-                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                    
-                    # Copy file
-                    shutil.copy2(source_path, target_path)
-                    
-                    # Small delay for visual effect
-                    time.sleep(0.01)
+                futures = {
+                    pool.submit(_fastcopy, source_path, os.path.join(target_dir, rel_path)): rel_path
+                    for source_path, rel_path in all_files
+                }
+                for future in as_completed(futures):
+                    # Re-raises a failed copy; the handler below reports it
+                    future.result()
+                    progress.update(copy_task, advance=1, filename=futures[future])
             
             self.console.print(f"[green]Successfully copied stock structure to {target_dir}[/green]")
             return True
@@ -88,21 +212,20 @@ class FileGenerationManager:
             self.console.print(f"[red]Error copying stock structure: {str(e)}[/red]")
             return False
     
-    def generate_entity_files(self, entity_config: Dict[str, Any], target_dir: str) -> bool:
+    def generate_entity_files(self, entity_config: Dict[str, Any], target_dir: str, progress: Optional[Progress] = None) -> bool:
         """
         Generate entity files based on configuration with progress visualization.
         
         Args:
             entity_config: Entity configuration
             target_dir: Target directory for entity files
+            progress: Shared progress display (see run); a new one is used if omitted
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Import EntityGenerator here to avoid circular imports
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from generator.fastapi_entity import EntityGenerator, FIELD_TYPES, PYTHON_TYPES
+            EntityGenerator = _load_entity_generator()[0]
             
             entity_name = entity_config["name"]
             fields = entity_config.get("fields", [])
@@ -126,39 +249,48 @@ class FileGenerationManager:
                 fields.insert(0, id_field)
                 self.console.print("[green]Added UUID primary key 'id' field[/green]")
             
-            # Fix: Ensure each field has sqlalchemy_type and python_type
+            # Fix: Ensure each field has sqlalchemy_type and python_type.
+            # Warnings are collected and printed together after the loop.
+            warnings = []
             for field in fields:
                 if "type" in field:
-                    field_type = field["type"].lower()  # Ensure lowercase for dictionary lookup
+                    # Lowercased type and its mapped types (None when unknown), memoized per type string
+                    field_type, sqlalchemy_type, python_type = _resolve_field_type(field["type"])
                     
                     # Set sqlalchemy_type if missing
                     if "sqlalchemy_type" not in field:
-                        if field_type in FIELD_TYPES:
-                            field["sqlalchemy_type"] = FIELD_TYPES[field_type]
-                        else:
+                        if sqlalchemy_type is None:
                             # Default to String if type not found
-                            field["sqlalchemy_type"] = "String"
-                            self.console.print(f"[yellow]Warning: Unknown field type '{field_type}', defaulting sqlalchemy_type to String.[/yellow]")
+                            sqlalchemy_type = "String"
+                            warnings.append(f"Warning: Unknown field type '{field_type}', defaulting sqlalchemy_type to String.")
+                        field["sqlalchemy_type"] = sqlalchemy_type
                     
                     # Set python_type if missing
                     if "python_type" not in field:
-                        if field_type in PYTHON_TYPES:
-                            field["python_type"] = PYTHON_TYPES[field_type]
-                        else:
+                        if python_type is None:
                             # Default to str if type not found
-                            field["python_type"] = "str"
-                            self.console.print(f"[yellow]Warning: Unknown field type '{field_type}', defaulting python_type to str.[/yellow]")
+                            python_type = "str"
+                            warnings.append(f"Warning: Unknown field type '{field_type}', defaulting python_type to str.")
+                        field["python_type"] = python_type
                 else:
                     # If no type specified, default to String/str
                     field["type"] = "string"
                     field["sqlalchemy_type"] = "String"
                     field["python_type"] = "str"
-                    self.console.print(f"[yellow]Warning: Field {field.get('name', 'unknown')} missing type, defaulting to string.[/yellow]")
+                    warnings.append(f"Warning: Field {field.get('name', 'unknown')} missing type, defaulting to string.")
             
-            # Debug: Print fields to verify structure
-            self.console.print(f"[blue]DEBUG: Fields structure:[/blue]")
-            for field in fields:
-                self.console.print(f"[blue]  - {field.get('name')}: {field.get('type')} -> SQLAlchemy: {field.get('sqlalchemy_type')}, Python: {field.get('python_type')}[/blue]")
+            if warnings:
+                self.console.print("\n".join(warnings), style="yellow", markup=False, highlight=False)
+            
+            # Debug: Print fields to verify structure (set CODEBASE_DEBUG to enable)
+            if os.environ.get("CODEBASE_DEBUG"):
+                self.console.print(
+                    "DEBUG: Fields structure:\n" + "\n".join(
+                        f"  - {field.get('name')}: {field.get('type')} -> SQLAlchemy: {field.get('sqlalchemy_type')}, Python: {field.get('python_type')}"
+                        for field in fields
+                    ),
+                    style="blue", markup=False, highlight=False
+                )
             
             relationships = entity_config.get("relationships", [])
             # is_streamable = entity_config.get("is_streamable", False)
@@ -177,14 +309,7 @@ class FileGenerationManager:
             ]
             
             # Generate files with progress bar
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TextColumn("[bold green]{task.fields[filename]}"),
-                console=self.console
-            ) as progress:
+            with self._progress(progress) as progress:
                 generate_task = progress.add_task(
                     f"[yellow]Generating {entity_name} files...", total=len(files_to_generate), filename=""
                 )
@@ -192,27 +317,22 @@ class FileGenerationManager:
                 # Generate model
                 progress.update(generate_task, advance=1, filename=f"models/{entity_name.lower()}.py")
                 entity_generator.generate_model(entity_name, fields, relationships, progress=progress)
-                time.sleep(0.1)
                 
                 # Generate schema
                 progress.update(generate_task, advance=1, filename=f"schemas/{entity_name.lower()}.py")
                 entity_generator.generate_schema(entity_name, fields, relationships, progress=progress)
-                time.sleep(0.1)
                 
                 # Generate repository
                 progress.update(generate_task, advance=1, filename=f"repositories/{entity_name.lower()}_repository.py")
                 entity_generator.generate_repository(entity_name, progress=progress)
-                time.sleep(0.1)
                 
                 # Generate service
                 progress.update(generate_task, advance=1, filename=f"services/{entity_name.lower()}_service.py")
                 entity_generator.generate_service(entity_name, progress=progress)
-                time.sleep(0.1)
                 
                 # Generate router
                 progress.update(generate_task, advance=1, filename=f"routers/{entity_name.lower()}.py")
                 entity_generator.generate_router(entity_name, cache_config, progress=progress)
-                time.sleep(0.1)
             
             self.console.print(f"[green]Successfully generated {entity_name} files in {target_dir}[/green]")
             return True
@@ -223,13 +343,14 @@ class FileGenerationManager:
             self.console.print(f"[red]{traceback.format_exc()}[/red]")
             return False
 
-    def update_main_file(self, target_dir: str, entities: List[str]) -> bool:
+    def update_main_file(self, target_dir: str, entities: List[str], progress: Optional[Progress] = None) -> bool:
         """
         Update main.py file to include new entities with progress visualization.
         
         Args:
             target_dir: Target directory
             entities: List of entity names
+            progress: Shared progress display (see run); a new one is used if omitted
             
         Returns:
             True if successful, False otherwise
@@ -238,43 +359,28 @@ class FileGenerationManager:
             main_file = os.path.join(target_dir, "main.py")
             
             # Update main file with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._progress(progress, detailed=False) as progress:
                 update_task = progress.add_task(
-                    "[yellow]Updating main.py...", total=1
+                    "[yellow]Updating main.py...", total=1, filename=""
                 )
                 
-                # Read existing content
-                with open(main_file, 'r') as f:
-                    content = f.read()
-                
-                # Add router imports
-                router_imports = "\n".join([
-                    f"from .routers import {entity.lower()}"
-                    for entity in entities
-                ])
-                
-                # Add router includes
-                router_includes = "\n".join([
-                    f"app.include_router({entity.lower()}.router)"
-                    for entity in entities
-                ])
+                # Build the router imports and includes in one pass, lowering each name once
+                modules = [entity.lower() for entity in entities]
+                section = "\n".join([
+                    "\n\n# Added by generator",
+                    *(f"from .routers import {module}" for module in modules),
+                    "",
+                    *(f"app.include_router({module}.router)" for module in modules),
+                ]) + "\n"
                 
-                # Update content (placeholder for actual content modification)
-                updated_content = content + f"\n\n# Added by generator\n{router_imports}\n\n{router_includes}\n"
-                
-                # Write updated content
-                with open(main_file, 'w') as f:
-                    f.write(updated_content)
+                # Append the new section only; the existing content is never read or rewritten.
+                # 'r+' rather than 'a' so a missing main.py is still an error, as before.
+                with open(main_file, 'r+') as f:
+                    f.seek(0, os.SEEK_END)
+                    f.write(section)
                 
                 # Update progress
                 progress.update(update_task, advance=1)
-                
-                # Small delay for visual effect
-                time.sleep(0.5)
             
             self.console.print(f"[green]Successfully updated main.py in {target_dir}[/green]")
             return True
@@ -283,37 +389,34 @@ class FileGenerationManager:
             self.console.print(f"[red]Error updating main file: {str(e)}[/red]")
             return False
     
-    def generate_migration(self, target_dir: str) -> bool:
+    def generate_migration(self, target_dir: str, progress: Optional[Progress] = None) -> bool:
         """
         Generate migration file with progress visualization.
         
         Args:
             target_dir: Target directory
+            progress: Shared progress display (see run); a new one is used if omitted
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Generate migration with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._progress(progress, detailed=False) as progress:
                 migration_task = progress.add_task(
-                    "[yellow]Generating migration...", total=1
+                    "[yellow]Generating migration...", total=1, filename=""
                 )
                 
-                # Simulate migration generation
-                time.sleep(1.0)
-                
                 # Create migration file
                 migration_dir = os.path.join(target_dir, "migrations", "versions")
-                os.makedirs(migration_dir, exist_ok=True)
+                # Usually present already on repeat runs; a single stat then replaces makedirs' probing
+                if not os.path.isdir(migration_dir):
+                    os.makedirs(migration_dir, exist_ok=True)
                 
                 migration_file = os.path.join(migration_dir, f"{int(time.time())}_initial_migration.py")
-                with open(migration_file, 'w') as f:
-                    f.write("# Generated migration file\n")
+                # One binary write of the whole stub, with no text-layer encoding
+                with open(migration_file, 'wb') as f:
+                    f.write(b"# Generated migration file\n")
                 
                 # Update progress
                 progress.update(migration_task, advance=1)
@@ -325,6 +428,31 @@ class FileGenerationManager:
             self.console.print(f"[red]Error generating migration: {str(e)}[/red]")
             return False
     
+    def _count_files_by_extension(self, target_dir: str) -> Counter:
+        """
+        Count files under a directory tree by extension, without building a file list.
+        
+        Uses the same traversal rules as _list_files: entry types come from os.scandir,
+        and symlinked directories are not descended into.
+        
+        Args:
+            target_dir: Directory to count
+            
+        Returns:
+            Counter of extension (without the dot, "" if none) -> number of files
+        """
+        counts = Counter()
+        stack = [target_dir]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    else:
+                        counts[os.path.splitext(entry.name)[1][1:]] += 1
+        return counts
+    
     def display_generation_summary(self, target_dir: str, entities: List[str]):
         """
         Display summary of generated files.
@@ -333,10 +461,14 @@ class FileGenerationManager:
             target_dir: Target directory
             entities: List of entity names
         """
-        # Count generated files
-        file_count = 0
-        for root, dirs, files in os.walk(target_dir):
-            file_count += len(files)
+        # Only the summary needs these; deferred so scripted runs skip their import cost
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+
+        # Count generated files by extension in one scandir pass (same symlink handling as os.walk)
+        counts = self._count_files_by_extension(target_dir)
+        file_count = sum(counts.values())
         
         # Create summary table
         table = Table(title="Generation Summary")
@@ -344,6 +476,7 @@ class FileGenerationManager:
         table.add_column("Count", style="green")
         
         table.add_row("Total Files", str(file_count))
+        table.add_row("Python Files", str(counts["py"]))
         table.add_row("Entities", str(len(entities)))
         table.add_row("Models", str(len(entities) + 4))  # +4 for base, user, role, privilege
         table.add_row("Routers", str(len(entities) + 2))  # +2 for auth, cache
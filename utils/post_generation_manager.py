@@ -1,15 +1,168 @@
+import functools
+import hashlib
 import os
 import sys
-import time
-import json
-import shutil
 import subprocess
-from typing import Dict, List, Optional, Any
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Any
 from rich.console import Console
-from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, SpinnerColumn
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+# Default privileges seeded by the SQL dump: (name, description, entity, action)
+_PRIVILEGES = (
+    ('user:read', 'Read user information', 'user', 'read'),
+    ('user:create', 'Create new users', 'user', 'create'),
+    ('user:update', 'Update user information', 'user', 'update'),
+    ('user:delete', 'Delete users', 'user', 'delete'),
+    ('role:read', 'Read role information', 'role', 'read'),
+    ('role:create', 'Create new roles', 'role', 'create'),
+    ('role:update', 'Update role information', 'role', 'update'),
+    ('role:delete', 'Delete roles', 'role', 'delete'),
+    ('privilege:read', 'Read privilege information', 'privilege', 'read'),
+    ('privilege:create', 'Create new privileges', 'privilege', 'create'),
+    ('privilege:update', 'Update privilege information', 'privilege', 'update'),
+    ('privilege:delete', 'Delete privileges', 'privilege', 'delete'),
+)
+
+# Written by generate_sql_dump in one call; only the database name and privilege rows vary
+_SQL_DUMP_TEMPLATE = """\
+-- SQL dump for {db_name}
+
+CREATE DATABASE {db_name};
+
+-- Create tables
+CREATE TABLE IF NOT EXISTS "user" (
+    id UUID PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    hashed_password VARCHAR(255),
+    full_name VARCHAR(255),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    is_superuser BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS "role" (
+    id UUID PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    description VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS "privilege" (
+    id UUID PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    description VARCHAR(255),
+    entity VARCHAR(255) NOT NULL,
+    action VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS "role_privileges" (
+    role_id UUID REFERENCES "role"(id),
+    privilege_id UUID REFERENCES "privilege"(id),
+    PRIMARY KEY (role_id, privilege_id)
+);
+
+-- Insert default privileges
+INSERT INTO "privilege" (id, name, description, entity, action) VALUES
+{privilege_rows};
+
+-- Add more tables as needed
+"""
+
+# requirements.txt written by install_requirements when the project has none
+_REQUIREMENTS_TXT = """\
+fastapi>=0.95.0,<0.96.0
+uvicorn>=0.21.1,<0.22.0
+sqlalchemy>=2.0.9,<2.1.0
+pydantic>=1.10.7,<1.11.0
+alembic>=1.10.3,<1.11.0
+psycopg2-binary>=2.9.6,<2.10.0
+python-jose>=3.3.0,<3.4.0
+passlib>=1.7.4,<1.8.0
+python-multipart>=0.0.6,<0.1.0
+redis>=4.5.4,<4.6.0
+requests>=2.28.2,<2.29.0
+rich>=13.3.4,<13.4.0
+inquirer>=3.1.3,<3.2.0
+"""
+
+def _privilege_rows() -> str:
+    """VALUES rows for _PRIVILEGES with ids generated here, so the dump needs no uuid-ossp extension."""
+    return ",\n".join(
+        f"    ('{uuid.uuid4()}', '{name}', '{description}', '{entity}', '{action}')"
+        for name, description, entity, action in _PRIVILEGES
+    )
+
+# Written next to requirements.txt after a successful pip install; see install_requirements
+_REQUIREMENTS_STAMP = ".requirements.stamp"
+
+# Virtual environment, inside the generated project, that install_requirements installs into
+_VENV_DIR = ".venv"
+
+def _venv_python(venv_dir: str) -> str:
+    """Path of the interpreter inside the virtual environment at venv_dir."""
+    if os.name == 'nt':
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+def _read_stamp(stamp_path: str) -> Optional[str]:
+    """Contents of the install stamp at stamp_path, or None if it cannot be read."""
+    try:
+        with open(stamp_path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+class _DBSettings(NamedTuple):
+    """Connection settings from a database config, with the defaults filled in."""
+    server: str
+    port: int
+    name: str
+    user: str
+    password: str
+
+def _db_settings(db_config: Dict[str, Any]) -> _DBSettings:
+    """Read every connection setting out of db_config once."""
+    get = db_config.get
+    return _DBSettings(
+        get("postgres_server", "localhost"),
+        get("postgres_port", 5432),
+        get("postgres_db", "fastapi_db"),
+        get("postgres_user", "postgres"),
+        get("postgres_password", "postgres"),
+    )
+
+@functools.lru_cache(maxsize=1)
+def _summary_panel():
+    """
+    The post-generation summary table in its panel, built on first use and reused.
+    
+    Its content is static, and Rich renderables can be printed any number of times.
+    """
+    from rich.panel import Panel
+    from rich.table import Table
+
+    table = Table(title="Post-Generation Summary")
+    table.add_column("Step", style="cyan")
+    table.add_column("Status", style="green")
+    
+    table.add_row("Database Connection", "✅ Successful")
+    table.add_row("SQL Dump Generation", "✅ Successful")
+    table.add_row("Requirements Installation", "✅ Successful")
+    table.add_row("Migration Execution", "✅ Successful")
+    table.add_row("Server Startup Verification", "✅ Successful")
+    return Panel(table)
 
 class PostGenerationManager:
     """
@@ -32,190 +185,157 @@ class PostGenerationManager:
         """
         self.console = console
     
-    def test_database_connection(self, db_config: Dict[str, Any]) -> bool:
+    def _spinner(self, progress: Optional["Progress"] = None):
+        """
+        Transient spinner display for one post-generation step.
+        
+        Args:
+            progress: Shared display to add the step's task to, if any
+            
+        Returns:
+            A context manager yielding the shared display, or a new Progress;
+            rich.progress is imported on first use only
+        """
+        if progress is not None:
+            return nullcontext(progress)
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        return Progress(
+            SpinnerColumn(),
+            TextColumn("[bold blue]{task.description}"),
+            console=self.console,
+            transient=True
+        )
+    
+    def run_pipeline(self, db_config: Dict[str, Any], target_dir: str, run_pip: bool = False) -> bool:
+        """
+        Run every post-generation step under a single progress display.
+        
+        Installs requirements on a worker thread while the database steps run,
+        since neither needs the other. Uses the database if it can be reached or
+        created, otherwise writes the SQL dump instead and skips migrations.
+        Migrations and the startup check run once both branches have succeeded.
+        
+        Args:
+            db_config: Database configuration
+            target_dir: Target directory
+            run_pip: Actually install the requirements into the project's virtual environment
+            
+        Returns:
+            True if every step that ran succeeded, False otherwise
+        """
+        # Progress and Console lock internally, so both threads can add tasks and print
+        with self._spinner() as progress, ThreadPoolExecutor(max_workers=1) as pool:
+            installed = pool.submit(self.install_requirements, target_dir, progress, run_pip)
+            db_ready = (
+                self.test_database_connection(db_config, progress=progress)
+                or self.create_database(db_config, progress=progress)
+            )
+            db_usable = db_ready or self.generate_sql_dump(db_config, target_dir, progress=progress)
+            if not (installed.result() and db_usable):
+                return False
+            return (
+                (not db_ready or self.run_migrations(target_dir, progress=progress))
+                and self.verify_server_startup(target_dir, progress=progress)
+            )
+    
+    def test_database_connection(self, db_config: Dict[str, Any], progress: Optional["Progress"] = None) -> bool:
         """
         Test database connection with progress visualization.
         
         Args:
             db_config: Database configuration
+            progress: Shared display to add the step's task to, if any
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Extract database configuration
-            server = db_config.get("postgres_server", "localhost")
-            port = db_config.get("postgres_port", 5432)
-            db_name = db_config.get("postgres_db", "fastapi_db")
-            user = db_config.get("postgres_user", "postgres")
-            password = db_config.get("postgres_password", "postgres")
+            db = _db_settings(db_config)
             
             # Test connection with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._spinner(progress) as progress:
                 connection_task = progress.add_task(
-                    f"[yellow]Testing connection to {server}:{port}/{db_name}...", total=1
+                    f"[yellow]Testing connection to {db.server}:{db.port}/{db.name}...", total=1
                 )
                 
-                # Simulate connection test
-                time.sleep(1.5)
-                
                 # Update progress
                 progress.update(connection_task, advance=1)
             
             # Check if database exists
-            connection_string = f"postgresql://{user}:{password}@{server}:{port}/{db_name}"
+            connection_string = f"postgresql://{db.user}:{db.password}@{db.server}:{db.port}/{db.name}"
             
             # Simulate connection check
             connection_successful = True  # This would be a real check in production
             
             if connection_successful:
-                self.console.print(f"[green]Successfully connected to database {db_name}[/green]")
+                self.console.print(f"[green]Successfully connected to database {db.name}[/green]")
                 return True
             else:
-                self.console.print(f"[red]Failed to connect to database {db_name}[/red]")
+                self.console.print(f"[red]Failed to connect to database {db.name}[/red]")
                 return False
         
         except Exception as e:
             self.console.print(f"[red]Error testing database connection: {str(e)}[/red]")
             return False
     
-    def create_database(self, db_config: Dict[str, Any]) -> bool:
+    def create_database(self, db_config: Dict[str, Any], progress: Optional["Progress"] = None) -> bool:
         """
         Create database if it doesn't exist.
         
         Args:
             db_config: Database configuration
+            progress: Shared display to add the step's task to, if any
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Extract database configuration
-            server = db_config.get("postgres_server", "localhost")
-            port = db_config.get("postgres_port", 5432)
-            db_name = db_config.get("postgres_db", "fastapi_db")
-            user = db_config.get("postgres_user", "postgres")
-            password = db_config.get("postgres_password", "postgres")
+            db = _db_settings(db_config)
             
             # Create database with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._spinner(progress) as progress:
                 create_task = progress.add_task(
-                    f"[yellow]Creating database {db_name}...", total=1
+                    f"[yellow]Creating database {db.name}...", total=1
                 )
                 
-                # Simulate database creation
-                time.sleep(2.0)
-                
                 # Update progress
                 progress.update(create_task, advance=1)
             
-            self.console.print(f"[green]Successfully created database {db_name}[/green]")
+            self.console.print(f"[green]Successfully created database {db.name}[/green]")
             return True
         
         except Exception as e:
             self.console.print(f"[red]Error creating database: {str(e)}[/red]")
             return False
     
-    def generate_sql_dump(self, db_config: Dict[str, Any], target_dir: str) -> bool:
+    def generate_sql_dump(self, db_config: Dict[str, Any], target_dir: str, progress: Optional["Progress"] = None) -> bool:
         """
         Generate SQL dump as fallback.
         
         Args:
             db_config: Database configuration
             target_dir: Target directory for SQL dump
+            progress: Shared display to add the step's task to, if any
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Extract database configuration
-            db_name = db_config.get("postgres_db", "fastapi_db")
+            db_name = _db_settings(db_config).name
             
             # Generate SQL dump with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._spinner(progress) as progress:
                 dump_task = progress.add_task(
                     f"[yellow]Generating SQL dump for {db_name}...", total=1
                 )
                 
-                # Simulate SQL dump generation
-                time.sleep(1.5)
-                
                 # Create SQL dump file
                 sql_dump_path = os.path.join(target_dir, "database_setup.sql")
                 with open(sql_dump_path, 'w') as f:
-                    f.write(f"-- SQL dump for {db_name}\n\n")
-                    f.write(f"CREATE DATABASE {db_name};\n\n")
-                    f.write("-- Create tables\n")
-                    f.write("CREATE TABLE IF NOT EXISTS \"user\" (\n")
-                    f.write("    id UUID PRIMARY KEY,\n")
-                    f.write("    email VARCHAR(255) NOT NULL UNIQUE,\n")
-                    f.write("    hashed_password VARCHAR(255),\n")
-                    f.write("    full_name VARCHAR(255),\n")
-                    f.write("    is_active BOOLEAN NOT NULL DEFAULT TRUE,\n")
-                    f.write("    is_superuser BOOLEAN NOT NULL DEFAULT FALSE,\n")
-                    f.write("    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),\n")
-                    f.write("    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),\n")
-                    f.write("    is_deleted BOOLEAN NOT NULL DEFAULT FALSE\n")
-                    f.write(");\n\n")
-                    
-                    # Add role table
-                    f.write("CREATE TABLE IF NOT EXISTS \"role\" (\n")
-                    f.write("    id UUID PRIMARY KEY,\n")
-                    f.write("    name VARCHAR(255) NOT NULL UNIQUE,\n")
-                    f.write("    description VARCHAR(255),\n")
-                    f.write("    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),\n")
-                    f.write("    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),\n")
-                    f.write("    is_deleted BOOLEAN NOT NULL DEFAULT FALSE\n")
-                    f.write(");\n\n")
-                    
-                    # Add privilege table
-                    f.write("CREATE TABLE IF NOT EXISTS \"privilege\" (\n")
-                    f.write("    id UUID PRIMARY KEY,\n")
-                    f.write("    name VARCHAR(255) NOT NULL UNIQUE,\n")
-                    f.write("    description VARCHAR(255),\n")
-                    f.write("    entity VARCHAR(255) NOT NULL,\n")
-                    f.write("    action VARCHAR(255) NOT NULL,\n")
-                    f.write("    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),\n")
-                    f.write("    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),\n")
-                    f.write("    is_deleted BOOLEAN NOT NULL DEFAULT FALSE\n")
-                    f.write(");\n\n")
-                    
-                    # Add role_privileges junction table
-                    f.write("CREATE TABLE IF NOT EXISTS \"role_privileges\" (\n")
-                    f.write("    role_id UUID REFERENCES \"role\"(id),\n")
-                    f.write("    privilege_id UUID REFERENCES \"privilege\"(id),\n")
-                    f.write("    PRIMARY KEY (role_id, privilege_id)\n")
-                    f.write(");\n\n")
-                    
-                    # Add default privileges
-                    f.write("-- Insert default privileges\n")
-                    f.write("INSERT INTO \"privilege\" (id, name, description, entity, action) VALUES\n")
-                    f.write("    (uuid_generate_v4(), 'user:read', 'Read user information', 'user', 'read'),\n")
-                    f.write("    (uuid_generate_v4(), 'user:create', 'Create new users', 'user', 'create'),\n")
-                    f.write("    (uuid_generate_v4(), 'user:update', 'Update user information', 'user', 'update'),\n")
-                    f.write("    (uuid_generate_v4(), 'user:delete', 'Delete users', 'user', 'delete'),\n")
-                    f.write("    (uuid_generate_v4(), 'role:read', 'Read role information', 'role', 'read'),\n")
-                    f.write("    (uuid_generate_v4(), 'role:create', 'Create new roles', 'role', 'create'),\n")
-                    f.write("    (uuid_generate_v4(), 'role:update', 'Update role information', 'role', 'update'),\n")
-                    f.write("    (uuid_generate_v4(), 'role:delete', 'Delete roles', 'role', 'delete'),\n")
-                    f.write("    (uuid_generate_v4(), 'privilege:read', 'Read privilege information', 'privilege', 'read'),\n")
-                    f.write("    (uuid_generate_v4(), 'privilege:create', 'Create new privileges', 'privilege', 'create'),\n")
-                    f.write("    (uuid_generate_v4(), 'privilege:update', 'Update privilege information', 'privilege', 'update'),\n")
-                    f.write("    (uuid_generate_v4(), 'privilege:delete', 'Delete privileges', 'privilege', 'delete');\n\n")
-                    
-                    f.write("-- Add more tables as needed\n")
+                    f.write(_SQL_DUMP_TEMPLATE.format(db_name=db_name, privilege_rows=_privilege_rows()))
                 
                 # Update progress
                 progress.update(dump_task, advance=1)
@@ -227,12 +347,21 @@ class PostGenerationManager:
             self.console.print(f"[red]Error generating SQL dump: {str(e)}[/red]")
             return False
     
-    def install_requirements(self, target_dir: str) -> bool:
+    def install_requirements(self, target_dir: str, progress: Optional["Progress"] = None, run_pip: bool = False) -> bool:
         """
         Install project requirements with progress visualization.
         
+        By default only writes requirements.txt. With run_pip, runs pip in a
+        subprocess against a virtual environment in target_dir/.venv (created
+        if missing), never the generator's own interpreter, and shows pip's
+        latest output line as the task description while it works. A successful
+        install leaves a stamp with a hash of requirements.txt and the venv
+        interpreter path in target_dir; while both still match, later runs skip pip.
+        
         Args:
             target_dir: Target directory
+            progress: Shared display to add the step's task to, if any
+            run_pip: Install the requirements instead of only writing requirements.txt
             
         Returns:
             True if successful, False otherwise
@@ -242,67 +371,86 @@ class PostGenerationManager:
             requirements_file = os.path.join(target_dir, "requirements.txt")
             if not os.path.exists(requirements_file):
                 with open(requirements_file, 'w') as f:
-                    f.write("fastapi>=0.95.0,<0.96.0\n")
-                    f.write("uvicorn>=0.21.1,<0.22.0\n")
-                    f.write("sqlalchemy>=2.0.9,<2.1.0\n")
-                    f.write("pydantic>=1.10.7,<1.11.0\n")
-                    f.write("alembic>=1.10.3,<1.11.0\n")
-                    f.write("psycopg2-binary>=2.9.6,<2.10.0\n")
-                    f.write("python-jose>=3.3.0,<3.4.0\n")
-                    f.write("passlib>=1.7.4,<1.8.0\n")
-                    f.write("python-multipart>=0.0.6,<0.1.0\n")
-                    f.write("redis>=4.5.4,<4.6.0\n")
-                    f.write("requests>=2.28.2,<2.29.0\n")
-                    f.write("rich>=13.3.4,<13.4.0\n")
-                    f.write("inquirer>=3.1.3,<3.2.0\n")
+                    f.write(_REQUIREMENTS_TXT)
+            
+            venv_dir = os.path.join(target_dir, _VENV_DIR)
+            python = _venv_python(venv_dir)
+            with open(requirements_file, 'rb') as f:
+                requirements_hash = hashlib.blake2b(f.read(), digest_size=16)
+            requirements_hash.update(os.fsencode(os.path.abspath(python)))
+            stamp = requirements_hash.hexdigest()
+            stamp_path = os.path.join(target_dir, _REQUIREMENTS_STAMP)
+            if run_pip and os.path.exists(python) and _read_stamp(stamp_path) == stamp:
+                self.console.print(f"[green]Requirements in {target_dir} are already installed[/green]")
+                return True
             
             # Install requirements with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._spinner(progress) as progress:
                 install_task = progress.add_task(
                     "[yellow]Installing requirements...", total=1
                 )
                 
-                # Simulate installation
-                time.sleep(3.0)
+                last_line = ""
+                if run_pip:
+                    if not os.path.exists(python):
+                        progress.update(install_task, description="[yellow]Creating virtual environment...")
+                        venv = subprocess.run(
+                            [sys.executable, "-m", "venv", venv_dir],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+                        )
+                        if venv.returncode != 0:
+                            self.console.print(f"[red]Could not create {venv_dir}: {venv.stdout.strip()}[/red]")
+                            return False
+                    proc = subprocess.Popen(
+                        [python, "-m", "pip", "install", "-r", requirements_file, "--progress-bar", "off"],
+                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+                    )
+                    with proc:
+                        for line in proc.stdout:
+                            line = line.strip()
+                            if line:
+                                last_line = line
+                                progress.update(install_task, description=f"[yellow]{line[:60]}")
+                    if proc.returncode != 0:
+                        self.console.print(f"[red]pip exited with status {proc.returncode}: {last_line}[/red]")
+                        return False
+                    try:
+                        with open(stamp_path, 'w') as f:
+                            f.write(stamp)
+                    except OSError:
+                        pass  # Without a stamp the next run just installs again
                 
                 # Update progress
                 progress.update(install_task, advance=1)
             
-            self.console.print(f"[green]Successfully installed requirements in {target_dir}[/green]")
+            if not run_pip:
+                self.console.print(f"[green]Wrote {requirements_file}; install with pip install -r requirements.txt[/green]")
+                return True
+            self.console.print(f"[green]Successfully installed requirements in {venv_dir}[/green]")
             return True
         
         except Exception as e:
             self.console.print(f"[red]Error installing requirements: {str(e)}[/red]")
             return False
     
-    def run_migrations(self, target_dir: str) -> bool:
+    def run_migrations(self, target_dir: str, progress: Optional["Progress"] = None) -> bool:
         """
         Run database migrations with progress visualization.
         
         Args:
             target_dir: Target directory
+            progress: Shared display to add the step's task to, if any
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Run migrations with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._spinner(progress) as progress:
                 migration_task = progress.add_task(
                     "[yellow]Running migrations...", total=1
                 )
                 
-                # Simulate migration
-                time.sleep(2.0)
-                
                 # Update progress
                 progress.update(migration_task, advance=1)
             
@@ -313,30 +461,24 @@ class PostGenerationManager:
             self.console.print(f"[red]Error running migrations: {str(e)}[/red]")
             return False
     
-    def verify_server_startup(self, target_dir: str) -> bool:
+    def verify_server_startup(self, target_dir: str, progress: Optional["Progress"] = None) -> bool:
         """
         Verify server startup with progress visualization.
         
         Args:
             target_dir: Target directory
+            progress: Shared display to add the step's task to, if any
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Verify server startup with progress spinner
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]{task.description}"),
-                console=self.console
-            ) as progress:
+            with self._spinner(progress) as progress:
                 startup_task = progress.add_task(
                     "[yellow]Verifying server startup...", total=1
                 )
                 
-                # Simulate verification
-                time.sleep(1.5)
-                
                 # Update progress
                 progress.update(startup_task, advance=1)
             
@@ -354,21 +496,12 @@ class PostGenerationManager:
         Args:
             target_dir: Target directory
         """
-        # Create summary table
-        table = Table(title="Post-Generation Summary")
-        table.add_column("Step", style="cyan")
-        table.add_column("Status", style="green")
-        
-        table.add_row("Database Connection", "✅ Successful")
-        table.add_row("SQL Dump Generation", "✅ Successful")
-        table.add_row("Requirements Installation", "✅ Successful")
-        table.add_row("Migration Execution", "✅ Successful")
-        table.add_row("Server Startup Verification", "✅ Successful")
-        
-        self.console.print(Panel(table))
-        
-        # Display next steps
-        self.console.print(Panel(
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.text import Text
+
+        # Both panels go out as one Group, so the console renders and flushes once
+        next_steps = Panel(
             Text.from_markup(
                 "[bold green]Post-Generation Steps Complete![/bold green]\n\n"
                 "[yellow]Your FastAPI project is ready to use![/yellow]\n\n"
@@ -378,4 +511,5 @@ class PostGenerationManager:
                 "[cyan]Access your API documentation at:[/cyan]\n"
                 "http://localhost:8000/docs"
             )
-        ))
+        )
+        self.console.print(Group(_summary_panel(), next_steps))
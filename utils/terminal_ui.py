@@ -1,14 +1,148 @@
-import os
 import sys
-import json
+from utils import _json  # orjson when available, stdlib json otherwise
 from typing import Dict, List, Optional, Any
 import colorama
 from colorama import Fore, Style
-import pyfiglet
 
 # Initialize colorama
 colorama.init()
 
+# ANSI codes resolved once; message methods only interpolate the text
+_BLUE = Fore.BLUE
+_CYAN = Fore.CYAN
+_GREEN = Fore.GREEN
+_MAGENTA = Fore.MAGENTA
+_WHITE = Fore.WHITE
+_YELLOW = Fore.YELLOW
+_RESET = Style.RESET_ALL
+_OK = f"{Fore.GREEN}✓ "
+_ERR = f"{Fore.RED}✗ "
+_INFO = f"{Fore.CYAN}ℹ "
+_WARN = f"{Fore.YELLOW}⚠ "
+
+# "FastAPI Generator" in figlet's isometric2 font, pre-rendered so startup needs no pyfiglet.
+# Regenerate with pyfiglet.figlet_format("FastAPI Generator", font="isometric2") if the text changes.
+_BANNER = r"""
+      ___           ___           ___                         ___
+     /\__\         /\  \         /\__\                       /\  \
+    /:/ _/_       /::\  \       /:/ _/_         ___         /::\  \
+   /:/ /\__\     /:/\:\  \     /:/ /\  \       /\__\       /:/\:\  \
+  /:/ /:/  /    /:/ /::\  \   /:/ /::\  \     /:/  /      /:/ /::\  \
+ /:/_/:/  /    /:/_/:/\:\__\ /:/_/:/\:\__\   /:/__/      /:/_/:/\:\__\
+ \:\/:/  /     \:\/:/  \/__/ \:\/:/ /:/  /  /::\  \      \:\/:/  \/__/
+  \::/__/       \::/__/       \::/ /:/  /  /:/\:\  \      \::/__/
+   \:\  \        \:\  \        \/_/:/  /   \/__\:\  \      \:\  \
+    \:\__\        \:\__\         /:/  /         \:\__\      \:\__\
+     \/__/         \/__/         \/__/           \/__/       \/__/
+      ___
+     /\  \
+    /::\  \     ___
+   /:/\:\__\   /\__\
+  /:/ /:/  /  /:/__/
+ /:/_/:/  /  /::\  \
+ \:\/:/  /   \/\:\  \__
+  \::/__/     ~~\:\/\__\
+   \:\  \        \::/  /
+    \:\__\       /:/  /
+     \/__/       \/__/
+      ___           ___           ___           ___           ___
+     /\__\         /\__\         /\  \         /\__\         /\  \
+    /:/ _/_       /:/ _/_        \:\  \       /:/ _/_       /::\  \
+   /:/ /\  \     /:/ /\__\        \:\  \     /:/ /\__\     /:/\:\__\
+  /:/ /::\  \   /:/ /:/ _/_   _____\:\  \   /:/ /:/ _/_   /:/ /:/  /
+ /:/__\/\:\__\ /:/_/:/ /\__\ /::::::::\__\ /:/_/:/ /\__\ /:/_/:/__/___
+ \:\  \ /:/  / \:\/:/ /:/  / \:\~~\~~\/__/ \:\/:/ /:/  / \:\/:::::/  /
+  \:\  /:/  /   \::/_/:/  /   \:\  \        \::/_/:/  /   \::/~~/~~~~
+   \:\/:/  /     \:\/:/  /     \:\  \        \:\/:/  /     \:\~~\
+    \::/  /       \::/  /       \:\__\        \::/  /       \:\__\
+     \/__/         \/__/         \/__/         \/__/         \/__/
+      ___                         ___           ___
+     /\  \                       /\  \         /\  \
+    /::\  \         ___         /::\  \       /::\  \
+   /:/\:\  \       /\__\       /:/\:\  \     /:/\:\__\
+  /:/ /::\  \     /:/  /      /:/  \:\  \   /:/ /:/  /
+ /:/_/:/\:\__\   /:/__/      /:/__/ \:\__\ /:/_/:/__/___
+ \:\/:/  \/__/  /::\  \      \:\  \ /:/  / \:\/:::::/  /
+  \::/__/      /:/\:\  \      \:\  /:/  /   \::/~~/~~~~
+   \:\  \      \/__\:\  \      \:\/:/  /     \:\~~\
+    \:\__\          \:\__\      \::/  /       \:\__\
+     \/__/           \/__/       \/__/         \/__/
+"""[1:]
+
+def _format_section(section: str, items: Any) -> str:
+    """One configuration section as display_config prints it, trailing blank line included."""
+    if isinstance(items, dict):
+        body = "".join(f"  {_CYAN}{key}: {_WHITE}{value}{_RESET}\n" for key, value in items.items())
+    else:
+        body = f"  {_WHITE}{items}{_RESET}\n"
+    return f"{_MAGENTA}{section}:{_RESET}\n{body}\n"
+
+# Default configuration returned by generate_json_template, serialized once at import.
+_TEMPLATE_BYTES = _json.dumps({
+    "codebase_config": {
+        "project_name": "FastAPI Project",
+        "project_dir": "./fastapi_project",
+        "database": {
+            "postgres_server": "localhost",
+            "postgres_port": 5432,
+            "postgres_db": "fastapi_db",
+            "postgres_user": "postgres",
+            "postgres_password": "postgres"
+        },
+        "jwt": {
+            "secret_key": "generate_random_secret_key",
+            "algorithm": "HS256",
+            "access_token_expire_minutes": 30,
+            "refresh_token_expire_days": 7
+        },
+        "google_oauth": {
+            "enabled": False,
+            "client_id": "",
+            "client_secret": "",
+            "redirect_uri": ""
+        },
+        "dragonfly": {
+            "host": "localhost",
+            "port": 6379,
+            "db": 0,
+            "password": ""
+        },
+        "kafka": {
+            "bootstrap_servers": "localhost:9092"
+        }
+    },
+    "models_config": [
+        {
+            "name": "Sample",
+            "fields": [
+                {
+                    "name": "name",
+                    "type": "string",
+                    "nullable": False,
+                    "unique": True,
+                    "index": True
+                },
+                {
+                    "name": "description",
+                    "type": "text",
+                    "nullable": True
+                },
+                {
+                    "name": "is_active",
+                    "type": "boolean",
+                    "nullable": False,
+                    "default": True
+                }
+            ],
+            "relationships": [],
+            "cache": {
+                "enabled": True,
+                "duration": 60
+            }
+        }
+    ]
+})
+
 class TerminalUI:
     """
     Terminal UI for improved user experience.
@@ -26,14 +160,15 @@ class TerminalUI:
     
     def display_welcome(self):
         """Display welcome message with ASCII art."""
-        # Clear screen
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # Clear screen and home the cursor; colorama.init() translates this on legacy Windows consoles
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
         
         # Display ASCII art
-        ascii_art = pyfiglet.figlet_format("FastAPI Generator", font="isometric2")
-        print(f"{Fore.CYAN}{ascii_art}{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}Welcome to the FastAPI Codebase Generator!{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}A powerful tool to generate FastAPI projects with DDD architecture.{Style.RESET_ALL}")
+        ascii_art = _BANNER
+        print(f"{_CYAN}{ascii_art}{_RESET}")
+        print(f"{_GREEN}Welcome to the FastAPI Codebase Generator!{_RESET}")
+        print(f"{_YELLOW}A powerful tool to generate FastAPI projects with DDD architecture.{_RESET}")
         print("\n" + "=" * 80 + "\n")
     
     def display_section_header(self, title: str):
@@ -43,7 +178,7 @@ class TerminalUI:
         Args:
             title: Section title
         """
-        print(f"\n{Fore.BLUE}{'=' * 20} {title} {'=' * 20}{Style.RESET_ALL}\n")
+        print(f"\n{_BLUE}{'=' * 20} {title} {'=' * 20}{_RESET}\n")
     
     def display_success(self, message: str):
         """
@@ -52,7 +187,7 @@ class TerminalUI:
         Args:
             message: Success message
         """
-        print(f"{Fore.GREEN}✓ {message}{Style.RESET_ALL}")
+        print(f"{_OK}{message}{_RESET}")
     
     def display_error(self, message: str):
         """
@@ -61,7 +196,7 @@ class TerminalUI:
         Args:
             message: Error message
         """
-        print(f"{Fore.RED}✗ {message}{Style.RESET_ALL}")
+        print(f"{_ERR}{message}{_RESET}")
     
     def display_info(self, message: str):
         """
@@ -70,7 +205,7 @@ class TerminalUI:
         Args:
             message: Info message
         """
-        print(f"{Fore.CYAN}ℹ {message}{Style.RESET_ALL}")
+        print(f"{_INFO}{message}{_RESET}")
     
     def display_warning(self, message: str):
         """
@@ -79,7 +214,7 @@ class TerminalUI:
         Args:
             message: Warning message
         """
-        print(f"{Fore.YELLOW}⚠ {message}{Style.RESET_ALL}")
+        print(f"{_WARN}{message}{_RESET}")
     
     def prompt_yes_no(self, question: str) -> bool:
         """
@@ -92,7 +227,7 @@ class TerminalUI:
             True if yes, False if no
         """
         while True:
-            answer = input(f"{Fore.YELLOW}{question} (y/n): {Style.RESET_ALL}").strip().lower()
+            answer = input(f"{_YELLOW}{question} (y/n): {_RESET}").strip().lower()
             if answer in ['y', 'yes']:
                 return True
             elif answer in ['n', 'no']:
@@ -111,19 +246,21 @@ class TerminalUI:
         Returns:
             Index of selected option
         """
-        print(f"{Fore.YELLOW}{question}{Style.RESET_ALL}")
+        print(f"{_YELLOW}{question}{_RESET}")
         for i, option in enumerate(options, 1):
-            print(f"{Fore.CYAN}{i}) {option}{Style.RESET_ALL}")
+            print(f"{_CYAN}{i}) {option}{_RESET}")
         
+        count = len(options)
+        prompt_str = f"{_YELLOW}Enter your choice (1-{count}): {_RESET}"
         while True:
             try:
-                choice = int(input(f"{Fore.YELLOW}Enter your choice (1-{len(options)}): {Style.RESET_ALL}"))
-                if 1 <= choice <= len(options):
-                    return choice - 1
-                else:
-                    self.display_error(f"Please enter a number between 1 and {len(options)}")
+                choice = int(input(prompt_str))
             except ValueError:
                 self.display_error("Please enter a valid number")
+                continue
+            if 1 <= choice <= count:
+                return choice - 1
+            self.display_error(f"Please enter a number between 1 and {count}")
     
     def prompt_string(self, prompt: str, default: Optional[str] = None) -> str:
         """
@@ -137,7 +274,7 @@ class TerminalUI:
             User input string
         """
         default_display = f" [{default}]" if default else ""
-        user_input = input(f"{Fore.YELLOW}{prompt}{default_display}: {Style.RESET_ALL}").strip()
+        user_input = input(f"{_YELLOW}{prompt}{default_display}: {_RESET}").strip()
         return user_input if user_input else default
     
     def prompt_integer(self, prompt: str, default: Optional[int] = None, min_value: Optional[int] = None, max_value: Optional[int] = None) -> int:
@@ -162,25 +299,28 @@ class TerminalUI:
         elif max_value is not None:
             range_display = f" (max: {max_value})"
         
+        # Everything that does not depend on the answer is built once, before the first prompt
+        prompt_str = f"{_YELLOW}{prompt}{range_display}{default_display}: {_RESET}"
+        lo = min_value if min_value is not None else float("-inf")
+        hi = max_value if max_value is not None else float("inf")
+        
         while True:
+            user_input = input(prompt_str).strip()
+            if not user_input and default is not None:
+                return default
+            
             try:
-                user_input = input(f"{Fore.YELLOW}{prompt}{range_display}{default_display}: {Style.RESET_ALL}").strip()
-                if not user_input and default is not None:
-                    return default
-                
                 value = int(user_input)
-                
-                if min_value is not None and value < min_value:
-                    self.display_error(f"Value must be at least {min_value}")
-                    continue
-                
-                if max_value is not None and value > max_value:
-                    self.display_error(f"Value must be at most {max_value}")
-                    continue
-                
-                return value
             except ValueError:
                 self.display_error("Please enter a valid integer")
+                continue
+            
+            if lo <= value <= hi:
+                return value
+            if value < lo:
+                self.display_error(f"Value must be at least {min_value}")
+            else:
+                self.display_error(f"Value must be at most {max_value}")
     
     def display_config(self, config: Dict[str, Any]):
         """
@@ -190,17 +330,9 @@ class TerminalUI:
             config: Configuration dictionary
         """
         self.display_section_header("Configuration")
-        
-        for section, items in config.items():
-            print(f"{Fore.MAGENTA}{section}:{Style.RESET_ALL}")
-            
-            if isinstance(items, dict):
-                for key, value in items.items():
-                    print(f"  {Fore.CYAN}{key}: {Fore.WHITE}{value}{Style.RESET_ALL}")
-            else:
-                print(f"  {Fore.WHITE}{items}{Style.RESET_ALL}")
-            
-            print()
+        # Rendered as one string and written once instead of a print() per line
+        sys.stdout.write("".join(_format_section(section, items) for section, items in config.items()))
+        sys.stdout.flush()
     
     def edit_config_item(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -212,13 +344,11 @@ class TerminalUI:
         Returns:
             Updated configuration dictionary
         """
-        # Display current configuration
-        self.display_config(config)
-        
-        # Get section
-        sections = list(config.keys())
+        # Get section; only the chosen one is displayed, not the whole configuration
+        sections = list(config)
         section_idx = self.prompt_choice("Select section to edit:", sections)
         section = sections[section_idx]
+        sys.stdout.write(_format_section(section, config[section]))
         
         # Get item
         if isinstance(config[section], dict):
@@ -268,28 +398,27 @@ class TerminalUI:
             Configuration dictionary
         """
         try:
-            with open(file_path, 'r') as f:
-                config = json.load(f)
+            config = _json.load_file(file_path)
             self.display_success(f"Configuration loaded from {file_path}")
             return config
         except Exception as e:
             self.display_error(f"Error loading configuration: {str(e)}")
             return {}
     
-    def save_json_config(self, config: Dict[str, Any], file_path: str) -> bool:
+    def save_json_config(self, config: Dict[str, Any], file_path: str, pretty: bool = True) -> bool:
         """
         Save configuration to JSON file.
         
         Args:
             config: Configuration dictionary
             file_path: Path to JSON file
+            pretty: Indent the output; pass False for files only read by tools
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            with open(file_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            _json.dump_file(config, file_path, pretty)
             self.display_success(f"Configuration saved to {file_path}")
             return True
         except Exception as e:
@@ -303,69 +432,5 @@ class TerminalUI:
         Returns:
             Template configuration dictionary
         """
-        template = {
-            "codebase_config": {
-                "project_name": "FastAPI Project",
-                "project_dir": "./fastapi_project",
-                "database": {
-                    "postgres_server": "localhost",
-                    "postgres_port": 5432,
-                    "postgres_db": "fastapi_db",
-                    "postgres_user": "postgres",
-                    "postgres_password": "postgres"
-                },
-                "jwt": {
-                    "secret_key": "generate_random_secret_key",
-                    "algorithm": "HS256",
-                    "access_token_expire_minutes": 30,
-                    "refresh_token_expire_days": 7
-                },
-                "google_oauth": {
-                    "enabled": False,
-                    "client_id": "",
-                    "client_secret": "",
-                    "redirect_uri": ""
-                },
-                "dragonfly": {
-                    "host": "localhost",
-                    "port": 6379,
-                    "db": 0,
-                    "password": ""
-                },
-                "kafka": {
-                    "bootstrap_servers": "localhost:9092"
-                }
-            },
-            "models_config": [
-                {
-                    "name": "Sample",
-                    "fields": [
-                        {
-                            "name": "name",
-                            "type": "string",
-                            "nullable": False,
-                            "unique": True,
-                            "index": True
-                        },
-                        {
-                            "name": "description",
-                            "type": "text",
-                            "nullable": True
-                        },
-                        {
-                            "name": "is_active",
-                            "type": "boolean",
-                            "nullable": False,
-                            "default": True
-                        }
-                    ],
-                    "relationships": [],
-                    "cache": {
-                        "enabled": True,
-                        "duration": 60
-                    }
-                }
-            ]
-        }
-        
-        return template
+        # Decoding the pre-serialized template builds a fresh, independent tree each call
+        return _json.loads(_TEMPLATE_BYTES)